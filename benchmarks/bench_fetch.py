@@ -0,0 +1,52 @@
+"""
+Benchmark the concurrent fetch engine against sequential fetching.
+
+Usage: python -m benchmarks.bench_fetch [--delay 0.2] [--hosts 4]
+"""
+
+import argparse
+import sys
+from contextlib import ExitStack
+from time import perf_counter
+
+from loguru import logger
+
+from benchmarks.stub_server import StubServer
+from src.core.fetcher import FetchEngine
+from src.core.scraper import JobScraper
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--delay', type=float, default=0.2, help='stub latency per request (s)')
+    parser.add_argument('--hosts', type=int, default=4, help='number of distinct stub hosts')
+    parser.add_argument('--sources', type=int, nargs='+', default=[1, 2, 5, 10, 20, 40])
+    args = parser.parse_args()
+
+    logger.remove()
+    logger.add(sys.stderr, level='WARNING')
+
+    scraper = JobScraper()
+    with ExitStack() as stack:
+        # 127.0.0.0/8 is all loopback on Linux: one stub per address gives distinct hosts
+        servers = [stack.enter_context(StubServer(f"127.0.0.{i + 1}", args.delay)) for i in range(args.hosts)]
+
+        print(f"{'sources':>8} {'sequential':>12} {'engine':>10} {'speedup':>8}")
+        for count in args.sources:
+            urls = [f"{servers[i % len(servers)].url}/offres-{i}" for i in range(count)]
+
+            start = perf_counter()
+            for url in urls:
+                scraper.fetch_html(url)
+            sequential = perf_counter() - start
+
+            start = perf_counter()
+            results = FetchEngine(scraper.fetch_html).fetch_all(urls)
+            engine = perf_counter() - start
+            assert all(r['error'] is None for r in results)
+
+            print(f"{count:>8} {sequential:>11.2f}s {engine:>9.2f}s {sequential / engine:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""
+Memory held by the job history, as DataFrame, as dict records and as `Job` objects.
+
+Loads synthetic `jobs.csv` histories several ways and reports the memory
+each result keeps alive (tracemalloc), normalized per 10 000 jobs:
+
+- `dataframe`: `pd.read_csv`, what `load_data` returned;
+- `dict records`: the sorted `to_dict('records')` list;
+- `df + records`: both, as the web records cache used to keep them (`DataHandler.df` and the records);
+- `jobs`: `DataHandler.load_jobs()`, what the application keeps now.
+
+Synthetic histories give every job its own date; `--jobs-per-run` gives the
+same date to consecutive jobs, as jobs saved by one scraper run.
+
+Usage: python -m benchmarks.bench_memory [--sizes 1000 10000 100000] [--jobs-per-run 1] [--output results.json]
+"""
+
+import argparse
+import csv
+import gc
+import json
+import os
+import sys
+import tempfile
+import tracemalloc
+
+import pandas as pd
+from loguru import logger
+
+from benchmarks.kelio_pages import make_history
+from src.core import job as job_module
+from src.core.data_handler import DataHandler
+
+
+def retained(build):
+    """Bytes still allocated once `build()` returned, with its result alive."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def measure_size(path, size):
+    """Return {layout: bytes per 10k jobs} for a history of `size` jobs."""
+    handler = DataHandler(path, backend='csv')
+    job_module._format_date.cache_clear()
+    layouts = {
+        'dataframe': lambda: pd.read_csv(path),
+        'dict records': lambda: pd.read_csv(path).sort_values(by='date', ascending=False).to_dict('records'),
+        'df + records': lambda: (lambda df: (df, df.sort_values(by='date', ascending=False).to_dict('records')))(
+            pd.read_csv(path)
+        ),
+        'jobs': handler.load_jobs,
+    }
+    return {name: retained(build) * 10000 / size for name, build in layouts.items()}
+
+
+def write_runs_history(path, size, jobs_per_run):
+    """Write a history of `size` jobs where each run of `jobs_per_run` jobs shares one date."""
+    jobs = sorted(make_history(size), key=lambda job: job['date'])
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(jobs[0]), lineterminator='\n')
+        writer.writeheader()
+        for i, job in enumerate(jobs):
+            writer.writerow(dict(job, date=jobs[i - i % jobs_per_run]['date']))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--jobs-per-run', type=int, default=1, help='consecutive jobs sharing one date')
+    parser.add_argument('--output', help='write the results as JSON to this file')
+    args = parser.parse_args()
+
+    logger.remove()
+    logger.add(sys.stderr, level='WARNING')
+
+    results = []
+    print(f"{'size':>8} {'layout':<14} {'MB / 10k jobs':>14} {'vs jobs':>8}")
+    with tempfile.TemporaryDirectory() as work_dir:
+        for size in args.sizes:
+            path = os.path.join(work_dir, f"jobs-{size}.csv")
+            write_runs_history(path, size, args.jobs_per_run)
+            per_10k = measure_size(path, size)
+            for name, value in per_10k.items():
+                results.append({
+                    'size': size, 'jobs_per_run': args.jobs_per_run,
+                    'layout': name, 'mb_per_10k': round(value / 2 ** 20, 3),
+                })
+                print(f"{size:>8} {name:<14} {value / 2 ** 20:>14.2f} {value / per_10k['jobs']:>7.1f}x")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""
+Benchmark the parse_jobs parser backends on synthetic Kelio pages.
+
+Usage: python -m benchmarks.bench_parser [--rows 50 5000 100000] [--repeat 3]
+"""
+
+import argparse
+import sys
+from time import perf_counter
+from unittest.mock import patch
+
+from loguru import logger
+
+from benchmarks.kelio_pages import make_page
+from src.core import parsers
+
+
+def backends():
+    """Yield (label, callable) for every backend available here."""
+    yield 'html.parser', lambda html: parsers.extract_rows(html, 'html.parser')
+    label = 'lxml+strainer' if parsers.LXML_AVAILABLE else 'strainer (no lxml)'
+    yield label, lambda html: parsers.extract_rows(html, 'lxml')
+    if parsers.SelectolaxParser is not None:
+        yield 'fast (selectolax)', lambda html: parsers.extract_rows(html, 'fast')
+
+    def scanner(html):
+        with patch.object(parsers, 'SelectolaxParser', None):
+            return parsers.extract_rows(html, 'fast')
+    yield 'fast (stdlib scanner)', scanner
+
+
+def best_of(func, html, repeat):
+    best, result = None, None
+    for _ in range(repeat):
+        start = perf_counter()
+        result = func(html)
+        elapsed = perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, nargs='+', default=[50, 5000, 100000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    logger.remove()
+    logger.add(sys.stderr, level='WARNING')
+
+    print(f"{'rows':>8} {'backend':<24} {'best':>10} {'rows/s':>12} {'speedup':>8}")
+    for rows in args.rows:
+        html = make_page(rows)
+        reference_time, reference = None, None
+        for label, func in backends():
+            elapsed, result = best_of(func, html, args.repeat)
+            if reference is None:
+                reference_time, reference = elapsed, result
+            elif result != reference:
+                raise SystemExit(f"{label} output differs from html.parser on {rows} rows")
+            print(f"{rows:>8} {label:<24} {elapsed * 1000:>8.1f}ms {rows / elapsed:>12,.0f} {reference_time / elapsed:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,176 @@
+"""
+Benchmark the main code paths on synthetic Kelio pages and `jobs.csv` histories.
+
+Times `parse_jobs`, `DataHandler.save_data` / `load_data` / `search`, `AIFormatter._basic_format`
+and the `/` route for each history size, and writes the results as JSON so runs
+on different commits can be compared.
+
+Usage: python -m benchmarks.bench_suite [--sizes 100 1000 10000] [--repeat 5]
+                                        [--output results.json] [--compare previous.json]
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from time import perf_counter
+
+from loguru import logger
+
+from benchmarks.kelio_pages import make_history, make_page, write_history
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), 'results')
+
+
+def measure(func, repeat, setup=None):
+    """Run `func` `repeat` times (after `setup` each time) and return timing stats."""
+    timings = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = perf_counter()
+        func()
+        timings.append(perf_counter() - start)
+    return {
+        'best': min(timings),
+        'median': statistics.median(timings),
+        'runs': len(timings),
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def run_suite(sizes, repeat, work_dir):
+    """Return one result per (benchmark, size)."""
+    # L'application lit ses chemins à l'import : tout reste dans le répertoire temporaire
+    os.environ['JOBS_CSV_PATH'] = os.path.join(work_dir, 'app', 'jobs.csv')
+    os.environ.setdefault('SEND_EMAIL', 'false')
+    from src import app as app_module
+    from src.core.ai_formatter import AIFormatter
+    from src.core.data_handler import DataHandler
+    from src.core.job import to_jobs
+    from src.core.scraper import JobScraper
+
+    scraper = JobScraper(sources=[])
+    formatter = AIFormatter(cache_path=os.path.join(work_dir, 'ai_cache.json'))
+    client = app_module.app.test_client()
+    app_handler = app_module.data_handler
+    results = []
+
+    def add(name, size, stats):
+        results.append({'name': name, 'size': size, **stats})
+        print(f"{name:<16} {size:>8} {stats['best'] * 1000:>10.2f}ms {stats['median'] * 1000:>10.2f}ms")
+
+    def run_size(size):
+        html = make_page(size)
+        add('parse_jobs', size, measure(lambda: scraper.parse_jobs(html), repeat))
+
+        path = os.path.join(work_dir, f"jobs-{size}.csv")
+        handler = DataHandler(path, backend='csv')
+        # Un run typique apporte une dizaine de nouvelles offres à un historique existant
+        new_jobs = to_jobs(make_history(10, seed=size + 1, offset=size))
+
+        def reset_history():
+            write_history(path, size)
+            handler.fingerprints.clear()
+            handler.fingerprints.add(list(handler._stored_fingerprints()))
+        add('save_data', size, measure(lambda: handler.save_data(new_jobs), repeat, setup=reset_history))
+
+        write_history(path, size)
+        add('load_data', size, measure(handler.load_data, repeat))
+
+        search_handler = DataHandler(path, backend='csv')
+        search_handler.search('kelio')  # premier appel : construction de l'index plein texte
+        add('search', size, measure(lambda: search_handler.search('developpeur chol'), repeat))
+
+        jobs = make_history(size)
+        add('basic_format', size, measure(lambda: formatter._basic_format(jobs), repeat))
+
+        app_module.data_handler = DataHandler(path, backend='csv')
+
+        def get_index():
+            response = client.get('/')
+            assert response.status_code == 200, response.status_code
+        def cold_index():
+            app_module.data_handler.invalidate_cache()
+            app_module.page_cache.clear()
+        add('index_cold', size, measure(get_index, repeat, setup=cold_index))
+        add('index_warm', size, measure(get_index, repeat))
+
+    print(f"{'benchmark':<16} {'size':>8} {'best':>12} {'median':>12}")
+    try:
+        for size in sizes:
+            run_size(size)
+    finally:
+        app_module.data_handler = app_handler
+    return results
+
+
+def compare(results, previous_path, threshold):
+    """Print the change of each median against a previous results file; return the regressions."""
+    with open(previous_path, encoding='utf-8') as f:
+        previous = {(r['name'], r['size']): r for r in json.load(f)['results']}
+
+    regressions = []
+    print(f"\n{'benchmark':<16} {'size':>8} {'before':>12} {'after':>12} {'change':>8}")
+    for result in results:
+        before = previous.get((result['name'], result['size']))
+        if before is None:
+            continue
+        change = result['median'] / before['median'] - 1 if before['median'] else 0.0
+        flag = ''
+        if change > threshold:
+            flag = ' REGRESSION'
+            regressions.append(result)
+        print(f"{result['name']:<16} {result['size']:>8} {before['median'] * 1000:>10.2f}ms "
+              f"{result['median'] * 1000:>10.2f}ms {change:>+7.0%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', help='results file (default: benchmarks/results/<commit>.json)')
+    parser.add_argument('--compare', help='previous results file to compare against')
+    parser.add_argument('--threshold', type=float, default=0.2, help='median slowdown reported as a regression')
+    args = parser.parse_args()
+
+    logger.remove()
+    logger.add(sys.stderr, level='WARNING')
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        results = run_suite(args.sizes, args.repeat, work_dir)
+
+    commit = git_commit()
+    output = args.output or os.path.join(RESULTS_DIR, f"{commit or 'results'}.json")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({
+            'commit': commit,
+            'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'repeat': args.repeat,
+            'results': results,
+        }, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.compare and compare(results, args.compare, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+"""
+Local fake Groq chat completions endpoint with a configurable latency and error rate.
+"""
+
+import json
+import random
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from time import sleep
+
+
+def answer_for(prompt):
+    """JSON answer with one card per job block (`ID:`/`Title:`/`Link:` lines) of the prompt."""
+    fragments = {}
+    for block in prompt.split('\n\n'):
+        fields = dict(line.split(': ', 1) for line in block.splitlines() if ': ' in line)
+        if 'ID' in fields:
+            fragments[fields['ID']] = (
+                f'<div style="padding: 10px;"><h3>{fields.get("Title", "")}</h3>'
+                f'<a href="{fields.get("Link", "")}">🔗 Postuler</a></div>'
+            )
+    return json.dumps({'fragments': fragments})
+
+
+class FakeGroqServer:
+    """Answer `/openai/v1/chat/completions` after `delay` seconds, streamed or not.
+
+    `requests` counts the calls and `max_in_flight` the highest number of
+    calls served at the same time. A share `error_rate` of the calls fails
+    with `error_status` (counted in `errors`).
+    """
+
+    def __init__(self, host='127.0.0.1', delay=0.1, chunk_size=40, error_rate=0.0, error_status=500, seed=0):
+        self.requests = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.prompts = []
+        rng = random.Random(seed)
+        lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_POST(self):
+                payload = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                prompt = payload['messages'][-1]['content']
+                with lock:
+                    server.requests += 1
+                    server.in_flight += 1
+                    server.max_in_flight = max(server.max_in_flight, server.in_flight)
+                    server.prompts.append(prompt)
+                    failed = rng.random() < error_rate
+                    if failed:
+                        server.errors += 1
+                try:
+                    sleep(delay)
+                    if failed:
+                        body = json.dumps({'error': {'message': 'fake failure', 'type': 'server_error'}}).encode('utf-8')
+                        self.send_response(error_status)
+                        self.send_header('Content-Type', 'application/json')
+                        self.send_header('Content-Length', str(len(body)))
+                        self.end_headers()
+                        self.wfile.write(body)
+                        return
+                    content = answer_for(prompt)
+                    if payload.get('stream'):
+                        self._stream(content)
+                    else:
+                        body = json.dumps({'choices': [{'message': {'content': content}}]}).encode('utf-8')
+                        self.send_response(200)
+                        self.send_header('Content-Type', 'application/json')
+                        self.send_header('Content-Length', str(len(body)))
+                        self.end_headers()
+                        self.wfile.write(body)
+                finally:
+                    with lock:
+                        server.in_flight -= 1
+
+            def _stream(self, content):
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/event-stream')
+                self.send_header('Transfer-Encoding', 'chunked')
+                self.end_headers()
+                events = [
+                    json.dumps({'choices': [{'delta': {'content': content[i:i + chunk_size]}}]})
+                    for i in range(0, len(content), chunk_size)
+                ] + ['[DONE]']
+                try:
+                    for event in events:
+                        data = f"data: {event}\n\n".encode('utf-8')
+                        self.wfile.write(f"{len(data):x}\r\n".encode('ascii') + data + b"\r\n")
+                    self.wfile.write(b"0\r\n\r\n")
+                except (BrokenPipeError, ConnectionResetError):
+                    # Le client peut fermer le flux dès que le JSON est complet
+                    pass
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer((host, 0), Handler)
+        self.httpd.daemon_threads = True
+        # Connexions fermées par le client en cours de réponse : pas de trace sur stderr
+        self.httpd.handle_error = lambda request, client_address: None
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/openai/v1/chat/completions"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
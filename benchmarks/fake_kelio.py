@@ -0,0 +1,84 @@
+"""
+Local fake Kelio listing whose content changes on a script.
+"""
+
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from time import sleep
+
+from benchmarks.kelio_pages import make_page
+
+
+def growing_listing(rows=50, new_per_step=5, every=1, seed=0):
+    """Script of a listing that gains `new_per_step` offers every `every` requests."""
+    def script(request_index):
+        return make_page(rows + (request_index // every) * new_per_step, seed)
+    return script
+
+
+class FakeKelioServer:
+    """Serve `script(request_index)` as the Kelio listing, after `delay` seconds.
+
+    Pages carry an ETag, and `If-None-Match` gets a 304 while the page does
+    not change, like the conditional GETs of the real site. `requests` counts
+    the calls and `not_modified` the 304 answers.
+    """
+
+    def __init__(self, host='127.0.0.1', delay=0.0, script=None):
+        self.script = script or growing_listing()
+        self.requests = 0
+        self.not_modified = 0
+        lock = threading.Lock()
+        pages = {}
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                with lock:
+                    index = server.requests
+                    server.requests += 1
+                sleep(delay)
+                page = server.script(index)
+                if page not in pages:
+                    body = page.encode('utf-8')
+                    pages[page] = (body, '"' + hashlib.sha1(body).hexdigest()[:16] + '"')
+                body, etag = pages[page]
+
+                if self.headers.get('If-None-Match') == etag:
+                    with lock:
+                        server.not_modified += 1
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('ETag', etag)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer((host, 0), Handler)
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/fr/nos-offres-d-emploi.html"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -0,0 +1,72 @@
+"""
+Local fake Resend emails endpoint recording the messages it accepts.
+"""
+
+import json
+import random
+import threading
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from time import sleep
+
+
+class FakeResendServer:
+    """Accept `POST /emails` after `delay` seconds and keep the payloads in `emails`.
+
+    A share `error_rate` of the calls fails with `error_status`, to exercise
+    the outbox retries.
+    """
+
+    def __init__(self, host='127.0.0.1', delay=0.0, error_rate=0.0, error_status=503, seed=0):
+        self.emails = []
+        self.requests = 0
+        self.errors = 0
+        rng = random.Random(seed)
+        lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_POST(self):
+                payload = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                sleep(delay)
+                with lock:
+                    server.requests += 1
+                    failed = rng.random() < error_rate
+                    if failed:
+                        server.errors += 1
+                    else:
+                        server.emails.append(payload)
+                if failed:
+                    body = json.dumps({'name': 'internal_server_error', 'message': 'fake outage'})
+                    status = error_status
+                else:
+                    body = json.dumps({'id': str(uuid.uuid4())})
+                    status = 200
+                body = body.encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer((host, 0), Handler)
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/emails"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -0,0 +1,72 @@
+"""
+Synthetic Kelio job listing pages and `jobs.csv` histories for benchmarks.
+"""
+
+import csv
+import random
+from datetime import datetime, timedelta
+
+TITLES = [
+    'Développeur Full Stack H/F', 'Développeur Cybersécurité H/F', 'Lead Dev JAVA H/F',
+    'Développeur Front-end Angular', 'Technicien SAV', 'Chef de projet', 'Comptable H/F',
+    'Développeur PHP Symfony', 'Ingénieur Backend NodeJS', 'Commercial Grands Comptes',
+]
+LOCATIONS = ['Cholet', 'Trémentines', 'Angers', 'Nantes', 'Paris', 'Lyon']
+CONTRACTS = ['CDI', 'CDD', 'Stage', 'Alternance']
+
+
+def make_row(index, rng):
+    """Return one `sectiontableentry` row as found on the Kelio listing."""
+    title = f"{rng.choice(TITLES)} #{index}"
+    slug = f"offre-{index}-{rng.randint(0, 10 ** 6)}"
+    return (
+        f'<tr class="sectiontableentry{index % 2 + 1}">'
+        f'<td><a href="/fr/nos-offres-d-emploi/cdi/{slug}.html">{title}</a></td>'
+        f'<td>Kelio</td>'
+        f'<td>{rng.choice(CONTRACTS)}</td>'
+        f'<td>{rng.choice(LOCATIONS)}</td>'
+        f'</tr>'
+    )
+
+
+def make_page(rows=50, seed=0):
+    """Return a full HTML page with `rows` job rows inside a `contentpane` table."""
+    rng = random.Random(seed)
+    body = '\n'.join(make_row(i, rng) for i in range(rows))
+    return (
+        '<!DOCTYPE html><html><head><title>Nos offres d\'emploi</title></head><body>'
+        '<div id="offres-d-emploi"><h1>Nos offres d\'emploi</h1>'
+        '<table class="contentpane">'
+        '<tr><th>Poste</th><th>Société</th><th>Contrat</th><th>Lieu</th></tr>'
+        f'{body}'
+        '</table></div>'
+        '<footer><p>Bodet - Kelio</p></footer></body></html>'
+    )
+
+
+def make_job(index, rng, start=None):
+    """Return one job record as stored in `jobs.csv`."""
+    start = start or datetime(2025, 1, 1)
+    date = start + timedelta(minutes=rng.randint(0, 60 * 24 * 365))
+    slug = f"offre-{index}-{rng.randint(0, 10 ** 6)}"
+    return {
+        'title': f"{rng.choice(TITLES)} #{index}",
+        'link': f"https://www.bodet.com/fr/nos-offres-d-emploi/cdi/{slug}.html",
+        'company': 'Kelio',
+        'location': rng.choice(LOCATIONS),
+        'date': date.strftime('%Y-%m-%d %H:%M'),
+    }
+
+
+def make_history(rows=1000, seed=0, offset=0):
+    """Return `rows` job records, as accumulated in `jobs.csv` over past runs."""
+    rng = random.Random(seed)
+    return [make_job(offset + i, rng) for i in range(rows)]
+
+
+def write_history(path, rows=1000, seed=0):
+    """Write a `jobs.csv` history of `rows` jobs to `path`."""
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=['title', 'link', 'company', 'location', 'date'])
+        writer.writeheader()
+        writer.writerows(make_history(rows, seed))
@@ -0,0 +1,164 @@
+"""
+End-to-end load run of `JobScraper.run()` against local fake Kelio, Groq and Resend servers.
+
+Nothing leaves the machine: the scraper is pointed at the fakes through
+`SCRAPER_URL`, `GROQ_API_URL` and `RESEND_API_URL`. `--concurrency` workers
+each run their share of `--runs` scrapes back to back, with their own data
+directory, like independent deployments polling the same site.
+
+Usage: python -m benchmarks.load_run [--runs 20] [--concurrency 1] [--rows 50] [--new-per-run 5]
+                                     [--groq-delay 0.3] [--groq-error-rate 0.1] [--resend-error-rate 0.1]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import threading
+from time import perf_counter
+
+from loguru import logger
+
+from benchmarks.fake_groq import FakeGroqServer
+from benchmarks.fake_kelio import FakeKelioServer, growing_listing
+from benchmarks.fake_resend import FakeResendServer
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def fake_environment(kelio, groq, resend, rate_limit=0):
+    """Environment pointing the scraper, AI formatter and notifier at the fake servers."""
+    return {
+        'SCRAPER_URL': kelio.url,
+        'GROQ_API_URL': groq.url,
+        'GROQ_API_KEY': 'fake',
+        'AI_RATE_LIMIT': str(rate_limit),
+        'RESEND_API_URL': resend.url,
+        'RESEND_API_KEY': 'fake',
+        'EMAIL_RECEIVER': 'load@example.com',
+        'SEND_EMAIL': 'true',
+        'NOTIFY_COALESCE_WINDOW': '0',
+        'NOTIFY_BACKOFF_BASE': '0.2',
+        'NOTIFY_BACKOFF_MAX': '1',
+    }
+
+
+def make_scrapers(count, work_dir):
+    """Build one scraper per worker, each with its own data directory."""
+    from src.core.scraper import JobScraper
+
+    scrapers = []
+    for worker in range(count):
+        # Les chemins sont lus à la construction : fixer l'environnement avant chaque instance
+        os.environ['JOBS_CSV_PATH'] = os.path.join(work_dir, f"worker-{worker}", 'jobs.csv')
+        scrapers.append(JobScraper())
+    return scrapers
+
+
+def load_run(runs, concurrency, work_dir):
+    """Run `runs` scrapes over `concurrency` workers; return per-run records and the wall time."""
+    scrapers = make_scrapers(concurrency, work_dir)
+    records = []
+    lock = threading.Lock()
+
+    def worker(scraper, count):
+        for _ in range(count):
+            start = perf_counter()
+            scraper.run()
+            elapsed = perf_counter() - start
+            with lock:
+                records.append({
+                    'seconds': elapsed,
+                    'error': scraper.error,
+                    'new_jobs': scraper.summary.get('new_jobs', 0),
+                    'skipped': scraper.summary.get('skipped', False),
+                    'ai': (scraper.summary.get('ai_fragments') or {}).get('winner'),
+                })
+
+    shares = [runs // concurrency + (1 if i < runs % concurrency else 0) for i in range(concurrency)]
+    threads = [threading.Thread(target=worker, args=(s, n)) for s, n in zip(scrapers, shares)]
+    start = perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = perf_counter() - start
+
+    # Les emails partent en arrière-plan : attendre que les boîtes d'envoi soient vidées
+    flushed = all(scraper.notifier.flush(timeout=60) for scraper in scrapers)
+    return records, wall, flushed
+
+
+def report(records, wall, flushed, servers):
+    kelio, groq, resend = servers
+    latencies = [r['seconds'] for r in records]
+    winners = {}
+    for r in records:
+        if r['ai']:
+            winners[r['ai']] = winners.get(r['ai'], 0) + 1
+    return {
+        'runs': len(records),
+        'wall_seconds': round(wall, 3),
+        'throughput_per_s': round(len(records) / wall, 3) if wall else None,
+        'latency': {
+            'mean': round(statistics.mean(latencies), 4),
+            'p50': round(percentile(latencies, 50), 4),
+            'p95': round(percentile(latencies, 95), 4),
+            'p99': round(percentile(latencies, 99), 4),
+            'max': round(max(latencies), 4),
+        },
+        'errors': sum(1 for r in records if r['error']),
+        'skipped': sum(1 for r in records if r['skipped']),
+        'new_jobs': sum(r['new_jobs'] for r in records),
+        'format_winners': winners,
+        'kelio': {'requests': kelio.requests, 'not_modified': kelio.not_modified},
+        'groq': {'requests': groq.requests, 'errors': groq.errors, 'max_in_flight': groq.max_in_flight},
+        'resend': {'requests': resend.requests, 'errors': resend.errors, 'emails': len(resend.emails)},
+        'outbox_flushed': flushed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--concurrency', type=int, default=1)
+    parser.add_argument('--rows', type=int, default=50, help='offers on the first listing page')
+    parser.add_argument('--new-per-run', type=int, default=5, help='offers added to the listing at each step')
+    parser.add_argument('--change-every', type=int, default=1, help='listing requests between two changes')
+    parser.add_argument('--kelio-delay', type=float, default=0.05)
+    parser.add_argument('--groq-delay', type=float, default=0.3)
+    parser.add_argument('--groq-error-rate', type=float, default=0.0)
+    parser.add_argument('--groq-rate-limit', type=float, default=0, help='AI_RATE_LIMIT (0 disables it)')
+    parser.add_argument('--resend-delay', type=float, default=0.05)
+    parser.add_argument('--resend-error-rate', type=float, default=0.0)
+    parser.add_argument('--output', help='write the report as JSON to this file')
+    args = parser.parse_args()
+
+    logger.remove()
+    logger.add(sys.stderr, level='WARNING')
+
+    script = growing_listing(args.rows, args.new_per_run, args.change_every)
+    with tempfile.TemporaryDirectory() as work_dir, \
+            FakeKelioServer(delay=args.kelio_delay, script=script) as kelio, \
+            FakeGroqServer(delay=args.groq_delay, error_rate=args.groq_error_rate) as groq, \
+            FakeResendServer(delay=args.resend_delay, error_rate=args.resend_error_rate) as resend:
+        os.environ.update(fake_environment(kelio, groq, resend, args.groq_rate_limit))
+        os.environ.pop('SCRAPER_URLS', None)
+        records, wall, flushed = load_run(args.runs, args.concurrency, work_dir)
+        result = report(records, wall, flushed, (kelio, groq, resend))
+
+    print(json.dumps(result, indent=2))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
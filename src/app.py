@@ -3,14 +3,23 @@
 Web interface for displaying scraped job listings and running the scraper.
 """
 
-from flask import Flask, render_template, redirect, url_for, flash, jsonify
+from flask import Flask, render_template, redirect, url_for, flash, jsonify, request, g, Response
 import os
-import pandas as pd
+import hashlib
+from time import perf_counter
 import subprocess
 import shutil
 from datetime import datetime
+from dotenv import load_dotenv
 from src.core.data_handler import DataHandler
-from src.core.scraper import JobScraper
+from src.core.job_query import DEFAULT_SORT, DEFAULT_LIMIT, clean_record
+from src.core.scrape_jobs import ScrapeJobRunner
+from src.core.notifier import Notifier
+from src.core.metrics import all_counters, get_counter, load_last_run, render_prometheus
+from src.core.page_cache import PageCache, build_signature, choose_encoding
+
+# Le scraper (selenium, bs4, pandas...) n'est importé qu'au premier scraping
+load_dotenv()
 
 app = Flask(__name__)
 app.secret_key = os.getenv('FLASK_SECRET_KEY', 'kelio-scraper-secret-key')
@@ -19,81 +28,200 @@ app.secret_key = os.getenv('FLASK_SECRET_KEY', 'kelio-scraper-secret-key')
 csv_path = os.getenv('JOBS_CSV_PATH', 'data/jobs.csv')
 data_handler = DataHandler(csv_path)
 
+# Pages rendues et compressées, réutilisées tant que les données ne changent pas
+page_cache = PageCache()
+# Version des templates et fichiers statiques déployés, incluse dans l'ETag des pages
+build_id, build_mtime = build_signature(os.path.join(app.root_path, app.template_folder), app.static_folder)
+
+# Boîte d'envoi des emails, partagée avec le scraper ; /health expose son état
+notifier = Notifier(os.getenv('OUTBOX_PATH', os.path.join(os.path.dirname(csv_path), 'outbox.db')))
+
+# Les scrapes lancés depuis l'interface tournent en arrière-plan, un seul à la fois
+def make_scraper():
+    from src.core.scraper import JobScraper
+    return JobScraper()
+
+scrape_runner = ScrapeJobRunner(make_scraper)
+
+# Métriques du dernier run, écrites par le scraper (web ou worker)
+last_run_path = os.getenv('LAST_RUN_PATH', os.path.join(os.path.dirname(csv_path), 'last_run.json'))
+
+# Routes dont la latence est suivie dans /metrics
+TIMED_ENDPOINTS = {'index', 'run_scraper', 'api_search'}
+
+@app.before_request
+def start_timer():
+    g.request_started = perf_counter()
+
+@app.after_request
+def record_latency(response):
+    if request.endpoint in TIMED_ENDPOINTS and 'request_started' in g:
+        get_counter(f'request_{request.endpoint}').observe(perf_counter() - g.request_started)
+    return response
+
 @app.route('/')
 def index():
-    """Display all scraped jobs."""
-    jobs = data_handler.load_data()
-    
-    # If DataFrame is empty, return empty list
-    if jobs.empty:
-        return render_template('index.html', jobs=[], now=datetime.now())
-    
-    # Sort jobs by date (newest first) if date column exists
-    if 'date' in jobs.columns:
-        jobs = jobs.sort_values(by='date', ascending=False)
-    
-    # Convert DataFrame to list of dictionaries
-    jobs_list = jobs.to_dict('records')
-    
-    return render_template('index.html', jobs=jobs_list, now=datetime.now())
+    """Display the jobs page; the job cards are loaded page by page from /api/jobs."""
+    # Parsed and sorted records are cached until the data file changes
+    job_index = data_handler.job_index()
+
+    # The page only depends on the data and the deployed templates: it is rendered and compressed once per version
+    def render():
+        last_modified = data_handler.last_modified()
+        html = render_template(
+            'index.html',
+            jobs_total=len(job_index.records),
+            locations=job_index.locations,
+            now=datetime.fromtimestamp(last_modified) if last_modified is not None else datetime.now()
+        )
+        changes = [t for t in (last_modified, build_mtime) if t is not None]
+        return html, max(changes) if changes else None
+
+    page = page_cache.get('index', f"{build_id}-{job_index.version}", render)
+    if request.if_none_match.contains_weak(page.etag) or (
+        not request.if_none_match and page.last_modified is not None
+        and request.if_modified_since is not None
+        and request.if_modified_since.timestamp() >= page.last_modified
+    ):
+        response = Response(status=304)
+    else:
+        body, encoding = page.encoded(choose_encoding(request.accept_encodings))
+        response = Response(body, mimetype='text/html')
+        if encoding is not None:
+            response.headers['Content-Encoding'] = encoding
+    response.set_etag(page.etag, weak=True)
+    if page.last_modified is not None:
+        response.last_modified = page.last_modified
+    response.headers['Vary'] = 'Accept-Encoding'
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+@app.route('/api/jobs')
+def api_jobs():
+    """Return one page of jobs as JSON, filtered and sorted server-side.
+
+    Query parameters: q, location, date_from, date_to (YYYY-MM-DD), sort, limit, cursor.
+    """
+    job_index = data_handler.job_index()
+    etag = f"{job_index.version}-{hashlib.sha1(request.query_string).hexdigest()[:12]}"
+    if request.if_none_match.contains_weak(etag):
+        return '', 304, {'ETag': f'W/"{etag}"'}
+
+    try:
+        items, next_cursor, total = job_index.query(
+            search=request.args.get('q', ''),
+            location=request.args.get('location', ''),
+            date_from=request.args.get('date_from', ''),
+            date_to=request.args.get('date_to', ''),
+            sort=request.args.get('sort', DEFAULT_SORT),
+            limit=request.args.get('limit', DEFAULT_LIMIT),
+            cursor=request.args.get('cursor')
+        )
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+
+    response = jsonify({
+        'items': items,
+        'next_cursor': next_cursor,
+        'total': total,
+        'version': job_index.version
+    })
+    response.set_etag(etag, weak=True)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+@app.route('/api/search')
+def api_search():
+    """Full-text search over the job history, best matches first.
+
+    Query parameters: q (every word is matched as a prefix, accents and case ignored), limit, offset.
+    """
+    start = perf_counter()
+    try:
+        items, total = data_handler.search(
+            request.args.get('q', ''),
+            limit=request.args.get('limit', DEFAULT_LIMIT),
+            offset=request.args.get('offset', 0)
+        )
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+
+    return jsonify({
+        'items': [clean_record(item) for item in items],
+        'total': total,
+        'took_ms': round((perf_counter() - start) * 1000, 2)
+    })
 
 @app.route('/health')
 def health():
     """Health check endpoint for monitoring."""
+    last_run = load_last_run(last_run_path)
     return jsonify({
         'status': 'healthy',
-        'timestamp': datetime.now().isoformat()
+        'timestamp': datetime.now().isoformat(),
+        'records_cache': data_handler.cache_stats(),
+        'page_cache': page_cache.stats(),
+        'outbox': notifier.delivery_state(),
+        'last_run': {
+            'finished_at': datetime.fromtimestamp(last_run['finished_at']).isoformat() if last_run.get('finished_at') else None,
+            'duration': last_run.get('duration'),
+            'error': last_run.get('error'),
+            'stages': {name: entry['seconds'] for name, entry in (last_run.get('stages') or {}).items()},
+        } if last_run else None
     })
 
-@app.route('/run-scraper', methods=['POST'])
-def run_scraper():
-    """Run the scraper to fetch new job listings."""
-    try:
-        # Create a scraper instance and run it
-        scraper = JobScraper()
-        scraper.run()
-        
-        # Get the number of new jobs found
-        new_jobs_count = len(scraper.new_jobs)
-        
-        # Return success message with job count information
+@app.route('/metrics')
+def metrics():
+    """Prometheus metrics: request and stage latencies, last run per-stage figures."""
+    return Response(
+        render_prometheus(all_counters(), load_last_run(last_run_path)),
+        mimetype='text/plain; version=0.0.4'
+    )
+
+def scrape_job_payload(job):
+    """Status of a scrape job as returned to the web interface."""
+    payload = dict(job, status_url=url_for('scraper_status', job_id=job['id']))
+    if job['status'] == 'succeeded':
+        new_jobs_count = (job['summary'] or {}).get('new_jobs', 0)
+        payload['success'] = True
         if new_jobs_count > 0:
-            return jsonify({
-                'success': True,
-                'message': f'Le scraper a trouvé {new_jobs_count} offre(s) d\'emploi.'
-            })
+            payload['message'] = f'Le scraper a trouvé {new_jobs_count} nouvelle(s) offre(s) d\'emploi.'
         else:
-            return jsonify({
-                'success': True,
-                'message': 'Le scraper a été exécuté avec succès. Aucune nouvelle offre trouvée.'
-            })
-    except Exception as e:
-        # Log the error for debugging
-        import traceback
-        print(f"Scraper error: {str(e)}")
-        print(traceback.format_exc())
-        
-        # Return error message
-        return jsonify({
-            'success': False,
-            'message': f'Erreur lors de l\'exécution du scraper: {str(e)}'
-        }), 500
+            payload['message'] = 'Le scraper a été exécuté avec succès. Aucune nouvelle offre trouvée.'
+    elif job['status'] == 'failed':
+        payload['success'] = False
+        payload['message'] = f'Erreur lors de l\'exécution du scraper: {job["error"]}'
+    else:
+        payload['success'] = True
+        payload['message'] = 'Scraping en cours...'
+    return payload
+
+@app.route('/run-scraper', methods=['POST'])
+def run_scraper():
+    """Start the scraper in the background and return the job to poll.
+
+    If a scrape is already running, its job is returned instead of starting another one.
+    """
+    # ?profile=1 : rapport CPU/mémoire du run (voir PROFILE_DIR)
+    job, created = scrape_runner.submit(profile=request.args.get('profile', '').lower() in ('1', 'true', 'yes'))
+    payload = scrape_job_payload(job)
+    payload['already_running'] = not created
+    return jsonify(payload), 202
+
+@app.route('/run-scraper/<job_id>')
+def scraper_status(job_id):
+    """Return the status and current stage of a scrape job."""
+    job = scrape_runner.get(job_id)
+    if job is None:
+        return jsonify({'success': False, 'message': 'Tâche de scraping inconnue.'}), 404
+    return jsonify(scrape_job_payload(job))
 
 @app.route('/clear-jobs', methods=['POST'])
 def clear_jobs():
     """Clear all saved job listings."""
     try:
-        # Create an empty DataFrame with the same columns as the original
-        empty_df = pd.DataFrame(columns=['title', 'link', 'company', 'location', 'date'])
-        
-        # Ensure the directory exists
-        os.makedirs(os.path.dirname(csv_path), exist_ok=True)
-        
-        # Save the empty DataFrame to the CSV file
-        empty_df.to_csv(csv_path, index=False)
-        
-        # Update the data_handler's DataFrame
-        data_handler.df = empty_df
+        # Empty the storage (CSV or SQLite)
+        data_handler.clear_data()
         
         # Return success message
         return jsonify({
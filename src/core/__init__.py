@@ -6,8 +6,18 @@ This package contains the main components for scraping, data handling, and notif
 # Version du package
 __version__ = '0.1.0'
 
-# Expose core modules
-from src.core.scraper import JobScraper
-from src.core.data_handler import DataHandler
-from src.core.notifier import Notifier
-from src.core.ai_formatter import AIFormatter
\ No newline at end of file
+# Expose core modules, imported on first access so that importing one submodule
+# (e.g. from the web app) does not load the whole scraping stack
+_EXPORTS = {
+    'JobScraper': 'src.core.scraper',
+    'DataHandler': 'src.core.data_handler',
+    'Notifier': 'src.core.notifier',
+    'AIFormatter': 'src.core.ai_formatter',
+}
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        import importlib
+        return getattr(importlib.import_module(_EXPORTS[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
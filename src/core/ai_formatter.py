@@ -1,110 +1,275 @@
 from loguru import logger
 import os
-import pandas as pd
-from typing import List, Dict
-import requests
+from concurrent.futures import ThreadPoolExecutor, wait
+from functools import partial
+from html import escape
+from time import perf_counter
+from typing import List, Dict, Optional
 import json
+from src.core.http_client import get_client
+from src.core.metrics import get_counter
+from src.core.rate_limit import RateLimiter
+from src.core.job import Job, to_jobs
+from src.core.fragment_cache import FragmentCache
+
+# À incrémenter quand le prompt change, pour ne pas réutiliser les anciens fragments
+FRAGMENT_PROMPT_VERSION = 1
+
+# Budget de latence (secondes) de la mise en forme IA avant de garder les cartes basiques
+DEFAULT_FORMAT_DEADLINE = 20
+
+# Découpage des gros lots : tokens de sortie estimés par carte et budget par appel
+MAX_COMPLETION_TOKENS = 4096
+CARD_TOKENS = 120
+DEFAULT_CHUNK_TOKENS = 3000
+DEFAULT_MAX_CONCURRENCY = 3
+# Limite de requêtes par minute de l'offre gratuite de Groq
+DEFAULT_RATE_LIMIT = 30
+
+EMAIL_HEADER = [
+    '<!DOCTYPE html>',
+    '<html>',
+    '<head>',
+    '    <meta charset="UTF-8">',
+    '    <title>New Job Listings</title>',
+    '</head>',
+    '<body style="font-family: Arial, Helvetica, sans-serif; max-width: 600px; margin: 0 auto; padding: 20px;">',
+    '    <h1 style="color: #333; text-align: center;">New Job Listings</h1>'
+]
+EMAIL_FOOTER = ['</body>', '</html>']
 
 class AIFormatter:
-    def __init__(self):
+    def __init__(self, cache_path=None):
         self.groq_api_key = os.getenv('GROQ_API_KEY')
-        self.api_url = "https://api.groq.com/openai/v1/chat/completions"
+        self.api_url = os.getenv('GROQ_API_URL', "https://api.groq.com/openai/v1/chat/completions")
         self.model = "llama-3.3-70b-versatile"
+        self.http = get_client()
+        # Fragments HTML déjà générés, par empreinte d'offre
+        self.fragment_cache = FragmentCache(
+            cache_path or os.getenv('AI_CACHE_PATH', '/app/data/ai_fragments.json')
+        )
+        self.format_deadline = float(os.getenv('AI_FORMAT_DEADLINE', DEFAULT_FORMAT_DEADLINE))
+        self.chunk_tokens = int(os.getenv('AI_CHUNK_TOKENS', DEFAULT_CHUNK_TOKENS))
+        self._chunk_executor = ThreadPoolExecutor(
+            max_workers=int(os.getenv('AI_MAX_CONCURRENCY', DEFAULT_MAX_CONCURRENCY)),
+            thread_name_prefix='ai-chunk'
+        )
+        self.rate_limiter = RateLimiter(float(os.getenv('AI_RATE_LIMIT', DEFAULT_RATE_LIMIT)))
+        self.last_stats = {}
         
-    def format_jobs(self, jobs: pd.DataFrame) -> str:
-        """Format job listings using AI to create a more readable email content"""
-        if jobs.empty:
+    def format_jobs(self, jobs: List[Job]) -> str:
+        """Format job listings as an HTML email.
+
+        The email shell and location sections are built locally; only the job
+        cards come from the AI. Cards are cached per job, so only jobs never
+        formatted before cost a Groq round trip. Large batches are split into
+        chunks (`_chunk_jobs`) sent concurrently under the concurrency and rate
+        limits. After `format_deadline` seconds the cards of the finished
+        chunks are kept, the other jobs get the basic card, and the late AI
+        cards are still cached for the next run when they arrive.
+        `jobs` may also be dicts or a DataFrame.
+        """
+        jobs_list = to_jobs(jobs)
+        if not jobs_list:
             return ""
-            
-        # Convert jobs to a list of dictionaries for easier formatting
-        jobs_list = jobs.to_dict('records')
-        
-        try:
-            logger.debug("Making API call to Groq...")
-            formatted_content = self._format_with_ai(jobs_list)
-            logger.info("AI successfully formatted the job listings")
-            return formatted_content
-            
-        except Exception as e:
-            logger.error(f"Error while formatting jobs with Groq API: {str(e)}")
-            logger.debug(f"Error details: {e.__class__.__name__}")
-            logger.info("Falling back to basic formatting")
-            return self._basic_format(jobs_list)
+
+        keys = [self._fragment_key(job) for job in jobs_list]
+
+        fragments = {}
+        missing = {}
+        for job, key in zip(jobs_list, keys):
+            if key in fragments or key in missing:
+                continue
+            html = self.fragment_cache.get(key)
+            if html is None:
+                missing[key] = job
+            else:
+                fragments[key] = html
+        cached = len(fragments)
+
+        started = perf_counter()
+        winner = 'cache'
+        if missing:
+            missing_keys = list(missing)
+            missing_jobs = list(missing.values())
+            chunks = self._chunk_jobs(missing_jobs)
+            if len(chunks) > 1:
+                logger.info(f"Formatting {len(missing_jobs)} jobs in {len(chunks)} chunks")
+            logger.debug(f"Making API call to Groq for {len(missing)} job(s)...")
+            # Un future par lot : à l'échéance, les lots déjà terminés sont gardés
+            futures = {
+                self._chunk_executor.submit(self._format_chunk, [missing_jobs[i] for i in chunk]): chunk
+                for chunk in chunks
+            }
+            done, pending = wait(futures, timeout=self.format_deadline)
+            for future in pending:
+                # Un lot arrivé après l'échéance est tout de même mis en cache
+                future.add_done_callback(partial(self._store_fragments, [missing_keys[i] for i in futures[future]]))
+
+            errors = []
+            for future in done:
+                chunk = futures[future]
+                try:
+                    cards = future.result()
+                except Exception as e:
+                    logger.warning(f"AI chunk of {len(chunk)} job(s) failed: {str(e)}")
+                    errors.append(e)
+                    continue
+                for i, html in zip(chunk, cards):
+                    if html:
+                        fragments[missing_keys[i]] = html
+                        self.fragment_cache.put(missing_keys[i], html)
+
+            if len(errors) == len(done):
+                winner = 'basic'
+            else:
+                winner = 'partial' if pending else 'ai'
+            if pending:
+                logger.warning(
+                    f"Groq missed the {self.format_deadline}s formatting deadline for "
+                    f"{len(pending)}/{len(chunks)} chunk(s), using basic formatting for them"
+                )
+            elif winner == 'basic':
+                logger.error(f"Error while formatting jobs with Groq API: {str(errors[0])}")
+                logger.info("Falling back to basic formatting")
+            else:
+                logger.info("AI successfully formatted the job listings")
+
+        elapsed = perf_counter() - started
+        get_counter(f'ai_format_{winner}').observe(elapsed)
+        self.last_stats = {
+            'winner': winner,
+            'elapsed': round(elapsed, 3),
+            'jobs': len(missing) + cached,
+            'cached': cached,
+            'generated': len(fragments) - cached,
+            'basic': len(missing) + cached - len(fragments),
+            'cache': self.fragment_cache.stats(),
+        }
+        logger.info(f"AI fragments: {self.last_stats}")
+        self.fragment_cache.save()
+        return self._render_email(jobs_list, [fragments.get(key) for key in keys])
+
+    def render_cached(self, jobs: List[Job]) -> str:
+        """Build the email of `jobs` from the cached cards only, without calling the AI.
+
+        Used for the per-subscriber digests once `format_jobs` has formatted
+        every new job of the run; jobs without a cached card get the basic card.
+        """
+        jobs_list = to_jobs(jobs)
+        if not jobs_list:
+            return ""
+        return self._render_email(
+            jobs_list, [self.fragment_cache.get(self._fragment_key(job)) for job in jobs_list]
+        )
+
+    def _store_fragments(self, keys: List[str], future) -> None:
+        """Cache the cards of a finished Groq call, even one that missed the deadline."""
+        if future.exception() is not None:
+            return
+        for key, html in zip(keys, future.result()):
+            if html:
+                self.fragment_cache.put(key, html)
+        self.fragment_cache.save()
+
+    def _fragment_key(self, job: Job) -> str:
+        return f"{job.fingerprint}:{self.model}:{FRAGMENT_PROMPT_VERSION}"
     
     def _prepare_jobs_text(self, jobs: List[Dict]) -> str:
         """Convert job listings to a formatted text string"""
         return "\n\n".join([
+            f"ID: {i}\n"
             f"Title: {job['title']}\n"
             f"Company: {job['company']}\n"
             f"Location: {job['location']}\n"
             f"Link: {job['link']}"
-            for job in jobs
+            for i, job in enumerate(jobs)
         ])
     
-    def _format_with_ai(self, jobs: List[Dict]) -> str:
-        """Format job listings using the Groq AI API"""
+    def _estimate_tokens(self, job: Dict) -> int:
+        """Rough number of completion tokens of the card of a job."""
+        return CARD_TOKENS + len(self._prepare_jobs_text([job])) // 3
+
+    def _chunk_jobs(self, jobs: List[Dict]) -> List[List[int]]:
+        """Split job indexes into chunks that fit `chunk_tokens`.
+
+        Jobs of one location stay together when they fit; consecutive small
+        location groups share a chunk.
+        """
+        groups = {}
+        for i, job in enumerate(jobs):
+            groups.setdefault(job['location'], []).append(i)
+
+        chunks, current, used = [], [], 0
+        for indexes in groups.values():
+            group_tokens = sum(self._estimate_tokens(jobs[i]) for i in indexes)
+            if current and used + group_tokens > self.chunk_tokens:
+                chunks.append(current)
+                current, used = [], 0
+            for i in indexes:
+                tokens = self._estimate_tokens(jobs[i])
+                if current and used + tokens > self.chunk_tokens:
+                    chunks.append(current)
+                    current, used = [], 0
+                current.append(i)
+                used += tokens
+        if current:
+            chunks.append(current)
+        return chunks
+
+    def _format_chunk(self, jobs: List[Dict]) -> List[Optional[str]]:
+        """Ask the Groq AI API for the cards of one chunk of jobs."""
         jobs_text = self._prepare_jobs_text(jobs)
         
         system_message = (
-            "You are an expert email content designer specializing in job listings. Your mission is to transform raw job data into a visually appealing, scannable HTML email that recipients will be excited to open and read in common email clients like Outlook and Gmail. Follow these guidelines:\n\n"
-            "1. CREATE HTML EMAIL CONTENT:\n"
-            "   - Generate valid, clean HTML that will render properly in all email clients\n"
-            "   - Use basic HTML tags like <div>, <p>, <h2>, <h3>, <br>, <strong>, <ul>, <li>, <a>, etc.\n"
-            "   - Include proper DOCTYPE and HTML structure with <html>, <head>, and <body> tags\n"
-            "   - Add inline CSS for styling (no external stylesheets or <style> tags as they may be stripped)\n"
-            "   - Use table-based layouts for structure as they're most reliable in email clients\n\n"
-            "2. EMAIL-SAFE HTML DESIGN:\n"
-            "   - Use a single-column layout with a width of 600px maximum\n"
-            "   - Set font-family to web-safe fonts like Arial, Helvetica, sans-serif\n"
-            "   - Use inline CSS for all styling (style=\"property: value;\")\n"
-            "   - Avoid CSS properties that aren't widely supported in email clients\n"
-            "   - Use HTML tables for layout structure when needed\n\n"
-            "3. CONTENT ORGANIZATION:\n"
-            "   - Group jobs by location with clear section headers\n"
-            "   - Make job titles stand out with larger font size or bold formatting\n"
-            "   - Include relevant emojis where appropriate\n"
-            "   - Create visual separation between job listings using borders or background colors\n"
-            "   - Make links clearly visible and ensure they're properly formatted as HTML <a> tags\n\n"
-            "4. EXAMPLE HTML STRUCTURE:\n"
-            "<!DOCTYPE html>\n"
-            "<html>\n"
-            "<head>\n"
-            "    <meta charset=\"UTF-8\">\n"
-            "    <title>New Job Listings</title>\n"
-            "</head>\n"
-            "<body style=\"font-family: Arial, Helvetica, sans-serif; max-width: 600px; margin: 0 auto; padding: 20px;\">\n"
-            "    <h1 style=\"color: #333; text-align: center;\">New Job Listings</h1>\n"
-            "    \n"
-            "    <div style=\"margin-bottom: 30px;\">\n"
-            "        <h2 style=\"background-color: #f0f0f0; padding: 10px; border-radius: 5px;\">📍 Location Name</h2>\n"
-            "        \n"
-            "        <div style=\"border: 1px solid #ddd; padding: 15px; margin-bottom: 15px; border-radius: 5px;\">\n"
-            "            <h3 style=\"margin-top: 0; color: #2a5885;\">📋 Job Title</h3>\n"
-            "            <p style=\"margin: 5px 0;\">🏢 Company Name</p>\n"
-            "            <p style=\"margin: 5px 0;\">📍 Location</p>\n"
-            "            <p style=\"margin: 5px 0;\"><a href=\"https://job-link.com\" style=\"color: #0066cc;\">🔗 Apply Here</a></p>\n"
-            "        </div>\n"
-            "        \n"
-            "        <!-- Additional job listings for this location -->\n"
-            "    </div>\n"
-            "    \n"
-            "    <!-- Additional location sections -->\n"
-            "</body>\n"
-            "</html>\n\n"
-            "IMPORTANT: Your output must be complete, valid HTML that will render correctly in email clients. Include all necessary HTML tags and inline CSS styling. Make sure all links are properly formatted as HTML <a> tags."
+            "You are an expert email content designer specializing in job listings. Your mission is to turn raw job data into visually appealing, scannable HTML cards for an email read in common clients like Outlook and Gmail. Follow these guidelines:\n\n"
+            "1. ONE CARD PER JOB:\n"
+            "   - Produce one HTML fragment per job: a single <div> element, without <html>, <head>, <body> or location headers\n"
+            "   - Use basic HTML tags like <div>, <p>, <h3>, <br>, <strong>, <a>\n"
+            "   - Add inline CSS for styling (no <style> tags as they may be stripped), with web-safe fonts\n"
+            "   - Make the job title stand out and include relevant emojis where appropriate\n"
+            "   - Include the company, the location and the link as an HTML <a> tag with the exact URL given\n\n"
+            "2. EXAMPLE CARD:\n"
+            "<div style=\"border: 1px solid #ddd; padding: 15px; margin-bottom: 15px; border-radius: 5px;\">\n"
+            "    <h3 style=\"margin-top: 0; color: #2a5885;\">📋 Job Title</h3>\n"
+            "    <p style=\"margin: 5px 0;\">🏢 Company Name</p>\n"
+            "    <p style=\"margin: 5px 0;\">📍 Location</p>\n"
+            "    <p style=\"margin: 5px 0;\"><a href=\"https://job-link.com\" style=\"color: #0066cc;\">🔗 Apply Here</a></p>\n"
+            "</div>\n\n"
+            "3. OUTPUT FORMAT:\n"
+            "Answer with a JSON object only: {\"fragments\": {\"<ID>\": \"<div ...>...</div>\"}}, with one entry for every job ID you were given."
         )
         
-        user_prompt = f"Please format these new job listings into an HTML email that will display correctly in email clients. Group jobs by location and make the content visually appealing and easy to scan:\n\n{jobs_text}"
+        user_prompt = f"Please format each of these new job listings as an HTML card:\n\n{jobs_text}"
         
         logger.debug(f"Sending prompt to Groq API:\n{user_prompt}")
         
+        self.rate_limiter.acquire()
         content = self._call_groq(system_message, user_prompt)
         
         # Clean the content to remove any backticks or code block markers
         cleaned_content = self._clean_html_content(content)
         logger.debug(f"Cleaned content:\n{cleaned_content}")
         
-        return cleaned_content
+        return self._parse_fragments(cleaned_content, jobs)
+
+    def _parse_fragments(self, content: str, jobs: List[Dict]) -> List[Optional[str]]:
+        """Extract the card of each job from the JSON answer, keeping only plausible ones."""
+        fragments = json.loads(content).get('fragments') or {}
+        if not isinstance(fragments, dict):
+            raise ValueError("Unexpected AI answer: 'fragments' is not an object")
+
+        result = []
+        for i, job in enumerate(jobs):
+            html = fragments.get(str(i))
+            # Une carte doit être un seul bloc <div> et reprendre le lien de l'offre (brut ou échappé : & -> &amp;)
+            link = str(job['link'])
+            if (not isinstance(html, str) or not html.strip().startswith('<div')
+                    or (link not in html and escape(link) not in html)):
+                logger.warning(f"No usable AI card for job {i}, using basic formatting")
+                html = None
+            result.append(html.strip() if html else None)
+        return result
     
     def _clean_html_content(self, content: str) -> str:
         """
@@ -133,48 +298,48 @@ class AIFormatter:
     
     def _basic_format(self, jobs: List[Dict]) -> str:
         """Fallback basic formatting if AI fails"""
-        html_content = [
-            '<!DOCTYPE html>',
-            '<html>',
-            '<head>',
-            '    <meta charset="UTF-8">',
-            '    <title>New Job Listings</title>',
-            '</head>',
-            '<body style="font-family: Arial, Helvetica, sans-serif; max-width: 600px; margin: 0 auto; padding: 20px;">',
-            '    <h1 style="color: #333; text-align: center;">New Job Listings</h1>'
-        ]
+        return self._render_email(jobs, [None] * len(jobs))
+
+    def _basic_fragment(self, job: Dict) -> str:
+        """Card of a job in the basic format."""
+        return '\n'.join([
+            f'        <div style="border: 1px solid #ddd; padding: 15px; margin-bottom: 15px; border-radius: 5px;">',
+            f'            <h3 style="margin-top: 0; color: #2a5885;">📋 {job["title"]}</h3>',
+            f'            <p style="margin: 5px 0;">🏢 {job["company"]}</p>',
+            f'            <p style="margin: 5px 0;">📍 {job["location"]}</p>',
+            f'            <p style="margin: 5px 0;"><a href="{job["link"]}" style="color: #0066cc;">🔗 Apply Here</a></p>',
+            f'        </div>'
+        ])
+
+    def _render_email(self, jobs: List[Dict], fragments: List[Optional[str]]) -> str:
+        """Build the email shell around the job cards, grouped by location.
+
+        `fragments[i]` is the card of `jobs[i]`, or None for the basic card.
+        """
+        html_content = list(EMAIL_HEADER)
         
         # Group jobs by location
         locations = {}
-        for job in jobs:
-            location = job['location']
-            if location not in locations:
-                locations[location] = []
-            locations[location].append(job)
+        for job, fragment in zip(jobs, fragments):
+            locations.setdefault(job['location'], []).append(fragment or self._basic_fragment(job))
         
         # Generate HTML for each location group
-        for location, location_jobs in locations.items():
+        for location, cards in locations.items():
             html_content.append(f'    <div style="margin-bottom: 30px;">')
             html_content.append(f'        <h2 style="background-color: #f0f0f0; padding: 10px; border-radius: 5px;">📍 {location}</h2>')
-            
-            for job in location_jobs:
-                html_content.append(f'        <div style="border: 1px solid #ddd; padding: 15px; margin-bottom: 15px; border-radius: 5px;">')
-                html_content.append(f'            <h3 style="margin-top: 0; color: #2a5885;">📋 {job["title"]}</h3>')
-                html_content.append(f'            <p style="margin: 5px 0;">🏢 {job["company"]}</p>')
-                html_content.append(f'            <p style="margin: 5px 0;">📍 {job["location"]}</p>')
-                html_content.append(f'            <p style="margin: 5px 0;"><a href="{job["link"]}" style="color: #0066cc;">🔗 Apply Here</a></p>')
-                html_content.append(f'        </div>')
-            
+            html_content.extend(cards)
             html_content.append(f'    </div>')
         
-        html_content.append('</body>')
-        html_content.append('</html>')
+        html_content.extend(EMAIL_FOOTER)
         
         return '\n'.join(html_content)
 
     def _call_groq(self, system_message: str, user_prompt: str) -> str:
         """
         Call the Groq API and return the formatted content.
+
+        The answer is streamed and reading stops as soon as the JSON object is
+        complete.
         """
         payload = {
             "messages": [
@@ -189,9 +354,10 @@ class AIFormatter:
             ],
             "model": self.model,
             "temperature": 0.7,
-            "max_completion_tokens": 4096,
+            "max_completion_tokens": MAX_COMPLETION_TOKENS,
             "top_p": 0.95,
-            "stream": False,
+            # Le mode JSON de Groq n'accepte pas le streaming : le format est imposé par le prompt
+            "stream": True,
             "stop": None
         }
 
@@ -200,10 +366,60 @@ class AIFormatter:
             "Authorization": f"Bearer {self.groq_api_key}"
         }
 
-        response = requests.post(self.api_url, headers=headers, json=payload)
+        response = self.http.post('groq', self.api_url, headers=headers, json=payload, stream=True)
         
         if response.status_code != 200:
             raise Exception(f"API call failed with status code {response.status_code}: {response.text}")
 
-        result = response.json()
-        return result["choices"][0]["message"]["content"] 
\ No newline at end of file
+        return self._read_stream(response)
+
+    def _read_stream(self, response) -> str:
+        """Concatenate the streamed deltas (server-sent events) until the JSON object is complete."""
+        parts = []
+        scanner = JsonEndScanner()
+        try:
+            for line in response.iter_lines(decode_unicode=True):
+                if not line or not line.startswith('data:'):
+                    continue
+                data = line[len('data:'):].strip()
+                if data == '[DONE]':
+                    break
+                delta = json.loads(data)["choices"][0].get("delta", {}).get("content") or ""
+                parts.append(delta)
+                if scanner.feed(delta):
+                    logger.debug("AI content complete, closing the stream early")
+                    break
+        finally:
+            response.close()
+        return ''.join(parts)
+
+
+class JsonEndScanner:
+    """Incrementally detect the end of the first top-level JSON object in a text."""
+
+    def __init__(self):
+        self.depth = 0
+        self.started = False
+        self.in_string = False
+        self.escaped = False
+
+    def feed(self, text: str) -> bool:
+        """Consume a chunk; True once the top-level object is closed."""
+        for char in text:
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == '\\':
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '"' and self.started:
+                self.in_string = True
+            elif char == '{':
+                self.started = True
+                self.depth += 1
+            elif char == '}' and self.started:
+                self.depth -= 1
+                if self.depth == 0:
+                    return True
+        return False
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+BrowserPool module keeping headless Chrome drivers warm between Selenium fallbacks.
+"""
+
+import atexit
+import os
+import threading
+from contextlib import contextmanager
+from time import monotonic
+from loguru import logger
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+JOB_TABLE_SELECTOR = 'tr.sectiontableentry1, tr.sectiontableentry2, table.contentpane'
+
+
+def create_chrome_driver():
+    """Start a headless Chrome configured like the historical fallback."""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+
+    options = Options()
+    options.add_argument("--headless=new")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--window-size=1920,1080")
+    options.add_argument(f"user-agent={USER_AGENT}")
+
+    logger.info("Initializing Selenium WebDriver")
+    return webdriver.Chrome(options=options)
+
+
+def wait_for_job_table(driver, timeout):
+    """Block until the job table is in the DOM. Returns False on timeout."""
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    try:
+        WebDriverWait(driver, timeout).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, JOB_TABLE_SELECTOR))
+        )
+        return True
+    except TimeoutException:
+        return False
+
+
+class BrowserPool:
+    """Bounded pool of reusable WebDriver instances.
+
+    Idle drivers are health-checked before reuse and quit once they have been
+    idle longer than `idle_timeout` seconds, by a daemon reaper thread running
+    while the pool holds idle drivers. At most `max_size` drivers exist at
+    once; extra callers wait for one to be released. Drivers are quit and
+    health-checked outside the pool lock.
+    """
+
+    def __init__(self, max_size=None, idle_timeout=None, driver_factory=create_chrome_driver):
+        self.max_size = max_size or int(os.getenv('BROWSER_POOL_SIZE', 1))
+        self.idle_timeout = idle_timeout if idle_timeout is not None else float(os.getenv('BROWSER_IDLE_TIMEOUT', 600))
+        self.driver_factory = driver_factory
+        self._idle = []  # (driver, released_at)
+        self._size = 0
+        self._cond = threading.Condition()
+        self._reaper = None
+        self._closed = threading.Event()
+
+    @property
+    def size(self):
+        return self._size
+
+    def acquire(self, timeout=None):
+        """Return a healthy driver, starting a new one if the pool is not full."""
+        deadline = None if timeout is None else monotonic() + timeout
+        while True:
+            driver = None
+            create = False
+            with self._cond:
+                expired = self._pop_expired()
+                if self._idle:
+                    driver, _ = self._idle.pop()
+                elif self._size < self.max_size:
+                    self._size += 1
+                    create = True
+                elif not expired:
+                    remaining = None if deadline is None else deadline - monotonic()
+                    if (remaining is not None and remaining <= 0) or not self._cond.wait(remaining):
+                        raise TimeoutError("No browser available in pool")
+                    continue
+
+            # Hors du verrou : arrêter Chrome ou l'interroger ne bloque pas les autres appelants
+            for old in expired:
+                logger.debug("Closing idle browser")
+                self._discard(old)
+            if create:
+                break
+            if driver is not None:
+                if self._is_healthy(driver):
+                    return driver
+                logger.warning("Discarding unhealthy browser")
+                self._discard(driver)
+
+        try:
+            return self.driver_factory()
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+
+    def release(self, driver, healthy=True):
+        """Give a driver back to the pool, or quit it if it is broken."""
+        if not healthy:
+            self._discard(driver)
+            return
+        with self._cond:
+            self._idle.append((driver, monotonic()))
+            if self._reaper is None:
+                self._reaper = threading.Thread(target=self._reap_loop, name='browser-reaper', daemon=True)
+                self._reaper.start()
+            self._cond.notify()
+
+    @contextmanager
+    def driver(self):
+        driver = self.acquire()
+        healthy = True
+        try:
+            yield driver
+        except Exception:
+            healthy = self._is_healthy(driver)
+            raise
+        finally:
+            self.release(driver, healthy)
+
+    def close(self):
+        """Quit every idle driver and stop the reaper."""
+        self._closed.set()
+        with self._cond:
+            drivers = [driver for driver, _ in self._idle]
+            self._idle = []
+        for driver in drivers:
+            self._discard(driver)
+
+    def _pop_expired(self):
+        """Remove and return the drivers idle for longer than `idle_timeout` (lock held)."""
+        now = monotonic()
+        expired = [driver for driver, released_at in self._idle if now - released_at > self.idle_timeout]
+        if expired:
+            self._idle = [entry for entry in self._idle if now - entry[1] <= self.idle_timeout]
+        return expired
+
+    def _reap_loop(self):
+        """Quit idle drivers as they expire, until the pool holds no idle driver."""
+        while True:
+            with self._cond:
+                expired = self._pop_expired()
+                if not expired and (not self._idle or self._closed.is_set()):
+                    self._reaper = None
+                    return
+                delay = None
+                if not expired:
+                    delay = min(released_at for _, released_at in self._idle) + self.idle_timeout - monotonic()
+            for driver in expired:
+                logger.debug("Closing idle browser")
+                self._discard(driver)
+            if delay is not None:
+                self._closed.wait(max(0.0, delay))
+
+    def _is_healthy(self, driver):
+        try:
+            driver.execute_script("return 1")
+            return True
+        except Exception:
+            return False
+
+    def _discard(self, driver):
+        """Quit a driver taken out of the pool and free its slot."""
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.debug(f"Error while quitting browser: {str(e)}")
+        with self._cond:
+            self._size -= 1
+            self._cond.notify()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_browser_pool():
+    """Return the process-wide browser pool."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = BrowserPool()
+            atexit.register(_pool.close)
+        return _pool
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Config module loading the YAML configuration of the scraper.
+"""
+
+import os
+import threading
+import yaml
+from loguru import logger
+
+DEFAULT_CONFIG_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    'config', 'scraper.yaml'
+)
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def get_config_path():
+    return os.getenv('SCRAPER_CONFIG', DEFAULT_CONFIG_PATH)
+
+
+def load_config(path=None):
+    """Load the YAML config, reusing the parsed content while the file is unchanged."""
+    path = path or get_config_path()
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        logger.warning(f"Config file not found: {path}")
+        return {}
+
+    with _cache_lock:
+        cached = _cache.get(path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+
+    try:
+        with open(path, encoding='utf-8') as f:
+            config = yaml.safe_load(f) or {}
+    except Exception as e:
+        logger.error(f"Error loading config {path}: {str(e)}")
+        return {}
+
+    with _cache_lock:
+        _cache[path] = (mtime, config)
+    return config
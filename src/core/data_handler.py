@@ -3,51 +3,300 @@
 DataHandler module for handling data storage and retrieval.
 """
 
+import csv
+import fcntl
+import hashlib
+import io
 import os
-import pandas as pd
+import tempfile
+import threading
+from datetime import datetime
 from loguru import logger
+from src.core.config import load_config
+from src.core.sqlite_store import SQLiteStore
+from src.core.job import COLUMNS, Job, jobs_from_rows, jobs_to_dataframe, to_jobs
+from src.core.job_query import JobIndex
+from src.core.fingerprint import FingerprintIndex, job_fingerprint
+from src.core.search_index import SearchIndex
+
+
+def _date_key(job):
+    # Offres sans date en dernier dans l'ordre antichronologique
+    return (job.date is not None, job.date or datetime.min)
 
 class DataHandler:
-    def __init__(self, filename="/app/data/jobs.csv"):
+    def __init__(self, filename="/app/data/jobs.csv", backend=None):
         self.filename = filename
-        self.df = pd.DataFrame()
+        # Dernier DataFrame exporté par load_data
+        self.df = None
+
+        # Le backend vient de la config (storage.backend), `STORAGE_BACKEND` a priorité
+        storage = load_config().get('storage') or {}
+        self.backend = backend or os.getenv('STORAGE_BACKEND') or storage.get('backend', 'csv')
+        self.store = None
+
+        # Cache des enregistrements triés, invalidé par la signature (mtime, taille, inode) du fichier
+        self._records_cache = None
+        self._records_signature = None
+        self._job_index = None
+        self._cache_lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+        if self.backend == 'sqlite':
+            db_path = os.getenv('SQLITE_PATH') or storage.get('sqlite_path') or f"{os.path.splitext(filename)[0]}.db"
+            self.store = SQLiteStore(db_path)
+
+        # Index des empreintes des offres déjà enregistrées, chargé une seule fois
+        index_path = os.getenv('FINGERPRINT_INDEX_PATH') or f"{os.path.splitext(filename)[0]}.fingerprints"
+        if self._storage_signature() is None and os.path.exists(index_path):
+            # Données supprimées à la main : l'index est périmé
+            os.remove(index_path)
+        self.fingerprints = FingerprintIndex(index_path, rebuild=self._stored_fingerprints)
+
+        # Index plein texte, mis à jour à chaque sauvegarde ; resynchronisé au premier usage si besoin
+        self.search_index = SearchIndex(
+            os.getenv('SEARCH_INDEX_PATH') or f"{os.path.splitext(filename)[0]}.search.db"
+        )
+        self._search_checked = False
+
+        if self.store is not None:
+            self.store.migrate_from_csv(self.filename)
+
+    def _stored_fingerprints(self):
+        """Yield the fingerprint of every stored job, without building a DataFrame."""
+        if self.store is not None:
+            yield from self.store.fingerprints()
+        elif os.path.exists(self.filename):
+            for row in csv.DictReader(self._read_csv_text()):
+                yield job_fingerprint(row)
+
+    def unseen_jobs(self, jobs):
+        """Jobs of `jobs` (jobs, dicts or a DataFrame) whose fingerprint is not stored yet, without duplicates."""
+        jobs = to_jobs(jobs)
+        if not jobs:
+            return jobs
+        self.fingerprints.refresh()
+        seen = set()
+        keep = []
+        for job in jobs:
+            key = job.fingerprint
+            if key not in seen and key not in self.fingerprints:
+                keep.append(job)
+            seen.add(key)
+        return keep
 
     def save_data(self, new_jobs):
-        """Save scraped data to CSV."""
+        """Save the jobs not stored yet; only those are written (O(new jobs))."""
         try:
-            # Initialize combined with new_jobs
-            combined = new_jobs
+            new_jobs = self.unseen_jobs(new_jobs)
+            if not new_jobs:
+                logger.info("0 new offers saved")
+                return
 
-            if os.path.exists(self.filename):
-                try:
-                    existing_df = pd.read_csv(self.filename)
-                    if not existing_df.empty:
-                        combined = pd.concat([existing_df, new_jobs]).drop_duplicates(subset=['title', 'link'])
-                except Exception as e:
-                    logger.warning(f"Could not read existing file: {str(e)}")
-
-            # Ensure the data directory exists
-            os.makedirs(os.path.dirname(self.filename), exist_ok=True)
-            
-            # Save the combined dataframe
-            combined.to_csv(self.filename, index=False)
+            if self.store is not None:
+                self.store.insert_jobs(new_jobs)
+            elif self._csv_header() == COLUMNS:
+                self._append_csv(new_jobs)
+            else:
+                # Fichier absent ou ancien jeu de colonnes : réécriture complète
+                existing = []
+                if os.path.exists(self.filename):
+                    try:
+                        existing = self._read_csv_jobs()
+                    except Exception as e:
+                        logger.warning(f"Could not read existing file: {str(e)}")
+                self._write_csv(existing + new_jobs)
+
+            self.fingerprints.add([job.fingerprint for job in new_jobs])
+            self.search_index.add(new_jobs)
+            self.invalidate_cache()
             logger.info(f"{len(new_jobs)} new offers saved")
 
         except Exception as e:
             logger.error(f"Error saving data: {str(e)}")
 
-    def load_data(self):
-        """Load previously saved data from CSV."""
+    def search(self, text, limit=20, offset=0):
+        """Full-text search over title, company and location; returns (items, total)."""
+        self._sync_search_index()
+        return self.search_index.search(text, limit, offset)
+
+    def _sync_search_index(self):
+        """Rebuild the search index once if it does not hold the stored jobs
+        (index file removed, data written before the index existed)."""
+        if self._search_checked:
+            return
+        self.fingerprints.refresh()
+        if self.search_index.count() != len(self.fingerprints):
+            self.search_index.rebuild(self._stored_records())
+        self._search_checked = True
+
+    def _stored_records(self):
+        """Yield every stored job as a dict, without building a DataFrame."""
+        if self.store is not None:
+            yield from self.store.load_jobs()
+        elif os.path.exists(self.filename):
+            yield from csv.DictReader(self._read_csv_text())
+
+    def load_jobs(self):
+        """Return every saved job as a `Job`, in storage order."""
         try:
+            if self.store is not None:
+                return jobs_from_rows(self.store.load_rows())
             if os.path.exists(self.filename):
-                self.df = pd.read_csv(self.filename)
-
-                if self.df.empty:
-                    return pd.DataFrame()
-                else:
-                    return self.df
-            else:
-                return pd.DataFrame()
+                return self._read_csv_jobs()
         except Exception as e:
             logger.error(f"Error loading data: {str(e)}")
-            return pd.DataFrame()
+        return []
+
+    def load_data(self):
+        """Return saved jobs as a DataFrame (typed `date` column), for analysis.
+
+        The application itself works on `load_jobs` / `load_records`.
+        """
+        self.df = jobs_to_dataframe(self.load_jobs())
+        return self.df
+
+    def load_records(self):
+        """Return saved jobs as a list of `Job` sorted by date (newest first).
+
+        The result is cached and reused until the storage file changes on disk,
+        so repeated reads skip parsing entirely. Callers must not modify it.
+        """
+        return self._cached_records()[0]
+
+    def data_version(self):
+        """Short identifier of the stored data, changing whenever the storage file changes."""
+        return self._version(self._cached_records()[1])
+
+    def job_index(self):
+        """Return the query index (sort orders, search keys, locations) of the current data."""
+        records, signature = self._cached_records()
+        with self._cache_lock:
+            if self._job_index is None or self._job_index.records is not records:
+                self._job_index = JobIndex(records, self._version(signature))
+            return self._job_index
+
+    def _cached_records(self):
+        """Return (records, signature), reloading only if the storage changed."""
+        signature = self._storage_signature()
+        with self._cache_lock:
+            if signature is not None and signature == self._records_signature:
+                self.cache_hits += 1
+                return self._records_cache, signature
+
+            self.cache_misses += 1
+            records = sorted(self.load_jobs(), key=_date_key, reverse=True)
+
+            self._records_cache = records
+            self._records_signature = signature
+            self._job_index = None
+            return records, signature
+
+    def last_modified(self):
+        """Timestamp (seconds) of the last change of the storage files, or None if nothing is stored."""
+        signature = self._storage_signature()
+        if signature is None:
+            return None
+        return max(entry[0] for entry in signature if entry is not None) // 10 ** 9
+
+    @staticmethod
+    def _version(signature):
+        return hashlib.sha1(repr(signature).encode('utf-8')).hexdigest()[:16]
+
+    def cache_stats(self):
+        """Return hit/miss counters of the records cache."""
+        total = self.cache_hits + self.cache_misses
+        return {
+            'hits': self.cache_hits,
+            'misses': self.cache_misses,
+            'hit_rate': round(self.cache_hits / total, 4) if total else None,
+        }
+
+    def invalidate_cache(self):
+        with self._cache_lock:
+            self._records_signature = None
+            self._records_cache = None
+            self._job_index = None
+
+    def _storage_signature(self):
+        """(mtime, size, inode) of the storage files, or None if nothing is stored yet."""
+        paths = [self.store.path, f"{self.store.path}-wal"] if self.store is not None else [self.filename]
+        signature = []
+        for path in paths:
+            try:
+                st = os.stat(path)
+                signature.append((st.st_mtime_ns, st.st_size, st.st_ino))
+            except OSError:
+                signature.append(None)
+        return tuple(signature) if signature[0] is not None else None
+
+    def clear_data(self):
+        """Remove every saved job."""
+        self.df = None
+        if self.store is not None:
+            self.store.clear()
+        else:
+            self._write_csv([])
+        self.fingerprints.clear()
+        self.search_index.clear()
+        self.invalidate_cache()
+
+    def _csv_header(self):
+        """Column names of the CSV file, or None if it does not exist."""
+        try:
+            with open(self.filename, encoding='utf-8', newline='') as f:
+                return next(csv.reader(f), None)
+        except OSError:
+            return None
+
+    def _read_csv_text(self):
+        """Content of the CSV file up to its last complete row, read under a shared lock."""
+        with open(self.filename, encoding='utf-8', newline='') as f:
+            # Attend la fin d'un ajout en cours (`_append_csv`)
+            fcntl.flock(f, fcntl.LOCK_SH)
+            text = f.read()
+        if text and not text.endswith('\n'):
+            # Ligne sans fin de ligne : ajout interrompu, ignorée
+            logger.warning(f"Ignoring incomplete last row of {self.filename}")
+            text = text[:text.rfind('\n') + 1]
+        return io.StringIO(text, newline='')
+
+    def _read_csv_jobs(self):
+        """Every job of the CSV file, in file order (older column layouts included)."""
+        reader = csv.reader(self._read_csv_text())
+        header = next(reader, None)
+        if header is None:
+            return []
+        if header == COLUMNS:
+            width = len(COLUMNS)
+            return jobs_from_rows(
+                row if len(row) == width else (row + [None] * width)[:width]
+                for row in reader if row
+            )
+        return [Job.from_record(dict(zip(header, row))) for row in reader if row]
+
+    def _append_csv(self, jobs):
+        """Append rows to the CSV in a single write, under an exclusive lock."""
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator='\n').writerows(job.row() for job in jobs)
+        with open(self.filename, 'a', encoding='utf-8', newline='') as f:
+            # Le verrou est libéré à la fermeture, une fois le tampon vidé
+            fcntl.flock(f, fcntl.LOCK_EX)
+            f.write(buffer.getvalue())
+
+    def _write_csv(self, jobs):
+        """Write the CSV atomically so readers never see a half-written file."""
+        # Ensure the data directory exists
+        os.makedirs(os.path.dirname(self.filename) or '.', exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.filename) or '.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+                writer = csv.writer(f, lineterminator='\n')
+                writer.writerow(COLUMNS)
+                writer.writerows(job.row() for job in jobs)
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, self.filename)
+        except Exception:
+            os.unlink(tmp_path)
+            raise
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Fingerprint module: normalized job keys and the on-disk index of known jobs.
+"""
+
+import hashlib
+import os
+import re
+import threading
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+from loguru import logger
+from src.core.matcher import normalize
+
+TRACKING_PARAMS = ('utm_', 'fbclid', 'gclid')
+DEFAULT_PORTS = {'http': '80', 'https': '443'}
+
+
+def normalize_url(url):
+    """Canonical form of a job link: lowercase scheme/host, no default port,
+    fragment, tracking parameters or trailing slash, sorted query."""
+    if not url:
+        return ''
+    parts = urlsplit(str(url).strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    if parts.port and str(parts.port) != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith(TRACKING_PARAMS)
+    )
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit((scheme, host, path, urlencode(query), ''))
+
+
+def normalize_text(text):
+    """Accent- and case-folded text with collapsed whitespace."""
+    if text is None or (isinstance(text, float) and text != text):
+        return ''
+    return re.sub(r'\s+', ' ', normalize(str(text))).strip()
+
+
+def job_fingerprint(job):
+    """Compact key (16 hex chars) of a job from its normalized link, title and location."""
+    raw = '\x1f'.join((
+        normalize_url(job.get('link')),
+        normalize_text(job.get('title')),
+        normalize_text(job.get('location')),
+    ))
+    return hashlib.blake2b(raw.encode('utf-8'), digest_size=8).hexdigest()
+
+
+class FingerprintIndex:
+    """Set of known job fingerprints, persisted as one key per line.
+
+    The file is read once; `add` appends only the new keys, so membership checks
+    are O(1) and updates O(new jobs). `refresh` reads the keys appended by other
+    processes since the last read. When the file does not exist (not created
+    yet, or removed when the data was cleared), the index is seeded with
+    `rebuild` from the stored jobs.
+    """
+
+    def __init__(self, path, rebuild=None):
+        self.path = path
+        self._rebuild = rebuild
+        self._keys = None
+        self._offset = 0
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._keys is not None:
+            return self._keys
+        self._keys = set()
+        self._offset = 0
+        if os.path.exists(self.path):
+            self._read_tail()
+        elif self._rebuild is not None:
+            self._keys.update(self._rebuild())
+            if self._keys:
+                # Sans offre, aucun fichier n'est écrit : l'index (vide) est reconstruit à chaque relecture
+                self._write_all(self._keys)
+                logger.info(f"Fingerprint index rebuilt with {len(self._keys)} jobs")
+        return self._keys
+
+    def _read_tail(self):
+        with open(self.path, 'rb') as f:
+            f.seek(self._offset)
+            data = f.read()
+        # Ne garder que les lignes complètes
+        end = data.rfind(b'\n') + 1
+        self._keys.update(line.decode('ascii') for line in data[:end].split() if line)
+        self._offset += end
+
+    def _sync(self):
+        if self._keys is None:
+            return self._load()
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            # Fichier supprimé (données vidées par un autre processus) : rechargement depuis le stockage
+            self._keys = None
+            return self._load()
+        if size < self._offset:
+            # Fichier réécrit ou vidé : relecture complète
+            self._keys = None
+            return self._load()
+        if size > self._offset:
+            self._read_tail()
+        return self._keys
+
+    def refresh(self):
+        """Pick up keys written to the file by other processes."""
+        with self._lock:
+            self._sync()
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._load()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._load())
+
+    def add(self, keys):
+        """Add keys and append the new ones to the index file. Returns the new keys."""
+        with self._lock:
+            known = self._sync()
+            new_keys = []
+            for key in keys:
+                if key not in known:
+                    known.add(key)
+                    new_keys.append(key)
+            if new_keys:
+                os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+                # `_offset` reste en place : le prochain `_sync` relit nos clés et celles
+                # qu'un autre processus a pu ajouter entre-temps
+                with open(self.path, 'ab') as f:
+                    f.write(''.join(f"{key}\n" for key in new_keys).encode('ascii'))
+            return new_keys
+
+    def clear(self):
+        with self._lock:
+            self._keys = set()
+            self._offset = 0
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+    def _write_all(self, keys):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        data = ''.join(f"{key}\n" for key in sorted(keys)).encode('ascii')
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, self.path)
+        self._offset = len(data)
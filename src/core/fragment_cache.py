@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+FragmentCache module: on-disk cache of AI-formatted HTML fragments.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from loguru import logger
+
+DEFAULT_MAX_ENTRIES = 2000
+DEFAULT_TTL = 30 * 24 * 3600
+
+
+class FragmentCache:
+    """HTML fragments keyed by job fingerprint, persisted in a JSON file.
+
+    Entries are evicted least recently used first beyond `max_entries`, and
+    ignored once older than `ttl` seconds. The file is read once and written
+    by `save()` only if something changed.
+    """
+
+    def __init__(self, path, max_entries=None, ttl=None, clock=time.time):
+        self.path = path
+        self.max_entries = max_entries or int(os.getenv('AI_CACHE_MAX_ENTRIES', DEFAULT_MAX_ENTRIES))
+        self.ttl = ttl or int(os.getenv('AI_CACHE_TTL', DEFAULT_TTL))
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._entries = None
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._entries is not None:
+            return self._entries
+        entries = OrderedDict()
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, encoding='utf-8') as f:
+                    # Le fichier est écrit du moins au plus récemment utilisé
+                    for key, entry in json.load(f):
+                        entries[key] = entry
+        except Exception as e:
+            logger.warning(f"Could not read fragment cache: {str(e)}")
+        self._entries = entries
+        return entries
+
+    def get(self, key):
+        """Return the cached fragment, or None if missing or expired."""
+        with self._lock:
+            entries = self._load()
+            entry = entries.get(key)
+            if entry is not None and self.clock() - entry['created'] > self.ttl:
+                del entries[key]
+                self._dirty = True
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            entries.move_to_end(key)
+            self._dirty = True
+            self.hits += 1
+            return entry['html']
+
+    def put(self, key, html):
+        with self._lock:
+            entries = self._load()
+            entries[key] = {'html': html, 'created': self.clock()}
+            entries.move_to_end(key)
+            while len(entries) > self.max_entries:
+                entries.popitem(last=False)
+            self._dirty = True
+
+    def save(self):
+        """Write the cache atomically if it changed."""
+        with self._lock:
+            if not self._dirty:
+                return
+            try:
+                os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+                tmp_path = f"{self.path}.tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(list(self._entries.items()), f)
+                os.replace(tmp_path, self.path)
+                self._dirty = False
+            except Exception as e:
+                logger.error(f"Error saving fragment cache: {str(e)}")
+
+    def __len__(self):
+        with self._lock:
+            return len(self._load())
+
+    def stats(self):
+        """Hit/miss counters of this process and number of cached fragments."""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / total, 4) if total else None,
+            'entries': len(self),
+        }
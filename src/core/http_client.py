@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+HTTP client module providing pooled keep-alive sessions shared by all outbound calls.
+"""
+
+import os
+import threading
+
+# Politique par service : timeout (connexion, lecture) et retries au niveau transport.
+# Le scraper garde ses retries tenacity, d'où un seul retry réseau ici.
+# Un POST Resend déjà reçu ne doit pas être rejoué (email en double) : sans méthode listée, seules les
+# erreurs de connexion (requête jamais envoyée) sont retentées, la boîte d'envoi gère les autres échecs.
+SERVICES = {
+    'scraper': {'timeout': (5, 15), 'retries': 1, 'backoff': 0.5, 'methods': ['GET', 'HEAD']},
+    'groq': {'timeout': (5, 60), 'retries': 2, 'backoff': 1, 'methods': ['POST']},
+    'resend': {'timeout': (5, 10), 'retries': 2, 'backoff': 1, 'methods': []},
+}
+RETRY_STATUSES = (429, 502, 503, 504)
+
+
+class HttpClient:
+    """One keep-alive `requests.Session` per service, created lazily and reused.
+
+    Each session gets its own connection pool and urllib3 retry policy; the
+    default timeout of the service is applied unless the caller passes one.
+    A service without retryable methods only retries connection errors.
+    Timeouts and retries can be overridden with `HTTP_TIMEOUT_<SERVICE>` (read
+    timeout, seconds) and `HTTP_RETRIES_<SERVICE>`.
+    """
+
+    def __init__(self, pool_maxsize=None):
+        self.pool_maxsize = pool_maxsize or int(os.getenv('SCRAPER_MAX_CONCURRENCY', 8))
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def policy(self, service):
+        """Return the effective policy of a service, env overrides applied."""
+        policy = dict(SERVICES[service])
+        name = service.upper()
+        if os.getenv(f'HTTP_TIMEOUT_{name}'):
+            policy['timeout'] = (policy['timeout'][0], float(os.getenv(f'HTTP_TIMEOUT_{name}')))
+        if os.getenv(f'HTTP_RETRIES_{name}'):
+            policy['retries'] = int(os.getenv(f'HTTP_RETRIES_{name}'))
+        return policy
+
+    def session(self, service):
+        """Return the pooled session for a service."""
+        with self._lock:
+            if service not in self._sessions:
+                self._sessions[service] = self._build_session(service)
+            return self._sessions[service]
+
+    def _build_session(self, service):
+        # Importé à la première requête : le processus web n'en a pas besoin pour démarrer
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        policy = self.policy(service)
+        replay = None if policy['methods'] else 0
+        retry = Retry(
+            total=policy['retries'],
+            read=replay,
+            status=replay,
+            other=replay,
+            backoff_factor=policy['backoff'],
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=policy['methods'],
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.pool_maxsize, max_retries=retry)
+        session = requests.Session()
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    def request(self, service, method, url, **kwargs):
+        kwargs.setdefault('timeout', self.policy(service)['timeout'])
+        return self.session(service).request(method, url, **kwargs)
+
+    def get(self, service, url, **kwargs):
+        return self.request(service, 'GET', url, **kwargs)
+
+    def post(self, service, url, **kwargs):
+        return self.request(service, 'POST', url, **kwargs)
+
+    def close(self):
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions = {}
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """Return the process-wide shared HTTP client."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient()
+        return _client
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Job module: compact record of one job offer, used from parsing to the web layer.
+"""
+
+import sys
+from datetime import datetime
+from functools import lru_cache
+from src.core.lazy import LazyModule
+from src.core.fingerprint import job_fingerprint
+
+# pandas ne sert qu'à l'export pour l'analyse
+pd = LazyModule('pandas')
+
+COLUMNS = ['title', 'link', 'company', 'location', 'date']
+DATE_FORMAT = '%Y-%m-%d %H:%M'
+
+
+def _clean(value):
+    """None for empty cells (None, '', pandas NaN), the value otherwise."""
+    # NaN et NaT sont les seules valeurs différentes d'elles-mêmes
+    if value is None or value == '' or value != value:
+        return None
+    return value
+
+
+@lru_cache(maxsize=1024)
+def _format_date(date):
+    return date.strftime(DATE_FORMAT)
+
+
+def parse_date(value):
+    """Date of a job as a datetime, or None if missing or unreadable."""
+    value = _clean(value)
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        # pandas.Timestamp est une sous-classe de datetime
+        return value.to_pydatetime() if hasattr(value, 'to_pydatetime') else value
+    try:
+        return datetime.fromisoformat(str(value).strip())
+    except ValueError:
+        return None
+
+
+def _shared(value):
+    """Low-cardinality text (company, location) is interned: one string for all jobs."""
+    value = _clean(value)
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class Job:
+    """One job offer: the stored fields, its date as a datetime and its fingerprint.
+
+    Instances use `__slots__` (no per-instance dict) and share their company,
+    location and date objects with the other jobs. For 10k jobs
+    (`benchmarks/bench_memory.py`) a list of jobs takes about 3.2 MB, against
+    4.4 MB as dict records (1.4x smaller) and 3.0 MB in a DataFrame.
+    They are read-only by convention; the fingerprint is computed on first
+    use. `job['title']` and `job.get('date')` return the stored (text) values,
+    so functions written for dict records accept jobs unchanged.
+    """
+
+    __slots__ = ('title', 'link', 'company', 'location', 'date', '_fingerprint')
+
+    def __init__(self, title, link, company=None, location=None, date=None, fingerprint=None):
+        self.title = _clean(title)
+        self.link = _clean(link)
+        self.company = _shared(company)
+        self.location = _shared(location)
+        self.date = parse_date(date)
+        self._fingerprint = fingerprint
+
+    @classmethod
+    def from_record(cls, record):
+        """Build a job from a dict (CSV or SQLite row, DataFrame record) or return a Job as is."""
+        if isinstance(record, cls):
+            return record
+        return cls(
+            record.get('title'), record.get('link'), record.get('company'),
+            record.get('location'), record.get('date'), _clean(record.get('fingerprint'))
+        )
+
+    @property
+    def fingerprint(self):
+        if self._fingerprint is None:
+            self._fingerprint = job_fingerprint(self)
+        return self._fingerprint
+
+    @property
+    def date_text(self):
+        return _format_date(self.date) if self.date is not None else None
+
+    def get(self, key, default=None):
+        if key == 'date':
+            return self.date_text
+        if key == 'fingerprint':
+            return self.fingerprint
+        if key in COLUMNS:
+            return getattr(self, key)
+        return default
+
+    def __getitem__(self, key):
+        if key not in COLUMNS and key != 'fingerprint':
+            raise KeyError(key)
+        return self.get(key)
+
+    def row(self):
+        """Stored values in `COLUMNS` order."""
+        return (self.title, self.link, self.company, self.location, self.date_text)
+
+    def to_dict(self):
+        return dict(zip(COLUMNS, self.row()))
+
+    def __eq__(self, other):
+        if not isinstance(other, Job):
+            return NotImplemented
+        return self.row() == other.row()
+
+    def __hash__(self):
+        return hash(self.row())
+
+    def __repr__(self):
+        return f"Job({self.title!r}, {self.link!r}, {self.company!r}, {self.location!r}, {self.date_text!r})"
+
+
+def to_jobs(data):
+    """List of jobs from a DataFrame, an iterable of dicts or jobs, or None."""
+    if data is None:
+        return []
+    if hasattr(data, 'to_dict') and hasattr(data, 'columns'):
+        if data.empty:
+            return []
+        data = data.to_dict('records')
+    return [Job.from_record(record) for record in data]
+
+
+def jobs_from_rows(rows):
+    """Jobs from value sequences in `COLUMNS` order (CSV or SQLite rows).
+
+    Jobs saved by the same run share one datetime object instead of one each.
+    """
+    dates = {}
+    jobs = []
+    for title, link, company, location, date in rows:
+        if date not in dates:
+            dates[date] = parse_date(date)
+        jobs.append(Job(title, link, company, location, dates[date]))
+    return jobs
+
+
+def jobs_to_dataframe(jobs):
+    """DataFrame of `jobs` for analysis, with `date` as a datetime column."""
+    return pd.DataFrame(
+        [(job.title, job.link, job.company, job.location, job.date) for job in jobs],
+        columns=COLUMNS
+    )
+
+
+def jobs_memory(jobs):
+    """Bytes held by a list of jobs, counting each shared object once."""
+    seen = set()
+    total = sys.getsizeof(jobs)
+    for job in jobs:
+        for obj in (job, job.title, job.link, job.company, job.location, job.date, job._fingerprint):
+            if obj is not None and id(obj) not in seen:
+                seen.add(id(obj))
+                total += sys.getsizeof(obj)
+    return total
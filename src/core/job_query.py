@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+JobQuery module: filtering, sorting and cursor pagination over stored job records.
+"""
+
+import base64
+import json
+import math
+from src.core.matcher import normalize
+from src.core.job import Job
+
+# Valeurs identiques à celles du sélecteur de tri de l'interface
+SORTS = {
+    'date-desc': ('date', True),
+    'date-asc': ('date', False),
+    'title-asc': ('title', False),
+    'title-desc': ('title', True),
+}
+DEFAULT_SORT = 'date-desc'
+DEFAULT_LIMIT = 30
+MAX_LIMIT = 100
+
+
+def _text(value):
+    """Return a record field as text, with pandas NaN and None as ''."""
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return ''
+    return str(value)
+
+
+def clean_record(record):
+    """Copy of a record (dict or `Job`) that is safe to serialize as JSON (no NaN)."""
+    if isinstance(record, Job):
+        return record.to_dict()
+    return {key: (None if isinstance(value, float) and math.isnan(value) else value)
+            for key, value in record.items()}
+
+
+def encode_cursor(data):
+    raw = json.dumps(data, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Decode a cursor, raising ValueError if it is malformed."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        if not isinstance(data, dict) or not isinstance(data.get('p'), int):
+            raise ValueError
+        return data
+    except Exception:
+        raise ValueError('Invalid cursor')
+
+
+class JobIndex:
+    """Views precomputed once per data version: sort orders, search keys and locations.
+
+    `records` are `Job` objects (dicts are accepted too).
+
+    A cursor stores the data version, the position reached in the sort order
+    and the link of the last returned job. If the data changed in between, the
+    page resumes right after that job in the new order.
+    """
+
+    def __init__(self, records, version):
+        self.records = records
+        self.version = version
+        self.search_keys = [normalize(_text(r.get('title'))) for r in records]
+        self.location_keys = [_text(r.get('location')) for r in records]
+        self.dates = [_text(r.get('date')) for r in records]
+        self.locations = sorted({l for l in self.location_keys if l}, key=normalize)
+        self._orders = {}
+        self._ranks = {}
+        self._link_positions = {}
+
+    def order(self, sort):
+        """Record indexes in the given sort order (stable, computed lazily)."""
+        if sort not in self._orders:
+            field, reverse = SORTS[sort]
+            keys = self.dates if field == 'date' else self.search_keys
+            order = sorted(range(len(self.records)), key=keys.__getitem__, reverse=reverse)
+            rank = [0] * len(order)
+            for position, i in enumerate(order):
+                rank[i] = position
+            self._orders[sort] = order
+            self._ranks[sort] = rank
+            self._link_positions[sort] = {_text(self.records[i].get('link')): p for p, i in enumerate(order)}
+        return self._orders[sort]
+
+    def query(self, search='', location='', date_from='', date_to='', sort=DEFAULT_SORT,
+              limit=DEFAULT_LIMIT, cursor=None):
+        """Return (items, next_cursor, total) for one page of results."""
+        if sort not in SORTS:
+            raise ValueError(f"Unknown sort: {sort}")
+        limit = max(1, min(int(limit), MAX_LIMIT))
+        search = normalize(search.strip())
+        order = self.order(sort)
+
+        def matches(i):
+            if search and search not in self.search_keys[i]:
+                return False
+            if location and self.location_keys[i] != location:
+                return False
+            day = self.dates[i][:10]
+            if date_from and day < date_from:
+                return False
+            if date_to and day > date_to:
+                return False
+            return True
+
+        start = 0
+        if cursor:
+            data = decode_cursor(cursor)
+            if data.get('v') == self.version:
+                start = data['p']
+            else:
+                start = self._link_positions[sort].get(data.get('l'), -1) + 1
+
+        selected = [i for i in order if matches(i)] if (search or location or date_from or date_to) else order
+        total = len(selected)
+
+        rank = self._ranks[sort]
+        # Position dans l'ordre complet -> position dans la sélection filtrée
+        lo, hi = 0, len(selected)
+        while start and lo < hi:
+            mid = (lo + hi) // 2
+            if rank[selected[mid]] < start:
+                lo = mid + 1
+            else:
+                hi = mid
+
+        page = selected[lo:lo + limit]
+        next_cursor = None
+        if len(selected) > lo + limit:
+            last = page[-1]
+            next_cursor = encode_cursor({
+                'v': self.version,
+                'p': rank[last] + 1,
+                'l': _text(self.records[last].get('link')),
+            })
+        return [clean_record(self.records[i]) for i in page], next_cursor, total
@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+"""
+Lazy module proxies, to keep heavy dependencies out of process startup.
+"""
+
+import importlib
+
+
+class LazyModule:
+    """Stand-in for a module that is only imported on first attribute access.
+
+    `pd = LazyModule('pandas')` behaves like `import pandas as pd`, except
+    that the import cost is paid by the first `pd.<name>` call instead of at
+    module import.
+    """
+
+    def __init__(self, name):
+        self._name = name
+
+    def __getattr__(self, attr):
+        # importlib met le module en cache dans sys.modules : seul le premier accès coûte
+        return getattr(importlib.import_module(self._name), attr)
+
+    def __repr__(self):
+        return f"<lazy module {self._name!r}>"
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Metrics module for in-process latency counters, per-run stage metrics and Prometheus export.
+"""
+
+import json
+import math
+import os
+import threading
+import time
+from collections import deque
+from time import perf_counter
+from loguru import logger
+
+
+class LatencyCounter:
+    """Count observations and keep a bounded window of samples for percentiles."""
+
+    def __init__(self, name, max_samples=1000):
+        self.name = name
+        self.count = 0
+        self.total = 0.0
+        self.samples = deque(maxlen=max_samples)
+        self._lock = threading.Lock()
+
+    def observe(self, seconds):
+        with self._lock:
+            self.count += 1
+            self.total += seconds
+            self.samples.append(seconds)
+
+    def percentile(self, p):
+        """Return the nearest-rank p-th percentile (0-100) of the recent samples, or None."""
+        with self._lock:
+            values = sorted(self.samples)
+        if not values:
+            return None
+        index = min(len(values) - 1, max(0, math.ceil(p / 100 * len(values)) - 1))
+        return values[index]
+
+    def snapshot(self):
+        return {
+            'count': self.count,
+            'total': round(self.total, 4),
+            'p50': self.percentile(50),
+            'p95': self.percentile(95),
+            'max': max(self.samples) if self.samples else None,
+        }
+
+
+_counters = {}
+_counters_lock = threading.Lock()
+
+
+def get_counter(name):
+    """Return the process-wide latency counter registered under `name`."""
+    with _counters_lock:
+        if name not in _counters:
+            _counters[name] = LatencyCounter(name)
+        return _counters[name]
+
+
+def all_counters():
+    with _counters_lock:
+        return dict(_counters)
+
+
+class RunMetrics:
+    """Duration, byte count and row count of each stage of one scraper run.
+
+    `begin` closes the current stage and opens the next one; `record` adds
+    a timed sub-step (possibly from worker threads, e.g. one fetch per source)
+    and `add` only adds bytes/rows to a stage.
+    """
+
+    def __init__(self, clock=time.time):
+        self.clock = clock
+        self.started_at = clock()
+        self.finished_at = None
+        self.error = None
+        self.stages = {}
+        self._current = None
+        self._lock = threading.Lock()
+
+    def _entry(self, stage):
+        return self.stages.setdefault(stage, {'seconds': 0.0, 'bytes': 0, 'rows': 0, 'calls': 0})
+
+    def begin(self, stage):
+        self.end()
+        with self._lock:
+            self._current = (stage, perf_counter())
+
+    def end(self):
+        with self._lock:
+            if self._current is None:
+                return
+            stage, started = self._current
+            self._current = None
+        self.record(stage, perf_counter() - started)
+
+    def record(self, stage, seconds, nbytes=0, rows=0):
+        with self._lock:
+            entry = self._entry(stage)
+            entry['seconds'] += seconds
+            entry['bytes'] += nbytes
+            entry['rows'] += rows
+            entry['calls'] += 1
+
+    def add(self, stage, nbytes=0, rows=0):
+        with self._lock:
+            entry = self._entry(stage)
+            entry['bytes'] += nbytes
+            entry['rows'] += rows
+
+    def finish(self, error=None):
+        """Close the run and feed each stage duration to the `stage_<name>` latency counters."""
+        self.end()
+        self.finished_at = self.clock()
+        self.error = error
+        for stage, entry in self.stages.items():
+            if entry['calls']:
+                get_counter(f'stage_{stage}').observe(entry['seconds'])
+
+    def to_dict(self):
+        with self._lock:
+            stages = {name: dict(entry, seconds=round(entry['seconds'], 4)) for name, entry in self.stages.items()}
+        return {
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'duration': round(self.finished_at - self.started_at, 4) if self.finished_at else None,
+            'error': self.error,
+            'stages': stages,
+        }
+
+    def save(self, path):
+        """Write the run to `path` (JSON) so other processes can report it."""
+        try:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.to_dict(), f, indent=2)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.error(f"Error saving run metrics: {str(e)}")
+
+
+def load_last_run(path):
+    """Return the last saved run metrics, or None."""
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def render_prometheus(counters, last_run=None):
+    """Prometheus text exposition of the latency counters and of the last run."""
+    lines = [
+        '# HELP kelio_latency_seconds Latency of requests and scraper stages in this process.',
+        '# TYPE kelio_latency_seconds summary',
+    ]
+    for name, counter in sorted(counters.items()):
+        label = f'name="{_label(name)}"'
+        for quantile in (0.5, 0.95):
+            value = counter.percentile(quantile * 100)
+            if value is not None:
+                lines.append(f'kelio_latency_seconds{{{label},quantile="{quantile}"}} {value:.6f}')
+        lines.append(f'kelio_latency_seconds_sum{{{label}}} {counter.total:.6f}')
+        lines.append(f'kelio_latency_seconds_count{{{label}}} {counter.count}')
+
+    if last_run:
+        lines += [
+            '# HELP kelio_last_run_timestamp_seconds End of the last scraper run (Unix time).',
+            '# TYPE kelio_last_run_timestamp_seconds gauge',
+            f"kelio_last_run_timestamp_seconds {last_run.get('finished_at') or 0}",
+            '# HELP kelio_last_run_duration_seconds Duration of the last scraper run.',
+            '# TYPE kelio_last_run_duration_seconds gauge',
+            f"kelio_last_run_duration_seconds {last_run.get('duration') or 0}",
+            '# HELP kelio_last_run_success Whether the last scraper run succeeded.',
+            '# TYPE kelio_last_run_success gauge',
+            f"kelio_last_run_success {0 if last_run.get('error') else 1}",
+        ]
+        for field, unit, help_text in (
+            ('seconds', 'seconds', 'Time spent in each stage of the last run.'),
+            ('bytes', 'bytes', 'Bytes handled by each stage of the last run.'),
+            ('rows', 'rows', 'Rows handled by each stage of the last run.'),
+        ):
+            metric = f'kelio_last_run_stage_{unit}'
+            lines.append(f'# HELP {metric} {help_text}')
+            lines.append(f'# TYPE {metric} gauge')
+            for stage, entry in sorted((last_run.get('stages') or {}).items()):
+                lines.append(f'{metric}{{stage="{_label(stage)}"}} {entry.get(field, 0)}')
+    return '\n'.join(lines) + '\n'
@@ -4,49 +4,79 @@ Notifier module for sending notifications using Resend API.
 """
 
 import os
-import json
-import subprocess
 from loguru import logger
+from src.core.http_client import get_client
+from src.core.outbox import get_sender
 
 class Notifier:
-    def __init__(self):
+    """Queue emails in a durable outbox delivered by a background sender.
+
+    `send_email` returns as soon as the message is stored; the sender retries
+    with backoff while Resend is down and merges notifications queued close
+    together into one email.
+    """
+
+    def __init__(self, outbox_path=None):
         self.resend_api_key = os.getenv('RESEND_API_KEY')
         self.sender = os.getenv('EMAIL_SENDER', 'onboarding@resend.dev')
         self.receiver = os.getenv('EMAIL_RECEIVER')
+        self.api_url = os.getenv('RESEND_API_URL', "https://api.resend.com/emails")
+        self.http = get_client()
+        self.outbox_path = outbox_path or os.getenv('OUTBOX_PATH', '/app/data/outbox.db')
+        self.outbox_sender = get_sender(self.outbox_path, self.deliver)
+        # Reprendre les messages restés en attente lors d'un précédent processus
+        if os.path.exists(self.outbox_path):
+            self.outbox_sender.start()
 
-    def send_email(self, subject, body):
-        """Send an email notification using Resend API."""
+    def send_email(self, subject, body, kind='digest', to=None):
+        """Queue an email notification to `to` (default: `EMAIL_RECEIVER`); it is sent by the background sender."""
         if not os.getenv('SEND_EMAIL', 'False').lower() == 'true':
-            return
+            return None
 
         try:
-            data = {
-                "from": self.sender,
-                "to": self.receiver,
-                "subject": subject,
-                "html": body  # Assuming body is already in HTML format from AI formatter
-            }
-
-            curl_command = [
-                "curl",
-                "-X", "POST",
-                "https://api.resend.com/emails",
-                "-H", f"Authorization: Bearer {self.resend_api_key}",
-                "-H", "Content-Type: application/json",
-                "-d", json.dumps(data)
-            ]
-
-            result = subprocess.run(curl_command, capture_output=True, text=True)
-            
-            if result.returncode != 0:
-                raise Exception(f"Curl call failed: {result.stderr}")
-
-            logger.info("Email sent successfully via Resend")
-            logger.debug(f"Resend API response: {result.stdout}")
-
+            message_id = self.outbox_sender.outbox.enqueue(kind, subject, body, to)
+            self.outbox_sender.start()
+            self.outbox_sender.wake()
+            logger.info(f"Email queued in outbox (id {message_id})")
+            return message_id
         except Exception as e:
             logger.error(f"Email error: {str(e)}")
+            return None
+
+    def deliver(self, subject, body, to=None):
+        """Send an email through the Resend API, raising on failure."""
+        data = {
+            "from": self.sender,
+            "to": to or self.receiver,
+            "subject": subject,
+            "html": body  # Assuming body is already in HTML format from AI formatter
+        }
+
+        headers = {
+            "Authorization": f"Bearer {self.resend_api_key}",
+            "Content-Type": "application/json"
+        }
+
+        response = self.http.post('resend', self.api_url, headers=headers, json=data)
+
+        if response.status_code >= 400:
+            raise Exception(f"Resend call failed with status code {response.status_code}: {response.text}")
+
+        logger.info("Email sent successfully via Resend")
+        logger.debug(f"Resend API response: {response.text}")
+
+    def flush(self, timeout=30):
+        """Deliver pending emails now; used before a one-shot process exits."""
+        if not os.path.exists(self.outbox_path):
+            return True
+        return self.outbox_sender.flush(timeout)
+
+    def delivery_state(self):
+        """Outbox counters (pending, sent, failed, last error)."""
+        if not os.path.exists(self.outbox_path):
+            return None
+        return self.outbox_sender.outbox.stats()
 
     def send_notification(self, message):
         """Send a notification with the provided message."""
-        self.send_email("[Kelio Scraper] Notification", message)
+        self.send_email("[Kelio Scraper] Notification", message, kind='alert')
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Outbox module: durable queue of outgoing emails and the background sender draining it.
+"""
+
+import html
+import os
+import re
+import sqlite3
+import threading
+import time
+import uuid
+from loguru import logger
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    subject TEXT NOT NULL,
+    body TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    claimed_by TEXT,
+    claimed_at REAL,
+    last_error TEXT,
+    sent_at REAL,
+    recipient TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_outbox_status ON outbox (status, next_attempt_at);
+"""
+
+# Délais en secondes, surchargeables par variables d'environnement
+DEFAULT_COALESCE_WINDOW = 60
+DEFAULT_BACKOFF_BASE = 30
+DEFAULT_BACKOFF_MAX = 3600
+DEFAULT_MAX_ATTEMPTS = 10
+# Un envoi réclamé mais jamais confirmé (processus tué) est repris après ce délai
+CLAIM_LEASE = 300
+
+
+class Outbox:
+    """SQLite table of notifications waiting to be delivered.
+
+    Messages stay `pending` until sent; failed attempts are rescheduled with
+    exponential backoff and only marked `failed` after `max_attempts`.
+    Senders claim messages in a write transaction, so several processes can
+    drain the same outbox without sending twice.
+    """
+
+    def __init__(self, path, backoff_base=None, backoff_max=None, max_attempts=None, clock=time.time):
+        self.path = path
+        self.backoff_base = backoff_base or float(os.getenv('NOTIFY_BACKOFF_BASE', DEFAULT_BACKOFF_BASE))
+        self.backoff_max = backoff_max or float(os.getenv('NOTIFY_BACKOFF_MAX', DEFAULT_BACKOFF_MAX))
+        self.max_attempts = max_attempts or int(os.getenv('NOTIFY_MAX_ATTEMPTS', DEFAULT_MAX_ATTEMPTS))
+        self.clock = clock
+        self.owner = uuid.uuid4().hex[:12]
+        self._local = threading.local()
+
+    def connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            columns = {row['name'] for row in conn.execute("PRAGMA table_info(outbox)")}
+            if 'recipient' not in columns:
+                # Boîte d'envoi créée avant les abonnements : destinataire par défaut
+                conn.execute("ALTER TABLE outbox ADD COLUMN recipient TEXT")
+            self._local.conn = conn
+        return conn
+
+    def enqueue(self, kind, subject, body, recipient=None):
+        """Store a message for `recipient` (None: the default receiver) and return its id."""
+        now = self.clock()
+        cursor = self.connection().execute(
+            "INSERT INTO outbox (kind, subject, body, created_at, next_attempt_at, recipient) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (kind, subject, body, now, now, recipient)
+        )
+        return cursor.lastrowid
+
+    def claim(self, window=0.0, force=False):
+        """Claim every due message once the oldest one is `window` seconds old.
+
+        Returns the claimed messages (oldest first), or [] if nothing is due yet.
+        """
+        now = self.clock()
+        conn = self.connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            rows = conn.execute(
+                "SELECT * FROM outbox WHERE (status = 'pending' AND next_attempt_at <= ?) "
+                "OR (status = 'sending' AND claimed_at < ?) ORDER BY id",
+                (now, now - CLAIM_LEASE)
+            ).fetchall()
+            # Attendre la fin de la fenêtre pour regrouper les notifications proches
+            if not rows or (not force and now - rows[0]['created_at'] < window):
+                conn.execute("COMMIT")
+                return []
+            conn.executemany(
+                "UPDATE outbox SET status = 'sending', claimed_by = ?, claimed_at = ? WHERE id = ?",
+                [(self.owner, now, row['id']) for row in rows]
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return [dict(row) for row in rows]
+
+    def mark_sent(self, ids):
+        self.connection().executemany(
+            "UPDATE outbox SET status = 'sent', sent_at = ?, attempts = attempts + 1, last_error = NULL "
+            "WHERE id = ?",
+            [(self.clock(), message_id) for message_id in ids]
+        )
+
+    def mark_failed(self, messages, error):
+        """Reschedule messages after a failed attempt, with exponential backoff."""
+        now = self.clock()
+        updates = []
+        for message in messages:
+            attempts = message['attempts'] + 1
+            status = 'failed' if attempts >= self.max_attempts else 'pending'
+            delay = min(self.backoff_max, self.backoff_base * 2 ** (attempts - 1))
+            updates.append((status, attempts, now + delay, str(error)[:500], message['id']))
+        self.connection().executemany(
+            "UPDATE outbox SET status = ?, attempts = ?, next_attempt_at = ?, last_error = ?, "
+            "claimed_by = NULL, claimed_at = NULL WHERE id = ?",
+            updates
+        )
+
+    def next_due_in(self, window=0.0):
+        """Seconds until a pending message can be sent, or None if there is none."""
+        row = self.connection().execute(
+            "SELECT MIN(MAX(next_attempt_at, created_at + ?)) FROM outbox WHERE status = 'pending'",
+            (window,)
+        ).fetchone()
+        return None if row[0] is None else max(0.0, row[0] - self.clock())
+
+    def stats(self):
+        """Delivery state: message counts per status, oldest pending age, last delivery and error."""
+        conn = self.connection()
+        counts = {status: count for status, count in conn.execute(
+            "SELECT status, COUNT(*) FROM outbox GROUP BY status"
+        )}
+        oldest = conn.execute(
+            "SELECT MIN(created_at) FROM outbox WHERE status IN ('pending', 'sending')"
+        ).fetchone()[0]
+        last_sent = conn.execute("SELECT MAX(sent_at) FROM outbox WHERE status = 'sent'").fetchone()[0]
+        last_error = conn.execute(
+            "SELECT last_error FROM outbox WHERE last_error IS NOT NULL ORDER BY id DESC LIMIT 1"
+        ).fetchone()
+        return {
+            'pending': counts.get('pending', 0) + counts.get('sending', 0),
+            'sent': counts.get('sent', 0),
+            'failed': counts.get('failed', 0),
+            'oldest_pending_age': round(self.clock() - oldest, 1) if oldest else None,
+            'last_sent_at': last_sent,
+            'last_error': last_error[0] if last_error else None,
+        }
+
+
+def _body_content(body):
+    """Inner HTML of a message body: the <body> of a document, or escaped plain text."""
+    if '<' not in body:
+        return '<p style="white-space: pre-wrap;">' + html.escape(body) + '</p>'
+    match = re.search(r'<body[^>]*>(.*)</body>', body, re.S | re.I)
+    return match.group(1) if match else body
+
+
+def coalesce(messages):
+    """Merge messages into one (subject, html body); a single message is sent as is."""
+    if len(messages) == 1:
+        return messages[0]['subject'], messages[0]['body']
+
+    # Le sujet d'un digest d'offres a priorité sur les alertes
+    main = next((m for m in messages if m['kind'] == 'digest'), messages[0])
+    subject = f"{main['subject']} (+{len(messages) - 1} notification(s))"
+    parts = [
+        '<!DOCTYPE html>',
+        '<html>',
+        '<head>',
+        '    <meta charset="UTF-8">',
+        f'    <title>{html.escape(subject)}</title>',
+        '</head>',
+        '<body style="font-family: Arial, Helvetica, sans-serif; max-width: 600px; margin: 0 auto; padding: 20px;">',
+    ]
+    for message in messages:
+        parts.append(f'    <h2 style="border-bottom: 1px solid #ddd; padding-bottom: 5px;">{html.escape(message["subject"])}</h2>')
+        parts.append(_body_content(message['body']))
+    parts.extend(['</body>', '</html>'])
+    return subject, '\n'.join(parts)
+
+
+class OutboxSender:
+    """Background thread delivering the outbox through `deliver(subject, body[, recipient])`.
+
+    Messages to the same recipient queued within `window` seconds of each
+    other go out as one email. Messages to the default receiver are delivered
+    with `deliver(subject, body)`.
+    """
+
+    def __init__(self, outbox, deliver, window=None, poll_interval=30):
+        self.outbox = outbox
+        self.deliver = deliver
+        self.window = float(os.getenv('NOTIFY_COALESCE_WINDOW', DEFAULT_COALESCE_WINDOW)) if window is None else window
+        self.poll_interval = poll_interval
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._loop, name='outbox-sender', daemon=True)
+                self._thread.start()
+
+    def wake(self):
+        self._wake.set()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def send_due(self, force=False):
+        """Send one email per recipient with every due message. Returns the number of messages sent."""
+        messages = self.outbox.claim(self.window, force=force)
+        by_recipient = {}
+        for message in messages:
+            by_recipient.setdefault(message.get('recipient'), []).append(message)
+
+        sent = 0
+        for recipient, group in by_recipient.items():
+            subject, body = coalesce(group)
+            try:
+                if recipient is None:
+                    self.deliver(subject, body)
+                else:
+                    self.deliver(subject, body, recipient)
+            except Exception as e:
+                self.outbox.mark_failed(group, e)
+                logger.warning(f"Email delivery failed, {len(group)} message(s) kept in outbox: {str(e)}")
+                continue
+            self.outbox.mark_sent([m['id'] for m in group])
+            logger.info(f"Email sent with {len(group)} notification(s)")
+            sent += len(group)
+        return sent
+
+    def flush(self, timeout=30):
+        """Send pending messages now, ignoring the window, retrying until `timeout`.
+
+        Returns True if the outbox has no pending message left.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            self.send_due(force=True)
+            due_in = self.outbox.next_due_in()
+            if due_in is None:
+                return True
+            if time.monotonic() + due_in > deadline:
+                return False
+            time.sleep(due_in)
+
+    def _loop(self):
+        while not self._stop.is_set():
+            self._wake.clear()
+            try:
+                while self.send_due():
+                    pass
+                due_in = self.outbox.next_due_in(self.window)
+            except Exception as e:
+                logger.error(f"Outbox sender error: {str(e)}")
+                due_in = None
+            wait = self.poll_interval if due_in is None else min(self.poll_interval, due_in)
+            self._wake.wait(wait)
+
+
+_senders = {}
+_senders_lock = threading.Lock()
+
+
+def get_sender(path, deliver):
+    """Return the process-wide sender of the outbox at `path`."""
+    with _senders_lock:
+        if path not in _senders:
+            _senders[path] = OutboxSender(Outbox(path), deliver)
+        return _senders[path]
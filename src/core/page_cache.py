@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+PageCache module: rendered pages kept per data version, with their compressed encodings.
+
+Brotli is used when the optional `brotli` package is installed; gzip otherwise.
+"""
+
+import gzip
+import hashlib
+import os
+import threading
+from loguru import logger
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+# En dessous, la compression coûte plus qu'elle ne rapporte
+MIN_COMPRESS_SIZE = 512
+
+
+def choose_encoding(accept_encodings):
+    """Best supported encoding for a werkzeug `Accept-Encoding` header, or None (identity)."""
+    if brotli is not None and accept_encodings['br']:
+        return 'br'
+    if accept_encodings['gzip']:
+        return 'gzip'
+    return None
+
+
+def build_signature(*folders):
+    """(id, mtime) of the files under `folders` (templates, static assets).
+
+    Computed once at startup and mixed into the page validators: after a
+    deploy changing a template or a script, revalidating browsers get the
+    new page instead of a 304.
+    """
+    digest = hashlib.sha1()
+    latest = None
+    for folder in folders:
+        for root, dirs, files in os.walk(folder):
+            dirs.sort()
+            for name in sorted(files):
+                path = os.path.join(root, name)
+                with open(path, 'rb') as f:
+                    digest.update(os.path.relpath(path, folder).encode('utf-8'))
+                    digest.update(f.read())
+                mtime = int(os.path.getmtime(path))
+                latest = mtime if latest is None else max(latest, mtime)
+    return digest.hexdigest()[:12], latest
+
+
+class RenderedPage:
+    """Body of one rendered page and its compressed variants, computed on first request."""
+
+    def __init__(self, body, etag, last_modified=None):
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self._encoded = {None: body}
+        self._lock = threading.Lock()
+
+    def encoded(self, encoding):
+        """Return (body, encoding actually used) for the requested encoding."""
+        if encoding is None or len(self.body) < MIN_COMPRESS_SIZE:
+            return self.body, None
+        with self._lock:
+            if encoding not in self._encoded:
+                if encoding == 'br':
+                    self._encoded[encoding] = brotli.compress(self.body, quality=BROTLI_QUALITY)
+                else:
+                    self._encoded[encoding] = gzip.compress(self.body, GZIP_LEVEL)
+            return self._encoded[encoding], encoding
+
+
+class PageCache:
+    """Latest rendering of each page, reused until its key (the data version) changes.
+
+    `get(name, key, render)` calls `render()` -> (html, last_modified) only
+    when the page was never rendered for `key`; concurrent requests for a
+    missing page render it once.
+    """
+
+    def __init__(self):
+        self._pages = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, name, key, render):
+        with self._lock:
+            cached = self._pages.get(name)
+            if cached is not None and cached[0] == key:
+                self.hits += 1
+                return cached[1]
+            self.misses += 1
+            html, last_modified = render()
+            page = RenderedPage(html.encode('utf-8'), key, last_modified)
+            self._pages[name] = (key, page)
+            logger.debug(f"Page {name} rendered for version {key} ({len(page.body)} bytes)")
+            return page
+
+    def clear(self):
+        with self._lock:
+            self._pages = {}
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / total, 4) if total else None,
+        }
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Parsers module extracting raw job rows from a Kelio listing page.
+
+Every backend returns the same list of `{'title', 'link', 'company', 'location'}`
+dicts, in document order, so `JobScraper.parse_jobs` can switch between them:
+
+- `html.parser`: full BeautifulSoup tree with the stdlib parser (historical behavior)
+- `lxml`: BeautifulSoup restricted to the job rows with a SoupStrainer, on lxml if installed
+- `fast`: only looks at job rows, with selectolax if installed or a streaming stdlib scanner
+"""
+
+import os
+from html.parser import HTMLParser
+from bs4 import BeautifulSoup, SoupStrainer
+from loguru import logger
+
+ROW_CLASSES = ['sectiontableentry1', 'sectiontableentry2']
+BACKENDS = ('html.parser', 'lxml', 'fast')
+
+# Éléments sans balise fermante, fermés immédiatement comme le fait BeautifulSoup
+VOID_ELEMENTS = {
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'keygen', 'link', 'menuitem',
+    'meta', 'param', 'source', 'track', 'wbr', 'basefont', 'bgsound', 'command', 'frame',
+    'image', 'isindex', 'nextid', 'spacer',
+}
+# Texte ignoré par get_text()
+SKIPPED_TEXT_ELEMENTS = {'script', 'style', 'template'}
+
+try:
+    import lxml  # noqa: F401
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as SelectolaxParser
+except ImportError:
+    try:
+        from selectolax.parser import HTMLParser as SelectolaxParser
+    except ImportError:
+        SelectolaxParser = None
+
+
+def get_backend():
+    """Return the parser backend configured with `SCRAPER_PARSER`."""
+    backend = os.getenv('SCRAPER_PARSER', 'html.parser')
+    if backend not in BACKENDS:
+        logger.warning(f"Unknown parser backend '{backend}', using html.parser")
+        return 'html.parser'
+    return backend
+
+
+def extract_rows(html, backend='html.parser'):
+    """Return the raw job rows of a listing page using the given backend."""
+    if backend == 'lxml':
+        return _extract_strained(html)
+    if backend == 'fast':
+        return _extract_fast(html)
+    return _extract_soup(BeautifulSoup(html, 'html.parser'))
+
+
+def _build_row(cell_count, anchor, company, location):
+    """Validate one row like the historical parser did. `anchor` is (text, href) or None."""
+    if cell_count < 4:
+        logger.debug(f"Skipping row with insufficient cells: {cell_count}")
+        return None
+    if anchor is None:
+        logger.debug("Skipping row without title link")
+        return None
+    title, link = anchor
+    if link is None:
+        logger.error("Erreur parsing: 'href'")
+        return None
+    return {'title': title, 'link': link, 'company': company, 'location': location}
+
+
+def _rows_from_tags(items):
+    rows = []
+    for item in items:
+        try:
+            cells = item.find_all('td')
+            title_link = cells[0].find('a') if cells else None
+            anchor = None
+            if title_link:
+                anchor = (title_link.get_text(strip=True), title_link.get('href'))
+            row = _build_row(
+                len(cells),
+                anchor,
+                cells[1].get_text(strip=True) if len(cells) > 1 else '',
+                cells[3].get_text(strip=True) if len(cells) > 3 else '',
+            )
+            if row:
+                rows.append(row)
+        except Exception as e:
+            logger.error(f"Erreur parsing: {str(e)}")
+    return rows
+
+
+def _extract_soup(soup):
+    all_jobs = soup.find_all('tr', class_=ROW_CLASSES)
+    logger.debug(f"Total jobs found on page: {len(all_jobs)}")
+
+    if len(all_jobs) == 0:
+        logger.warning("No job entries found in the HTML. Check the page structure or selectors.")
+        # Try alternative selectors if the primary ones don't work
+        all_jobs = soup.select('table.contentpane tr')
+        logger.debug(f"Trying alternative selector, found: {len(all_jobs)} jobs")
+
+    return _rows_from_tags(all_jobs)
+
+
+def _is_row_class(value):
+    # Le SoupStrainer reçoit l'attribut class brut, avant découpage en liste
+    if not value:
+        return False
+    classes = value.split() if isinstance(value, str) else value
+    return any(c in ROW_CLASSES for c in classes)
+
+
+def _extract_strained(html):
+    """Build a tree of the job rows only; falls back to a full parse when there are none."""
+    features = 'lxml' if LXML_AVAILABLE else 'html.parser'
+    soup = BeautifulSoup(html, features, parse_only=SoupStrainer('tr', class_=_is_row_class))
+    items = soup.find_all('tr', class_=ROW_CLASSES)
+    if not items:
+        return _extract_soup(BeautifulSoup(html, 'html.parser'))
+    logger.debug(f"Total jobs found on page: {len(items)}")
+    return _rows_from_tags(items)
+
+
+def _extract_fast(html):
+    if SelectolaxParser is not None:
+        rows = _extract_selectolax(html)
+    else:
+        scanner = _RowScanner()
+        scanner.feed(html)
+        scanner.close()
+        rows = scanner.rows
+    if rows is None:
+        return _extract_soup(BeautifulSoup(html, 'html.parser'))
+    return rows
+
+
+def _extract_selectolax(html):
+    tree = SelectolaxParser(html)
+    # get_text() de BeautifulSoup ignore le contenu des scripts et styles
+    tree.strip_tags(list(SKIPPED_TEXT_ELEMENTS))
+    items = tree.css('tr.sectiontableentry1, tr.sectiontableentry2')
+    if not items:
+        return None
+    logger.debug(f"Total jobs found on page: {len(items)}")
+    rows = []
+    for item in items:
+        cells = item.css('td')
+        title_link = cells[0].css_first('a') if cells else None
+        anchor = None
+        if title_link is not None:
+            anchor = (title_link.text(deep=True, separator='', strip=True), title_link.attributes.get('href'))
+        row = _build_row(
+            len(cells),
+            anchor,
+            cells[1].text(deep=True, separator='', strip=True) if len(cells) > 1 else '',
+            cells[3].text(deep=True, separator='', strip=True) if len(cells) > 3 else '',
+        )
+        if row:
+            rows.append(row)
+    return rows
+
+
+class _RowScanner(HTMLParser):
+    """Streaming scanner that only builds state for `sectiontableentry` rows.
+
+    Inside a row it keeps a stack of open elements and closes them the way
+    BeautifulSoup's html.parser builder does (pop to the matching start tag),
+    so cell text and the first link match the tree-based parser. `rows` is
+    None when the page has no job row, so callers can try the fallback selector.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.rows = None
+        self._stack = None  # éléments ouverts dans la ligne courante
+        self._cells = []    # [textes, premier lien] par cellule
+        self._skip_text = 0
+
+    def handle_starttag(self, tag, attrs):
+        if self._stack is None:
+            if tag == 'tr' and self._has_row_class(attrs):
+                self._stack = [{'tag': 'tr'}]
+                self._cells = []
+            return
+        if tag in VOID_ELEMENTS:
+            return
+        element = {'tag': tag}
+        if tag == 'td':
+            element['cell'] = {'text': [], 'anchor': None}
+            self._cells.append(element['cell'])
+        elif tag == 'a':
+            anchor = {'text': [], 'href': dict(attrs).get('href')}
+            for open_element in self._stack:
+                cell = open_element.get('cell')
+                if cell is not None and cell['anchor'] is None:
+                    cell['anchor'] = anchor
+            element['anchor'] = anchor
+        elif tag in SKIPPED_TEXT_ELEMENTS:
+            self._skip_text += 1
+        self._stack.append(element)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if self._stack is not None and tag not in VOID_ELEMENTS:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if self._stack is None:
+            return
+        for index in range(len(self._stack) - 1, -1, -1):
+            if self._stack[index]['tag'] == tag:
+                break
+        else:
+            return
+        for element in self._stack[index:]:
+            if element['tag'] in SKIPPED_TEXT_ELEMENTS:
+                self._skip_text -= 1
+        del self._stack[index:]
+        if not self._stack:
+            self._finish_row()
+
+    def handle_data(self, data):
+        if self._stack is None or self._skip_text:
+            return
+        text = data.strip()
+        if not text:
+            return
+        for element in self._stack:
+            target = element.get('cell') or element.get('anchor')
+            if target is not None:
+                target['text'].append(text)
+
+    def close(self):
+        super().close()
+        if self._stack:
+            self._finish_row()
+
+    def _finish_row(self):
+        cells = self._cells
+        self._stack = None
+        self._cells = []
+        self._skip_text = 0
+        if self.rows is None:
+            self.rows = []
+        anchor = cells[0]['anchor'] if cells else None
+        row = _build_row(
+            len(cells),
+            (''.join(anchor['text']), anchor['href']) if anchor else None,
+            ''.join(cells[1]['text']) if len(cells) > 1 else '',
+            ''.join(cells[3]['text']) if len(cells) > 3 else '',
+        )
+        if row:
+            self.rows.append(row)
+
+    @staticmethod
+    def _has_row_class(attrs):
+        return _is_row_class(dict(attrs).get('class'))
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Profiling module: CPU and memory reports of scraper runs.
+"""
+
+import cProfile
+import io
+import json
+import os
+import pstats
+import shutil
+import time
+import tracemalloc
+from contextlib import contextmanager
+from loguru import logger
+from src.core.job import jobs_memory
+
+DEFAULT_REPORT_DIR = '/app/data/profiles'
+DEFAULT_RETENTION = 20
+DEFAULT_TOP = 25
+
+
+def profiling_enabled():
+    """True when `SCRAPER_PROFILE` asks for every run to be profiled."""
+    return os.getenv('SCRAPER_PROFILE', 'false').lower() in ('1', 'true', 'yes')
+
+
+def rss_mb():
+    """(current, peak) resident memory of the process in MB; None where /proc is missing."""
+    values = {}
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith(('VmRSS', 'VmHWM')):
+                    name, value = line.split(':')
+                    values[name] = round(int(value.split()[0]) / 1024, 1)
+    except OSError:
+        pass
+    return values.get('VmRSS'), values.get('VmHWM')
+
+
+class RunProfiler:
+    """Collect a CPU profile and per-stage memory figures for one scraper run.
+
+    The scraper calls `stage` at each stage change, wraps transient structures
+    (the parsed HTML tree) in `section` and reports its job lists through
+    `records`. cProfile only sees the thread calling `run()`: time spent in
+    fetch and Groq worker threads shows up as waiting in that thread.
+    """
+
+    def __init__(self, report_dir=None, retention=None, top=DEFAULT_TOP):
+        self.report_dir = report_dir or os.getenv('PROFILE_DIR', DEFAULT_REPORT_DIR)
+        self.retention = retention or int(os.getenv('PROFILE_RETENTION', DEFAULT_RETENTION))
+        self.top = top
+        self.stages = {}
+        self.sections = {}
+        self.records_sizes = {}
+        self.profile = cProfile.Profile()
+        self._stage = None
+        self._snapshot = None
+        self._started_tracing = False
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        tracemalloc.reset_peak()
+        self._snapshot = self._take_snapshot()
+        self.started_at = time.time()
+        self.profile.enable()
+
+    def stop(self):
+        self.profile.disable()
+        self.stage(None)
+        if self._started_tracing:
+            tracemalloc.stop()
+
+    def stage(self, name):
+        """Close the current stage (allocation diff, peaks) and open `name`."""
+        if self._stage is not None:
+            snapshot = self._take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            entry = self.stages.setdefault(self._stage, {'peak_mb': 0.0, 'allocations': []})
+            entry['peak_mb'] = max(entry['peak_mb'], round(peak / 2 ** 20, 2))
+            entry['traced_mb'] = round(current / 2 ** 20, 2)
+            entry['rss_mb'], entry['rss_peak_mb'] = rss_mb()
+            entry['allocations'] = self._top_allocations(snapshot.compare_to(self._snapshot, 'lineno'))
+            self._snapshot = snapshot
+        if name == 'done':
+            name = None
+        self._stage = name
+        if name is not None:
+            tracemalloc.reset_peak()
+
+    @contextmanager
+    def section(self, name):
+        """Record the memory peak reached inside the block, above what was allocated before it."""
+        base, stage_peak = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        try:
+            yield
+        finally:
+            peak = tracemalloc.get_traced_memory()[1]
+            entry = self.sections.setdefault(name, {'calls': 0, 'peak_mb': 0.0})
+            entry['calls'] += 1
+            entry['peak_mb'] = max(entry['peak_mb'], round((peak - base) / 2 ** 20, 2))
+            # Le pic de l'étape en cours ne doit pas être perdu par reset_peak
+            if self._stage is not None:
+                stage = self.stages.setdefault(self._stage, {'peak_mb': 0.0, 'allocations': []})
+                stage['peak_mb'] = max(stage['peak_mb'], round(max(stage_peak, peak) / 2 ** 20, 2))
+
+    def records(self, name, jobs):
+        """Record the deep memory size of a list of jobs (largest one seen under `name`)."""
+        size = round(jobs_memory(jobs) / 2 ** 20, 3)
+        entry = self.records_sizes.setdefault(name, {'rows': 0, 'mb': 0.0})
+        if size >= entry['mb']:
+            entry.update(rows=len(jobs), mb=size)
+
+    @staticmethod
+    def _take_snapshot():
+        # Les allocations du profilage lui-même et des imports ne sont pas des sites intéressants
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+        ))
+
+    def _top_allocations(self, diffs):
+        return [
+            {
+                'site': f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                'size_kb': round(stat.size_diff / 1024, 1),
+                'count': stat.count_diff,
+            }
+            for stat in sorted(diffs, key=lambda s: s.size_diff, reverse=True)[:self.top]
+            if stat.size_diff > 0
+        ]
+
+    def top_functions(self):
+        stream = io.StringIO()
+        pstats.Stats(self.profile, stream=stream).sort_stats('cumulative').print_stats(self.top)
+        return stream.getvalue()
+
+    def write_report(self, summary=None, error=None):
+        """Write the report of the run to a new directory and prune old ones; return its path."""
+        millis = int(self.started_at * 1000) % 1000
+        name = time.strftime('%Y%m%d-%H%M%S', time.localtime(self.started_at)) + f"-{millis:03d}-{os.getpid()}"
+        path = os.path.join(self.report_dir, name)
+        os.makedirs(path, exist_ok=True)
+
+        rss, rss_peak = rss_mb()
+        report = {
+            'started_at': self.started_at,
+            'duration': round(time.time() - self.started_at, 3),
+            'error': error,
+            'summary': summary,
+            'rss_mb': rss,
+            'rss_peak_mb': rss_peak,
+            'stages': self.stages,
+            'sections': self.sections,
+            'records': self.records_sizes,
+        }
+        with open(os.path.join(path, 'report.json'), 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, default=str)
+        self.profile.dump_stats(os.path.join(path, 'profile.pstats'))
+        with open(os.path.join(path, 'report.txt'), 'w', encoding='utf-8') as f:
+            f.write(self._text_report(report))
+
+        self._prune()
+        return path
+
+    def _text_report(self, report):
+        lines = [
+            f"Run du {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(report['started_at']))} "
+            f"({report['duration']}s){' - erreur: ' + report['error'] if report['error'] else ''}",
+            f"RSS: {report['rss_mb']} MB, pic {report['rss_peak_mb']} MB",
+            '',
+            'Mémoire par étape (tracemalloc)',
+        ]
+        for name, entry in report['stages'].items():
+            lines.append(f"  {name:<10} pic {entry['peak_mb']:>8} MB   RSS pic {entry.get('rss_peak_mb')} MB")
+            for alloc in entry['allocations'][:5]:
+                lines.append(f"      +{alloc['size_kb']:>10} KB  {alloc['site']}")
+        lines += ['', 'Structures temporaires']
+        for name, entry in report['sections'].items():
+            lines.append(f"  {name:<20} pic {entry['peak_mb']:>8} MB sur {entry['calls']} appel(s)")
+        for name, entry in report['records'].items():
+            lines.append(f"  Offres {name:<13} {entry['mb']:>8} MB pour {entry['rows']} offre(s)")
+        lines += ['', 'Fonctions (cProfile, temps cumulé)', self.top_functions()]
+        return '\n'.join(lines)
+
+    def _prune(self):
+        """Keep only the `retention` most recent reports."""
+        try:
+            reports = sorted(
+                entry.path for entry in os.scandir(self.report_dir)
+                if entry.is_dir() and os.path.exists(os.path.join(entry.path, 'report.json'))
+            )
+            for old in reports[:-self.retention]:
+                shutil.rmtree(old, ignore_errors=True)
+        except OSError as e:
+            logger.warning(f"Could not prune profiling reports: {str(e)}")
+
+
+def profile_run(scraper, report_dir=None):
+    """Run `scraper.run()` under the profiler and return the report directory."""
+    profiler = RunProfiler(report_dir)
+    scraper.profiler = profiler
+    profiler.start()
+    try:
+        scraper.run()
+    finally:
+        profiler.stop()
+        scraper.profiler = None
+    path = profiler.write_report(scraper.summary, scraper.error)
+    logger.info(f"Profiling report written to {path}")
+    return path
+
+
+def run_scraper(scraper, profile=None):
+    """Run the scraper, profiled if `profile` (default: `SCRAPER_PROFILE`) is set.
+
+    Returns the report directory, or None when the run was not profiled.
+    """
+    if profile is None:
+        profile = profiling_enabled()
+    if not profile:
+        scraper.run()
+        return None
+    return profile_run(scraper)
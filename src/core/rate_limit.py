@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+RateLimit module: spacing of outbound calls to rate-limited APIs.
+"""
+
+import threading
+import time
+
+
+class RateLimiter:
+    """Allow at most `per_minute` calls per minute, spread evenly.
+
+    `acquire` blocks until the next slot; slots are handed out in order, so
+    concurrent callers are spaced by 60 / `per_minute` seconds. A rate of 0
+    or less disables the limit.
+    """
+
+    def __init__(self, per_minute, clock=time.monotonic, sleep=time.sleep):
+        self.interval = 60.0 / per_minute if per_minute and per_minute > 0 else 0.0
+        self.clock = clock
+        self.sleep = sleep
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Wait for a slot and return the time waited, in seconds."""
+        if not self.interval:
+            return 0.0
+        with self._lock:
+            now = self.clock()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        wait = slot - now
+        if wait > 0:
+            self.sleep(wait)
+        return wait
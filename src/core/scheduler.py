@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Scheduler module: long-running worker that runs the scraper on an adaptive schedule.
+"""
+
+import random
+import signal
+import threading
+import time
+from loguru import logger
+from src.core.config import load_config
+from src.core.fetcher import get_sources
+from src.core.profiling import run_scraper
+from src.core.scraper import JobScraper, configure_runtime
+
+# Valeurs par défaut de la section `schedule` de config/scraper.yaml (en secondes)
+DEFAULT_SCHEDULE = {
+    'interval': 1800,
+    'min_interval': 600,
+    'max_interval': 14400,
+    'jitter': 0.1,
+    'backoff': 1.5,
+}
+
+
+class SourceSchedule:
+    """Polling interval of one source.
+
+    New postings bring the interval down to `min_interval`; every quiet run
+    multiplies it by `backoff`, up to `max_interval`.
+    """
+
+    def __init__(self, url, interval, min_interval, max_interval, jitter, backoff):
+        self.url = url
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.jitter = jitter
+        self.backoff = backoff
+        self.interval = interval
+        self.next_run = 0.0
+        self.last_new_at = None
+
+    def update(self, interval, min_interval, max_interval, jitter, backoff):
+        """Apply new settings, keeping the current interval within the new bounds."""
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.jitter = jitter
+        self.backoff = backoff
+        self.interval = min(max_interval, max(min_interval, self.interval))
+
+    def record(self, new_jobs, now, rng):
+        if new_jobs:
+            self.last_new_at = now
+            self.interval = self.min_interval
+        else:
+            self.interval = min(self.max_interval, self.interval * self.backoff)
+        self.next_run = now + self.interval * (1 + rng.uniform(-self.jitter, self.jitter))
+
+    def retry(self, now):
+        """Reschedule after a failed run: back in `min_interval`, without backoff."""
+        self.next_run = now + self.min_interval
+
+
+def schedule_settings(config):
+    """Return a function giving the settings of a source URL from the `schedule` config section.
+
+    `schedule.sources` lists per-URL overrides of the default values.
+    """
+    section = config.get('schedule') or {}
+    defaults = {key: section.get(key, value) for key, value in DEFAULT_SCHEDULE.items()}
+    overrides = {item['url']: item for item in section.get('sources') or [] if item.get('url')}
+
+    def settings_for(url):
+        settings = dict(defaults)
+        settings.update({k: v for k, v in overrides.get(url, {}).items() if k in DEFAULT_SCHEDULE})
+        return {
+            'interval': float(settings['interval']),
+            'min_interval': float(min(settings['min_interval'], settings['interval'])),
+            'max_interval': float(max(settings['max_interval'], settings['interval'])),
+            'jitter': float(settings['jitter']),
+            'backoff': float(settings['backoff']),
+        }
+    return settings_for
+
+
+def build_schedules(sources, config):
+    """One SourceSchedule per source, from the `schedule` config section."""
+    settings_for = schedule_settings(config)
+    return [SourceSchedule(url, **settings_for(url)) for url in sources]
+
+
+class AdaptiveScheduler:
+    """Runs the scraper for the sources that are due, keeping one warm JobScraper.
+
+    The scraper (data handler, fingerprint index, HTTP sessions, browser pool)
+    is created once and reused across runs; only the due sources are passed
+    to each run. The YAML config is reloaded before each run, so changes of
+    the filters and of the `schedule` section apply without a restart.
+    """
+
+    def __init__(self, scraper_factory=JobScraper, sources=None, config=None, clock=time.time, rng=None):
+        self.scraper_factory = scraper_factory
+        self._load_config = (lambda: config) if config is not None else load_config
+        self.config = self._load_config()
+        self.schedules = build_schedules(sources or get_sources(), self.config)
+        self.clock = clock
+        self.rng = rng or random.Random()
+        self.runs = 0
+        self._scraper = None
+        self._stop = threading.Event()
+
+    @property
+    def scraper(self):
+        if self._scraper is None:
+            self._scraper = self.scraper_factory()
+        return self._scraper
+
+    def due(self, now):
+        return [schedule for schedule in self.schedules if schedule.next_run <= now]
+
+    def seconds_until_next(self, now):
+        return max(0.0, min(schedule.next_run for schedule in self.schedules) - now)
+
+    def reload_config(self):
+        """Apply changes of the `schedule` config section to the running schedules."""
+        config = self._load_config()
+        if config is self.config:
+            return
+        self.config = config
+        settings_for = schedule_settings(config)
+        for schedule in self.schedules:
+            schedule.update(**settings_for(schedule.url))
+        logger.info("Schedule settings reloaded")
+
+    def run_once(self):
+        """Scrape the due sources and reschedule them. Returns the due URLs."""
+        now = self.clock()
+        due = self.due(now)
+        if not due:
+            return []
+
+        self.reload_config()
+        scraper = self.scraper
+        scraper.reload_config()
+        scraper.sources = [schedule.url for schedule in due]
+        run_scraper(scraper)
+        self.runs += 1
+
+        finished = self.clock()
+        if scraper.error is not None:
+            # Échec du run (réseau, parsing...) : toutes les sources dues sont relancées
+            failed = {schedule.url for schedule in due}
+        else:
+            failed = set(scraper.summary.get('failed_sources') or ())
+        new_by_source = scraper.summary.get('new_by_source') or {}
+        for schedule in due:
+            if schedule.url in failed:
+                # Source en échec : ce n'est pas une source calme, pas de backoff
+                schedule.retry(finished)
+                logger.warning(f"Run failed for {schedule.url}, retrying in {schedule.min_interval:.0f}s")
+            else:
+                schedule.record(new_by_source.get(schedule.url, 0), finished, self.rng)
+                logger.info(f"Next run of {schedule.url} in {schedule.next_run - finished:.0f}s")
+        return [schedule.url for schedule in due]
+
+    def run_forever(self):
+        logger.info(f"Scheduler started for {len(self.schedules)} source(s)")
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error(f"Scheduled run failed: {str(e)}")
+                now = self.clock()
+                for schedule in self.due(now):
+                    schedule.retry(now)
+            self._stop.wait(self.seconds_until_next(self.clock()))
+        logger.info("Scheduler stopped")
+
+    def stop(self):
+        self._stop.set()
+
+
+if __name__ == "__main__":
+    configure_runtime()
+    scheduler = AdaptiveScheduler()
+    signal.signal(signal.SIGTERM, lambda *_: scheduler.stop())
+    signal.signal(signal.SIGINT, lambda *_: scheduler.stop())
+    scheduler.run_forever()
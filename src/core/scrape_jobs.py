@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+ScrapeJobs module: runs the scraper in a background thread and tracks its progress.
+"""
+
+import threading
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from loguru import logger
+
+# Étapes successives d'un run, dans l'ordre où JobScraper les signale (base de `progress`)
+STAGES = ('queued', 'fetch', 'parse', 'dedupe', 'save', 'format', 'notify', 'done')
+MAX_HISTORY = 20
+
+
+def progress(stage):
+    """Position of `stage` in `STAGES`, from 0 (queued) to 1 (done)."""
+    return round(STAGES.index(stage) / (len(STAGES) - 1), 2)
+
+
+class ScrapeJobRunner:
+    """Single-flight background runner for scraping jobs.
+
+    `submit` starts a run in a daemon thread and returns its job right away.
+    While a run is queued or running, further submissions get that same job
+    instead of starting a parallel scrape. The last `max_history` jobs are kept
+    for status polling.
+    """
+
+    def __init__(self, scraper_factory, max_history=MAX_HISTORY):
+        self.scraper_factory = scraper_factory
+        self.max_history = max_history
+        self._jobs = OrderedDict()
+        self._current = None
+        self._lock = threading.Lock()
+
+    def submit(self, profile=False):
+        """Return (job snapshot, created); `created` is False when joining a running job.
+
+        With `profile`, the run writes a profiling report (ignored when joining a running job).
+        """
+        with self._lock:
+            if self._current is not None:
+                return dict(self._current), False
+
+            job = {
+                'id': uuid.uuid4().hex[:12],
+                'status': 'queued',
+                'stage': 'queued',
+                'progress': 0.0,
+                'created_at': datetime.now().isoformat(),
+                'started_at': None,
+                'finished_at': None,
+                'summary': None,
+                'error': None,
+                'profile': profile,
+                'profile_report': None,
+            }
+            self._jobs[job['id']] = job
+            while len(self._jobs) > self.max_history:
+                self._jobs.popitem(last=False)
+            self._current = job
+
+        threading.Thread(target=self._run, args=(job,), name=f"scrape-{job['id']}", daemon=True).start()
+        return dict(job), True
+
+    def get(self, job_id):
+        """Return a copy of the job, or None if it is unknown."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job is not None else None
+
+    def current(self):
+        with self._lock:
+            return dict(self._current) if self._current is not None else None
+
+    def _set_stage(self, job, stage):
+        """Record the current stage and the share of `STAGES` already reached."""
+        if stage not in STAGES:
+            logger.warning(f"Unknown scrape stage: {stage}")
+        with self._lock:
+            job['stage'] = stage
+            if stage in STAGES:
+                job['progress'] = progress(stage)
+
+    def _run(self, job):
+        with self._lock:
+            job['status'] = 'running'
+            job['started_at'] = datetime.now().isoformat()
+        logger.info(f"Scrape job {job['id']} started")
+
+        error = None
+        summary = None
+        report = None
+        try:
+            from src.core.profiling import run_scraper
+            scraper = self.scraper_factory()
+            scraper.on_stage = lambda stage: self._set_stage(job, stage)
+            report = run_scraper(scraper, job['profile'] or None)
+            summary = dict(scraper.summary)
+            error = scraper.error
+        except Exception as e:
+            error = str(e)
+            logger.error(f"Scrape job {job['id']} failed: {error}")
+
+        with self._lock:
+            job['status'] = 'failed' if error else 'succeeded'
+            job['stage'] = 'done'
+            job['progress'] = 1.0
+            job['summary'] = summary
+            job['error'] = error
+            job['profile_report'] = report
+            job['finished_at'] = datetime.now().isoformat()
+            self._current = None
+        logger.info(f"Scrape job {job['id']} {job['status']}")
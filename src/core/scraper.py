@@ -5,36 +5,105 @@ This module orchestrates the scraping process.
 """
 
 import os
-import re
-import yaml
-import requests
-import pandas as pd
-from time import sleep
+import threading
+from contextlib import nullcontext
+from datetime import datetime
+from time import perf_counter
 from dotenv import load_dotenv
-from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 from loguru import logger
 from tenacity import retry, wait_exponential, stop_after_attempt
 from src.core.notifier import Notifier
 from src.core.data_handler import DataHandler
 from src.core.ai_formatter import AIFormatter
+from src.core.fetcher import FetchEngine, get_sources
+from src.core.http_client import get_client
+from src.core.browser_pool import get_browser_pool, wait_for_job_table
+from src.core.metrics import RunMetrics, get_counter
+from src.core.parsers import extract_rows, get_backend
+from src.core.config import load_config
+from src.core.subscriptions import DEFAULT_PROFILE, get_subscription_index
+from src.core.source_state import SourceStateStore, content_hash
+from src.core.job import Job, to_jobs
+
+_runtime_configured = False
+_runtime_lock = threading.Lock()
+
+
+def configure_runtime():
+    """Load `.env` and add the scraper log file, once, when scraping actually starts.
+
+    Kept out of module import so the web process does not pay for it at startup.
+    """
+    global _runtime_configured
+    with _runtime_lock:
+        if _runtime_configured:
+            return
+        load_dotenv()
+        logger.add("/app/logs/scraper.log", rotation="1 week")
+        _runtime_configured = True
 
-# Configuration initiale
-load_dotenv()
-logger.add("/app/logs/scraper.log", rotation="1 week")
 
 class JobScraper:
-    def __init__(self):
-        self.data_handler = DataHandler()
-        self.notifier = Notifier()
-        self.ai_formatter = AIFormatter()
-        self.new_jobs = pd.DataFrame()
+    def __init__(self, sources=None):
+        configure_runtime()
+        self.data_handler = DataHandler(os.getenv('JOBS_CSV_PATH', '/app/data/jobs.csv'))
+        self.notifier = Notifier(os.getenv(
+            'OUTBOX_PATH',
+            os.path.join(os.path.dirname(self.data_handler.filename), 'outbox.db')
+        ))
+        self.http = get_client()
+        self.browser_pool = get_browser_pool()
+        self.parser_backend = get_backend()
+        self.config = load_config()
+        self.subscriptions = get_subscription_index(self.config)
+        self.sources = sources or get_sources()
+        self.source_state = SourceStateStore(os.getenv(
+            'SOURCE_STATE_PATH',
+            os.path.join(os.path.dirname(self.data_handler.filename), 'sources_state.json')
+        ))
+        self.ai_formatter = AIFormatter(os.getenv(
+            'AI_CACHE_PATH',
+            os.path.join(os.path.dirname(self.data_handler.filename), 'ai_fragments.json')
+        ))
+        self.new_jobs = []
+        # Profils (masque de bits) de chaque offre retenue, calculés une seule fois au parsing
+        self.job_masks = {}
+        self.source_jobs = {}
+        self.summary = {}
+        self.error = None
+        # Durées, octets et lignes par étape ; le dernier run est écrit pour /health et /metrics
+        self.run_metrics = RunMetrics()
+        self.last_run_path = os.getenv(
+            'LAST_RUN_PATH',
+            os.path.join(os.path.dirname(self.data_handler.filename), 'last_run.json')
+        )
+        # Étape en cours, signalée à `on_stage(stage)` (suivi des runs lancés depuis l'interface)
+        self.stage = None
+        self.on_stage = None
+        # RunProfiler attaché par src.core.profiling le temps d'un run profilé
+        self.profiler = None
+
+    def reload_config(self):
+        """Pick up changes of the YAML config (used by the long-running scheduler)."""
+        self.config = load_config()
+        self.subscriptions = get_subscription_index(self.config)
+
+    def set_stage(self, stage):
+        self.stage = stage
+        if stage == 'done':
+            self.run_metrics.end()
+        else:
+            self.run_metrics.begin(stage)
+        if self.profiler is not None:
+            self.profiler.stage(stage)
+        if self.on_stage is not None:
+            self.on_stage(stage)
 
     @retry(wait=wait_exponential(multiplier=1, min=2, max=10), stop=stop_after_attempt(3))
-    def fetch_html(self):
+    def fetch_html(self, url=None):
+        url = url or os.getenv('SCRAPER_URL')
         try:
-            logger.info(f"Fetching HTML from URL: {os.getenv('SCRAPER_URL')}")
+            logger.info(f"Fetching HTML from URL: {url}")
             headers = {
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
                 'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
@@ -43,14 +112,26 @@ class JobScraper:
                 'Upgrade-Insecure-Requests': '1',
                 'Cache-Control': 'max-age=0'
             }
-            response = requests.get(os.getenv('SCRAPER_URL'), headers=headers, timeout=15)
+            headers.update(self.source_state.conditional_headers(url))
+            start = perf_counter()
+            response = self.http.get('scraper', url, headers=headers)
+            self.run_metrics.record('fetch_http', perf_counter() - start, nbytes=len(response.content), rows=1)
             response.raise_for_status()
 
             logger.debug(f"Response status code: {response.status_code}")
             logger.debug(f"Response content type: {response.headers.get('Content-Type', 'unknown')}")
-            
+
+            if response.status_code == 304:
+                logger.info(f"Page not modified since last run: {url}")
+                return None
+
             if 'offres-d-emploi' in response.text or 'contentpane' in response.text:
                 logger.debug("Valid job page content found")
+                self.source_state.stage(
+                    url,
+                    etag=response.headers.get('ETag'),
+                    last_modified=response.headers.get('Last-Modified')
+                )
                 return response.text
             
             logger.warning("Invalid page content - no jobs section found")
@@ -59,29 +140,28 @@ class JobScraper:
 
         except Exception as e:
             logger.warning(f"Fallback to Selenium: {str(e)}")
+            start = perf_counter()
             try:
-                options = Options()
-                options.add_argument("--headless=new")
-                options.add_argument("--no-sandbox")
-                options.add_argument("--disable-dev-shm-usage")
-                options.add_argument("--disable-gpu")
-                options.add_argument("--window-size=1920,1080")
-                options.add_argument(f"user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
-                
-                logger.info("Initializing Selenium WebDriver")
-                driver = webdriver.Chrome(options=options)
-                
-                logger.info(f"Navigating to URL: {os.getenv('SCRAPER_URL')}")
-                driver.get(os.getenv('SCRAPER_URL'))
-                
-                logger.info("Waiting for page to load...")
-                sleep(5)  # Increased wait time
-                
-                logger.debug(f"Page title: {driver.title}")
-                html = driver.page_source
+                with self.browser_pool.driver() as driver:
+                    logger.info(f"Navigating to URL: {url}")
+                    driver.get(url)
+                    
+                    logger.info("Waiting for job table...")
+                    if not wait_for_job_table(driver, float(os.getenv('SELENIUM_WAIT_TIMEOUT', 15))):
+                        logger.warning("Job table not found before timeout, using current page source")
+                    
+                    logger.debug(f"Page title: {driver.title}")
+                    html = driver.page_source
                 
                 logger.debug(f"Selenium HTML content length: {len(html)} characters")
-                driver.quit()
+                elapsed = perf_counter() - start
+                self.run_metrics.record('fetch_selenium', elapsed, nbytes=len(html.encode('utf-8')), rows=1)
+                fallback_latency = get_counter('selenium_fallback')
+                fallback_latency.observe(elapsed)
+                logger.info(
+                    f"Selenium fallback took {elapsed:.2f}s "
+                    f"(p50 {fallback_latency.percentile(50):.2f}s over {fallback_latency.count} calls)"
+                )
                 
                 return html
             except Exception as selenium_error:
@@ -89,103 +169,200 @@ class JobScraper:
                 raise Exception(f"Failed to fetch HTML with both methods: {str(e)} and Selenium error: {str(selenium_error)}")
 
     def parse_jobs(self, html):
-        soup = BeautifulSoup(html, 'html.parser')
         jobs = []
         
         logger.debug(f"HTML content length: {len(html)} characters")
-        all_jobs = soup.find_all('tr', class_=['sectiontableentry1', 'sectiontableentry2'])
-        logger.debug(f"Total jobs found on page: {len(all_jobs)}")
-        
         # Log the first few characters of HTML for debugging
         logger.debug(f"HTML preview: {html[:500]}...")
+
+        # L'arbre HTML n'existe que pendant l'extraction : son pic mémoire est mesuré ici
+        with self.profiler.section(f"parse_tree ({self.parser_backend})") if self.profiler else nullcontext():
+            rows = extract_rows(html, self.parser_backend)
+        # Une seule date (à la minute) partagée par toutes les offres de la page
+        date = datetime.now().replace(second=0, microsecond=0)
+
+        subscriptions = self.subscriptions
         
-        if len(all_jobs) == 0:
-            logger.warning("No job entries found in the HTML. Check the page structure or selectors.")
-            # Try alternative selectors if the primary ones don't work
-            all_jobs = soup.select('table.contentpane tr')
-            logger.debug(f"Trying alternative selector, found: {len(all_jobs)} jobs")
-        
-        for item in all_jobs:
+        for row in rows:
             try:
-                cells = item.find_all('td')
-                
-                # Skip if not enough cells
-                if len(cells) < 4:
-                    logger.debug(f"Skipping row with insufficient cells: {len(cells)}")
-                    continue
-                
-                # Check if the first cell has a link
-                title_link = cells[0].find('a')
-                if not title_link:
-                    logger.debug("Skipping row without title link")
-                    continue
-                
-                title = title_link.get_text(strip=True)
-                link = title_link['href']
-                company = cells[1].get_text(strip=True)
-                location = cells[3].get_text(strip=True)
+                title = row['title']
+                link = row['link']
+                location = row['location']
                 
                 if not link.startswith('http'):
                     link = f"https://www.bodet.com{link}"
 
-                keywords = ['dev', 'développeur', 'developpeur', 'développement', 'angular', 'vue', 'vue js', 'vue.js', 'nodejs', 'javascript', 'js', 'php', 'symfony', 'frontend', 'front-end', 'front', 'back-end', 'backend', 'back', 'fullstack', 'full-stack', 'full stack']
-                locations = ['cholet', 'trémentines', 'angers']
-
                 # Log each job for debugging
                 logger.debug(f"Found job: {title} at {location}")
                 
-                if any(kw.lower() in title.lower() for kw in keywords) and location.lower() in locations:
-                    jobs.append({
-                        'title': title,
-                        'link': link,
-                        'company': company,
-                        'location': location,
-                        'date': pd.Timestamp.now().strftime('%Y-%m-%d %H:%M')
-                    })
+                mask = subscriptions.profile_mask(title, location)
+                if mask:
+                    jobs.append(Job(title, link, row['company'], location, date))
+                    self.job_masks[(title, link)] = mask
                     logger.debug(f"Added matching job: {title} at {location}")
                     
             except Exception as e:
                 logger.error(f"Erreur parsing: {str(e)}")
         
         logger.info(f"Total jobs found: {len(jobs)}")
-        return pd.DataFrame(jobs)
+        if self.profiler is not None:
+            self.profiler.records('parsed', jobs)
+        return jobs
+
+    def scrape_sources(self):
+        """Fetch every source concurrently and parse the pages that changed.
+
+        Sources answering 304 or serving the same body as the last processed run
+        are counted in `self.summary` and not parsed.
+        """
+        results = FetchEngine(self.fetch_html).fetch_all(self.sources)
+
+        failed = [r for r in results if r['error'] is not None]
+        # Sources en échec : le planificateur les relance sans allonger leur intervalle
+        self.summary['failed_sources'] = [r['url'] for r in failed]
+        if len(failed) == len(results):
+            raise failed[0]['error']
+        for result in failed:
+            logger.error(f"Source skipped: {result['url']} ({str(result['error'])})")
+
+        changed = []
+        for result in results:
+            if result['error'] is not None:
+                continue
+            if result['html'] is None:
+                self.summary['not_modified'] += 1
+                continue
+            body_hash = content_hash(result['html'])
+            if self.source_state.is_unchanged(result['url'], body_hash):
+                logger.info(f"Page content unchanged since last run: {result['url']}")
+                self.summary['unchanged'] += 1
+                continue
+            self.source_state.stage(result['url'], body_hash=body_hash)
+            changed.append(result)
+
+        self.summary['failed'] = len(failed)
+        self.summary['parsed'] = len(changed)
+
+        self.run_metrics.add('fetch', nbytes=sum(len(r['html'] or '') for r in results), rows=len(results))
+        self.source_jobs = {}
+        if changed:
+            # Le parsing est une étape à part : sa durée ne compte pas dans celle du fetch
+            self.set_stage('parse')
+        for result in changed:
+            jobs = to_jobs(self.parse_jobs(result['html']))
+            self.run_metrics.add('parse', nbytes=len(result['html']), rows=len(jobs))
+            self.source_jobs[result['url']] = jobs
+        # Plusieurs pages peuvent publier la même offre
+        jobs, seen = [], set()
+        for source_jobs in self.source_jobs.values():
+            for job in source_jobs:
+                if (job.title, job.link) not in seen:
+                    seen.add((job.title, job.link))
+                    jobs.append(job)
+        return jobs
+
+    def count_by_source(self, jobs):
+        """Number of `jobs` published by each source parsed in this run."""
+        keys = {job.fingerprint for job in jobs}
+        return {
+            url: sum(job.fingerprint in keys for job in source_jobs)
+            for url, source_jobs in self.source_jobs.items()
+        }
+
+    def send_digests(self, jobs, body):
+        """Queue one email per subscription profile with the new jobs it watches.
+
+        `body` is the email of all `jobs`; digests of a subset are rebuilt from
+        the AI cards cached by `format_jobs`, without another API call.
+        """
+        masks = [self.job_masks.get((job.title, job.link)) for job in jobs]
+        self.summary['digests'] = {}
+        for profile, selected in self.subscriptions.route(jobs, masks):
+            digest = body if len(selected) == len(jobs) else self.ai_formatter.render_cached(selected)
+            if profile['name'] == DEFAULT_PROFILE:
+                subject = f"[Kelio] {len(selected)} nouvelle(s) offre(s) de développeur"
+            else:
+                subject = f"[Kelio] {len(selected)} nouvelle(s) offre(s) ({profile['name']})"
+            self.notifier.send_email(subject, digest, to=profile['email'])
+            self.run_metrics.add('notify', nbytes=len(digest.encode('utf-8')), rows=1)
+            self.summary['digests'][profile['name']] = len(selected)
 
     def run(self):
+        self.summary = {
+            'sources': len(self.sources), 'not_modified': 0, 'unchanged': 0,
+            'failed': 0, 'failed_sources': [], 'parsed': 0, 'new_jobs': 0, 'new_by_source': {}, 'skipped': False
+        }
+        self.error = None
+        self.run_metrics = RunMetrics()
+        self.job_masks = {}
+        # Rien de ce qu'un run précédent a laissé en attente ne doit être validé par celui-ci
+        self.source_state.discard()
         try:
             logger.info("Starting scraping...")
 
-            # Charger les offres existantes
-            existing_jobs = self.data_handler.load_data()
-            existing_titles = set(existing_jobs['title']) if not existing_jobs.empty else set()
+            self.set_stage('fetch')
+            self.new_jobs = self.scrape_sources()
 
-            html = self.fetch_html()
-            self.new_jobs = self.parse_jobs(html)
-            
-            # Filtrer pour ne garder que les nouvelles offres
-            if not self.new_jobs.empty:
-                really_new_jobs = self.new_jobs[~self.new_jobs['title'].isin(existing_titles)]
+            if self.summary['parsed'] == 0:
+                # Rien n'a changé : pas de parsing, déduplication, sauvegarde ni appel IA
+                self.summary['skipped'] = True
+                logger.info("No source changed since last run, skipping processing")
+            elif self.new_jobs:
+                # Filtrer avec l'index des empreintes (lien, titre, lieu) déjà enregistrées
+                self.set_stage('dedupe')
+                really_new_jobs = self.data_handler.unseen_jobs(self.new_jobs)
+                self.run_metrics.add('dedupe', rows=len(really_new_jobs))
+                if self.profiler is not None:
+                    self.profiler.records('scraped', self.new_jobs)
+                    self.profiler.records('new', really_new_jobs)
                 
-                if not really_new_jobs.empty:
+                if really_new_jobs:
+                    self.set_stage('save')
                     self.data_handler.save_data(really_new_jobs)
+                    self.run_metrics.add('save', rows=len(really_new_jobs))
+                    self.summary['new_jobs'] = len(really_new_jobs)
+                    self.summary['new_by_source'] = self.count_by_source(really_new_jobs)
                     
                     # Utiliser l'IA pour formater le contenu de l'email
+                    self.set_stage('format')
                     body = self.ai_formatter.format_jobs(really_new_jobs)
+                    self.summary['ai_fragments'] = self.ai_formatter.last_stats
+                    self.run_metrics.add('format', nbytes=len(body.encode('utf-8')), rows=len(really_new_jobs))
                     
                     if os.getenv('SEND_EMAIL'):
-                        self.notifier.send_email(
-                            f"[Kelio] {len(really_new_jobs)} nouvelle(s) offre(s) de développeur",
-                            body
-                        )
+                        self.set_stage('notify')
+                        self.send_digests(really_new_jobs, body)
                     logger.info(f"{len(really_new_jobs)} nouvelles offres trouvées")
                 else:
                     logger.info("Aucune nouvelle offre trouvée")
 
+            # Les pages ne sont marquées comme traitées qu'une fois le run terminé
+            self.source_state.commit()
+            logger.info(f"Run summary: {self.summary}")
             logger.success("Process completed")
         except Exception as e:
+            self.error = str(e)
             logger.error(f"Critical error: {str(e)}")
+            # Pages non traitées : elles seront récupérées et analysées à nouveau au prochain run
+            self.source_state.discard()
             # Notification d'erreur
             self.notifier.send_notification(f"Erreur critique: {str(e)}")
+        finally:
+            self.set_stage('done')
+            self.run_metrics.finish(self.error)
+            self.run_metrics.save(self.last_run_path)
 
 if __name__ == "__main__":
+    import argparse
+    from src.core.profiling import run_scraper
+
+    parser = argparse.ArgumentParser(description="Scrape the Kelio job listings once.")
+    parser.add_argument('--profile', action='store_true', default=None,
+                        help="write a CPU/memory report of the run (or set SCRAPER_PROFILE=true)")
+    args = parser.parse_args()
+
     scraper = JobScraper()
-    scraper.run()
+    run_scraper(scraper, args.profile)
+    # Le run est terminé ; laisser au processus le temps de remettre les emails en attente
+    if not scraper.notifier.flush():
+        logger.warning("Emails still pending in outbox, they will be sent by the next run")
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+SearchIndex module: SQLite FTS5 full-text index over the job history.
+"""
+
+import os
+import re
+import sqlite3
+import threading
+from loguru import logger
+from src.core.fingerprint import job_fingerprint
+from src.core.job import _clean
+
+FIELDS = ['title', 'company', 'location', 'link', 'date']
+
+# unicode61 + remove_diacritics : "développeur", "Developpeur" et "DÉVELOPPEUR" ont le même jeton.
+# Les index de préfixes de 2 et 3 caractères gardent les requêtes courtes ("dev*") rapides.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS search_docs (
+    id INTEGER PRIMARY KEY,
+    fingerprint TEXT NOT NULL UNIQUE,
+    title TEXT,
+    company TEXT,
+    location TEXT,
+    link TEXT,
+    date TEXT
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS search_fts USING fts5(
+    title, company, location,
+    content='search_docs', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2',
+    prefix='2 3'
+);
+CREATE TRIGGER IF NOT EXISTS search_docs_ai AFTER INSERT ON search_docs BEGIN
+    INSERT INTO search_fts (rowid, title, company, location)
+    VALUES (new.id, new.title, new.company, new.location);
+END;
+"""
+
+# Poids bm25 des colonnes (titre, société, lieu) : le titre compte le plus
+RANK_WEIGHTS = (10.0, 1.0, 3.0)
+MAX_LIMIT = 100
+# Nombre de correspondances les plus récentes classées par pertinence
+DEFAULT_RANK_WINDOW = 500
+
+
+def build_match(text):
+    """FTS5 query matching every word of `text` as a prefix, or None if there is no word.
+
+    Words are quoted, so FTS5 operators typed by users are searched as plain text.
+    """
+    words = re.findall(r'\w+', text or '')
+    if not words:
+        return None
+    return ' '.join(f'"{word}"*' for word in words)
+
+
+class SearchIndex:
+    """Full-text index of title, company and location, ranked with bm25.
+
+    Documents are keyed by job fingerprint, so adding a job twice is a no-op.
+    The index lives in its own SQLite file (WAL mode, one connection per
+    thread) whatever the storage backend, and is kept in sync by
+    `DataHandler.save_data`.
+    """
+
+    def __init__(self, path, rank_window=None):
+        self.path = path
+        self.rank_window = rank_window or int(os.getenv('SEARCH_RANK_WINDOW', DEFAULT_RANK_WINDOW))
+        self._local = threading.local()
+        self._init_lock = threading.Lock()
+        self._initialized = False
+
+    def connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        with self._init_lock:
+            if not self._initialized:
+                conn.executescript(SCHEMA)
+                self._initialized = True
+        return conn
+
+    def add(self, jobs):
+        """Index job dicts, skipping the ones already indexed. Returns the number added."""
+        rows = [
+            (_clean(job.get('fingerprint')) or job_fingerprint(job),) + tuple(_clean(job.get(field)) for field in FIELDS)
+            for job in jobs
+        ]
+        conn = self.connection()
+        with conn:
+            cursor = conn.executemany(
+                "INSERT OR IGNORE INTO search_docs (fingerprint, title, company, location, link, date) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            return cursor.rowcount
+
+    def count(self):
+        return self.connection().execute("SELECT COUNT(*) FROM search_docs").fetchone()[0]
+
+    def clear(self):
+        conn = self.connection()
+        with conn:
+            conn.execute("DELETE FROM search_docs")
+            conn.execute("INSERT INTO search_fts (search_fts) VALUES ('delete-all')")
+
+    def rebuild(self, jobs):
+        """Replace the whole index with `jobs`."""
+        self.clear()
+        added = self.add(jobs)
+        logger.info(f"Search index rebuilt with {added} jobs")
+        return added
+
+    def search(self, text, limit=20, offset=0):
+        """Return (items, total) for the matches of `text`, best first.
+
+        The `rank_window` most recent matches are ranked with bm25 (ties broken
+        by date, newest first); older matches follow, newest first. Computing
+        bm25 on every match of a broad query ("dev") would cost tens of
+        milliseconds on a 100k-job history, and old offers are rarely wanted.
+        """
+        match = build_match(text)
+        if match is None:
+            return [], 0
+        limit = max(1, min(int(limit), MAX_LIMIT))
+        offset = max(0, int(offset))
+        conn = self.connection()
+        try:
+            total = conn.execute(
+                "SELECT COUNT(*) FROM search_fts WHERE search_fts MATCH ?", (match,)
+            ).fetchone()[0]
+            # Plus petit rowid de la fenêtre classée : au-delà, simple ordre antichronologique
+            cut = 0
+            if total > self.rank_window:
+                cut = conn.execute(
+                    "SELECT rowid FROM search_fts WHERE search_fts MATCH ? ORDER BY rowid DESC LIMIT 1 OFFSET ?",
+                    (match, self.rank_window - 1)
+                ).fetchone()[0]
+            ranked = min(total, self.rank_window)
+
+            rows = []
+            if offset < ranked:
+                rows = conn.execute(
+                    f"SELECT d.title, d.link, d.company, d.location, d.date, "
+                    f"bm25(search_fts, {', '.join(map(str, RANK_WEIGHTS))}) AS score "
+                    "FROM search_fts JOIN search_docs d ON d.id = search_fts.rowid "
+                    "WHERE search_fts MATCH ? AND search_fts.rowid >= ? "
+                    "ORDER BY score, d.date DESC LIMIT ? OFFSET ?",
+                    (match, cut, limit, offset)
+                ).fetchall()
+            if len(rows) < limit and total > ranked:
+                rows += conn.execute(
+                    "SELECT d.title, d.link, d.company, d.location, d.date, NULL AS score "
+                    "FROM search_fts JOIN search_docs d ON d.id = search_fts.rowid "
+                    "WHERE search_fts MATCH ? AND search_fts.rowid < ? "
+                    "ORDER BY search_fts.rowid DESC LIMIT ? OFFSET ?",
+                    (match, cut, limit - len(rows), max(0, offset - ranked))
+                ).fetchall()
+        except sqlite3.OperationalError as e:
+            raise ValueError(f"Invalid search: {str(e)}")
+        return [
+            dict(row, score=None if row['score'] is None else round(-row['score'], 4))
+            for row in rows
+        ], total
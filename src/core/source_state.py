@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+SourceState module for remembering HTTP validators and content hashes per source.
+"""
+
+import hashlib
+import json
+import os
+from loguru import logger
+
+
+def content_hash(html):
+    """Return a stable hash of a page body."""
+    return hashlib.sha256(html.encode('utf-8')).hexdigest()
+
+
+class SourceStateStore:
+    """Persist ETag, Last-Modified and body hash of each scraped source in a JSON file.
+
+    Updates are staged during a run and only written by `commit()`, so a run
+    that fails half way will fetch and process the same pages again next time.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.state = self._load()
+        self.pending = {}
+
+    def _load(self):
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, encoding='utf-8') as f:
+                    return json.load(f)
+        except Exception as e:
+            logger.warning(f"Could not read source state: {str(e)}")
+        return {}
+
+    def get(self, url):
+        return self.state.get(str(url), {})
+
+    def conditional_headers(self, url):
+        """Return the `If-None-Match`/`If-Modified-Since` headers for a source."""
+        entry = self.get(url)
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def is_unchanged(self, url, body_hash):
+        """True if the body hash matches the one stored for the last processed run."""
+        return self.get(url).get('body_hash') == body_hash
+
+    def stage(self, url, **fields):
+        """Record new validators/hash for a source, applied on `commit()`."""
+        self.pending.setdefault(str(url), {}).update({k: v for k, v in fields.items() if v is not None})
+
+    def discard(self):
+        """Drop the updates staged by a run that did not complete."""
+        self.pending = {}
+
+    def commit(self):
+        """Merge staged updates and write the state file atomically."""
+        if not self.pending:
+            return
+        for url, fields in self.pending.items():
+            self.state.setdefault(url, {}).update(fields)
+        self.pending = {}
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.state, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.error(f"Error saving source state: {str(e)}")
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+SQLiteStore module: SQLite storage engine for job offers.
+"""
+
+import os
+import sqlite3
+import threading
+from loguru import logger
+from src.core.lazy import LazyModule
+from src.core.fingerprint import job_fingerprint
+from src.core.job import COLUMNS, _clean
+
+# pandas ne sert qu'à l'import du CSV existant
+pd = LazyModule('pandas')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    fingerprint TEXT NOT NULL,
+    title TEXT,
+    link TEXT,
+    company TEXT,
+    location TEXT,
+    date TEXT
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_jobs_fingerprint ON jobs (fingerprint);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# Version 1 : empreinte normalisée (lien, titre, lieu) de src.core.fingerprint
+SCHEMA_VERSION = 1
+
+
+class SQLiteStore:
+    """Jobs table in WAL mode with a unique index on the job fingerprint.
+
+    Inserts are `INSERT OR IGNORE`, so a save costs O(new jobs) and readers
+    never block on, nor see, a partially written save. One connection is kept
+    per thread.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._init_lock = threading.Lock()
+        self._initialized = False
+
+    def connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        with self._init_lock:
+            if not self._initialized:
+                conn.executescript(SCHEMA)
+                self._migrate(conn)
+                self._initialized = True
+        return conn
+
+    def _migrate(self, conn):
+        """Recompute fingerprints of rows written by an older schema version."""
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version >= SCHEMA_VERSION:
+            return
+        rows = conn.execute(f"SELECT id, {', '.join(COLUMNS)} FROM jobs ORDER BY id").fetchall()
+        seen = set()
+        updates, duplicates = [], []
+        for row in rows:
+            key = job_fingerprint(dict(row))
+            if key in seen:
+                duplicates.append((row['id'],))
+            else:
+                seen.add(key)
+                updates.append((key, row['id']))
+        with conn:
+            conn.execute("DROP INDEX IF EXISTS idx_jobs_fingerprint")
+            conn.executemany("DELETE FROM jobs WHERE id = ?", duplicates)
+            conn.executemany("UPDATE jobs SET fingerprint = ? WHERE id = ?", updates)
+            conn.execute("CREATE UNIQUE INDEX idx_jobs_fingerprint ON jobs (fingerprint)")
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        if rows:
+            logger.info(f"Fingerprints migrated for {len(updates)} jobs ({len(duplicates)} duplicates removed)")
+
+    def insert_jobs(self, jobs):
+        """Insert job dicts, ignoring the ones already stored. Returns the number inserted."""
+        rows = [
+            (_clean(job.get('fingerprint')) or job_fingerprint(job),) + tuple(_clean(job.get(column)) for column in COLUMNS)
+            for job in jobs
+        ]
+        conn = self.connection()
+        with conn:
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO jobs (fingerprint, title, link, company, location, date) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            return conn.total_changes - before
+
+    def load_jobs(self):
+        """Return every stored job as a list of dicts, in insertion order."""
+        cursor = self.connection().execute(
+            f"SELECT {', '.join(COLUMNS)} FROM jobs ORDER BY id"
+        )
+        return [dict(row) for row in cursor]
+
+    def load_rows(self):
+        """Return every stored job as a tuple in `COLUMNS` order, in insertion order."""
+        conn = self.connection()
+        return conn.execute(f"SELECT {', '.join(COLUMNS)} FROM jobs ORDER BY id").fetchall()
+
+    def fingerprints(self):
+        """Yield the fingerprint of every stored job."""
+        for (key,) in self.connection().execute("SELECT fingerprint FROM jobs"):
+            yield key
+
+    def count(self):
+        return self.connection().execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+
+    def clear(self):
+        conn = self.connection()
+        with conn:
+            conn.execute("DELETE FROM jobs")
+
+    def get_meta(self, key):
+        row = self.connection().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key, value):
+        conn = self.connection()
+        with conn:
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def migrate_from_csv(self, csv_path):
+        """Import an existing jobs CSV once. Later calls are no-ops."""
+        if self.get_meta('csv_migrated') or not os.path.exists(csv_path):
+            return 0
+        try:
+            df = pd.read_csv(csv_path)
+        except Exception as e:
+            logger.warning(f"Could not read CSV for migration: {str(e)}")
+            return 0
+        inserted = self.insert_jobs(df.to_dict('records'))
+        self.set_meta('csv_migrated', csv_path)
+        logger.info(f"Migrated {inserted} jobs from {csv_path} to {self.path}")
+        return inserted
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Subscriptions module: several watch profiles evaluated in a single pass.
+"""
+
+import threading
+from loguru import logger
+from src.core.matcher import AhoCorasick, normalize
+
+# Profil construit à partir de la section `filters`, envoyé à EMAIL_RECEIVER
+DEFAULT_PROFILE = 'default'
+
+
+def load_profiles(config):
+    """Return the watch profiles of a config: the `filters` one, then each `subscriptions` entry.
+
+    A profile is a dict {name, email, keywords, locations}; `email` None means
+    the default receiver. Configs that would drop every job are logged.
+    """
+    profiles = []
+    filters = config.get('filters') or {}
+    if filters:
+        profiles.append({
+            'name': DEFAULT_PROFILE,
+            'email': None,
+            'keywords': list(filters.get('keywords') or ()),
+            'locations': list(filters.get('locations') or ()),
+        })
+    for i, entry in enumerate(config.get('subscriptions') or ()):
+        profiles.append({
+            'name': entry.get('name') or entry.get('email') or f"subscription-{i + 1}",
+            'email': entry.get('email'),
+            'keywords': list(entry.get('keywords') or ()),
+            'locations': list(entry.get('locations') or ()),
+        })
+
+    if not profiles:
+        logger.warning("No `filters` nor `subscriptions` in the config: every job will be dropped")
+    for profile in profiles:
+        if not profile['keywords'] or not profile['locations']:
+            logger.warning(f"Profile '{profile['name']}' has no keyword or no location: it matches no job")
+    return profiles
+
+
+class SubscriptionIndex:
+    """Inverted index from keywords and locations to the profiles watching them.
+
+    Profiles are numbered bits. One Aho-Corasick automaton holds the keywords
+    of every profile and maps each to the bitmask of its profiles; locations
+    map to a bitmask too. A job is scanned once whatever the number of
+    profiles: it matches the profiles of `keywords mask & location mask`,
+    i.e. those with at least one keyword in the title and the job location
+    in their list. Matching ignores case and accents (`normalize`); a
+    location must be equal, not just contained.
+    """
+
+    def __init__(self, profiles):
+        self.profiles = list(profiles)
+        keyword_masks = {}
+        location_masks = {}
+        for bit, profile in enumerate(self.profiles):
+            for keyword in profile['keywords']:
+                if keyword:
+                    key = normalize(keyword)
+                    keyword_masks[key] = keyword_masks.get(key, 0) | 1 << bit
+            for location in profile['locations']:
+                if location:
+                    key = normalize(location)
+                    location_masks[key] = location_masks.get(key, 0) | 1 << bit
+        self.keywords = sorted(keyword_masks)
+        self.keyword_masks = [keyword_masks[k] for k in self.keywords]
+        self.location_masks = location_masks
+        self.automaton = AhoCorasick(self.keywords)
+
+    def profile_mask(self, title, location):
+        """Bitmask of the profiles a job matches (0: none)."""
+        candidates = self.location_masks.get(normalize(location), 0)
+        if not candidates:
+            return 0
+        mask = 0
+        for index in self.automaton.search(normalize(title)):
+            mask |= self.keyword_masks[index]
+            if mask & candidates == candidates:
+                break
+        return mask & candidates
+
+    def matches(self, title, location):
+        """True if at least one profile wants the job."""
+        return self.profile_mask(title, location) != 0
+
+    def route(self, jobs, masks=None):
+        """Group `jobs` per profile: [(profile, jobs)] for the profiles with at least one job.
+
+        `masks[i]` is the `profile_mask` of `jobs[i]` when already known (None: computed here).
+        """
+        routed = [[] for _ in self.profiles]
+        for i, job in enumerate(jobs):
+            mask = masks[i] if masks is not None else None
+            if mask is None:
+                mask = self.profile_mask(job.title or '', job.location or '')
+            bit = 0
+            while mask:
+                if mask & 1:
+                    routed[bit].append(job)
+                mask >>= 1
+                bit += 1
+        return [(profile, selected) for profile, selected in zip(self.profiles, routed) if selected]
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_subscription_index(config):
+    """Return the compiled index of the profiles of a config, built once per content."""
+    profiles = load_profiles(config)
+    key = tuple(
+        (p['name'], p['email'], tuple(p['keywords']), tuple(p['locations'])) for p in profiles
+    )
+    with _indexes_lock:
+        if key not in _indexes:
+            _indexes[key] = SubscriptionIndex(profiles)
+        return _indexes[key]
@@ -8,8 +8,9 @@ document.addEventListener('DOMContentLoaded', function () {
   const searchInput = document.getElementById('searchInput');
   const locationFilter = document.getElementById('locationFilter');
   const sortFilter = document.getElementById('sortFilter');
-  const jobItems = document.querySelectorAll('.job-item');
   const jobsContainer = document.getElementById('jobsContainer');
+  const jobsLoader = document.getElementById('jobsLoader');
+  const jobsSentinel = document.getElementById('jobsSentinel');
   const runScraperBtn = document.getElementById('runScraperBtn');
   const clearJobsBtn = document.getElementById('clearJobsBtn');
   const toastContainer = document.querySelector('.toast-container');
@@ -87,96 +88,169 @@ document.addEventListener('DOMContentLoaded', function () {
   });
 
   /**
-   * Trie les offres d'emploi en fonction du critère sélectionné
+   * État de la liste paginée : les offres sont demandées à /api/jobs page par page
    */
-  function sortJobs() {
-    const sortValue = sortFilter.value;
-    const jobItemsArray = Array.from(jobItems);
-    
-    jobItemsArray.sort((a, b) => {
-      switch (sortValue) {
-        case 'date-desc':
-          return compareDates(b.getAttribute('data-date'), a.getAttribute('data-date'));
-        case 'date-asc':
-          return compareDates(a.getAttribute('data-date'), b.getAttribute('data-date'));
-        case 'title-asc':
-          return a.getAttribute('data-title').localeCompare(b.getAttribute('data-title'));
-        case 'title-desc':
-          return b.getAttribute('data-title').localeCompare(a.getAttribute('data-title'));
-        default:
-          return 0;
-      }
-    });
-    
-    // Réorganiser les éléments dans le DOM
-    jobItemsArray.forEach(item => {
-      jobsContainer.appendChild(item);
-    });
+  const jobsState = {
+    cursor: null,
+    done: false,
+    loading: false,
+    requestId: 0
+  };
+
+  /**
+   * Échappe une valeur avant insertion dans le HTML
+   * @param {*} value - Valeur à échapper
+   * @returns {string} - Texte sûr
+   */
+  function escapeHtml(value) {
+    return String(value ?? '')
+      .replace(/&/g, '&amp;')
+      .replace(/</g, '&lt;')
+      .replace(/>/g, '&gt;')
+      .replace(/"/g, '&quot;')
+      .replace(/'/g, '&#39;');
   }
-  
+
   /**
-   * Compare deux dates pour le tri
-   * @param {string} dateA - Première date à comparer
-   * @param {string} dateB - Seconde date à comparer
-   * @returns {number} - Résultat de la comparaison
+   * Construit la carte HTML d'une offre d'emploi
+   * @param {Object} job - Offre renvoyée par l'API
+   * @returns {HTMLElement} - Élément de la carte
    */
-  function compareDates(dateA, dateB) {
-    // Si une des dates est vide, la placer à la fin
-    if (!dateA) return 1;
-    if (!dateB) return -1;
-    
-    // Extraire la première partie de la date (avant l'espace)
-    const cleanDateA = dateA.split(' ')[0];
-    const cleanDateB = dateB.split(' ')[0];
-    
-    // Convertir au format français (JJ/MM/AAAA) en format Date
-    const partsA = cleanDateA.split('/');
-    const partsB = cleanDateB.split('/');
-    
-    // Si le format n'est pas valide, utiliser la comparaison de chaînes
-    if (partsA.length !== 3 || partsB.length !== 3) {
-      return cleanDateA.localeCompare(cleanDateB);
-    }
-    
-    // Créer des objets Date (format MM/JJ/AAAA pour JavaScript)
-    const dateObjA = new Date(`${partsA[1]}/${partsA[0]}/${partsA[2]}`);
-    const dateObjB = new Date(`${partsB[1]}/${partsB[0]}/${partsB[2]}`);
-    
-    // Comparer les objets Date
-    return dateObjA - dateObjB;
+  function renderJobCard(job) {
+    const date = job.date ? String(job.date).split(' ')[0] : '';
+    const item = document.createElement('div');
+    item.className = 'col job-item';
+    item.innerHTML = `
+      <div class="job-card">
+        <div class="job-card-header">
+          <h3 class="job-title">${escapeHtml(job.title)}</h3>
+          <p class="job-company">
+            <i class="fas fa-building"></i>${escapeHtml(job.company)}
+          </p>
+          ${date ? `
+          <div class="job-date">
+            <i class="far fa-calendar-alt"></i>
+            <span>${escapeHtml(date)}</span>
+          </div>` : ''}
+        </div>
+        <div class="job-card-body">
+          <div class="job-tags">
+            <span class="job-tag"><i class="fas fa-code me-1"></i>Développement</span>
+            <span class="job-tag"><i class="fas fa-clock me-1"></i>Temps plein</span>
+            ${job.location ? `<span class="job-tag"><i class="fas fa-map-marker-alt me-1"></i>${escapeHtml(job.location)}</span>` : ''}
+          </div>
+        </div>
+        <div class="job-card-footer">
+          <div class="job-meta">
+            <i class="fas fa-eye"></i>Publié récemment
+          </div>
+          <a href="${escapeHtml(job.link)}" class="btn btn-view" target="_blank" rel="noopener"
+            aria-label="Voir l'offre ${escapeHtml(job.title)}">
+            Voir l'offre
+            <i class="fas fa-arrow-right"></i>
+          </a>
+        </div>
+      </div>
+    `;
+    return item;
   }
 
   /**
-   * Filtre les offres d'emploi en fonction des critères de recherche
+   * Construit les paramètres de requête à partir des filtres
+   * @returns {URLSearchParams} - Paramètres pour /api/jobs
    */
-  function filterJobs() {
-    const searchValue = searchInput.value.toLowerCase();
-    const locationValue = locationFilter.value;
-    const resultsCount = document.getElementById('resultsCount');
-    let visibleCount = 0;
+  function buildJobsQuery() {
+    const params = new URLSearchParams();
+    if (searchInput && searchInput.value.trim()) params.set('q', searchInput.value.trim());
+    if (locationFilter && locationFilter.value) params.set('location', locationFilter.value);
+    if (sortFilter) params.set('sort', sortFilter.value);
+    if (jobsState.cursor) params.set('cursor', jobsState.cursor);
+    return params;
+  }
 
-    jobItems.forEach(item => {
-      const title = item.getAttribute('data-title').toLowerCase();
-      const location = item.getAttribute('data-location');
+  /**
+   * Charge la page suivante d'offres depuis l'API
+   */
+  function loadMoreJobs() {
+    if (!jobsContainer || jobsState.loading || jobsState.done) return;
 
-      const matchesSearch = title.includes(searchValue);
-      const matchesLocation = !locationValue || location === locationValue;
+    jobsState.loading = true;
+    const requestId = jobsState.requestId;
+    if (jobsLoader) jobsLoader.style.display = 'inline-block';
 
-      if (matchesSearch && matchesLocation) {
-        item.style.display = '';
-        visibleCount++;
-      } else {
-        item.style.display = 'none';
-      }
-    });
-    
-    // Mettre à jour le compteur de résultats
-    if (resultsCount) {
-      resultsCount.textContent = visibleCount;
-    }
-    
-    // Appliquer le tri après le filtrage
-    sortJobs();
+    fetch(`/api/jobs?${buildJobsQuery().toString()}`)
+      .then(response => {
+        if (!response.ok) {
+          throw new Error(`HTTP error! Status: ${response.status}`);
+        }
+        return response.json();
+      })
+      .then(data => {
+        // Ignorer une réponse arrivée après un changement de filtre
+        if (requestId !== jobsState.requestId) return;
+
+        const fragment = document.createDocumentFragment();
+        data.items.forEach(job => fragment.appendChild(renderJobCard(job)));
+        jobsContainer.appendChild(fragment);
+
+        jobsState.cursor = data.next_cursor;
+        jobsState.done = !data.next_cursor;
+
+        const resultsCount = document.getElementById('resultsCount');
+        if (resultsCount) {
+          resultsCount.textContent = data.total;
+        }
+      })
+      .catch(error => {
+        console.error('Error:', error);
+        jobsState.done = true;
+        showErrorToast('Impossible de charger les offres. Veuillez réessayer plus tard.');
+      })
+      .finally(() => {
+        if (requestId !== jobsState.requestId) return;
+        jobsState.loading = false;
+        if (jobsLoader) jobsLoader.style.display = 'none';
+        // Continuer si le bas de la liste est encore visible
+        if (!jobsState.done && jobsSentinel && isInViewport(jobsSentinel)) {
+          loadMoreJobs();
+        }
+      });
+  }
+
+  /**
+   * Indique si un élément est visible dans la fenêtre
+   * @param {HTMLElement} element - Élément à tester
+   * @returns {boolean}
+   */
+  function isInViewport(element) {
+    const rect = element.getBoundingClientRect();
+    return rect.top < window.innerHeight && rect.bottom >= 0;
+  }
+
+  /**
+   * Repart de la première page après un changement de recherche, filtre ou tri
+   */
+  function filterJobs() {
+    jobsState.requestId++;
+    jobsState.cursor = null;
+    jobsState.done = false;
+    jobsState.loading = false;
+    if (jobsContainer) jobsContainer.innerHTML = '';
+    loadMoreJobs();
+  }
+
+  /**
+   * Retarde l'appel d'une fonction jusqu'à la fin de la saisie
+   * @param {Function} func - Fonction à appeler
+   * @param {number} delay - Délai en ms
+   * @returns {Function}
+   */
+  function debounce(func, delay) {
+    let timer;
+    return function () {
+      clearTimeout(timer);
+      timer = setTimeout(func, delay);
+    };
   }
 
   /**
@@ -306,6 +380,49 @@ document.addEventListener('DOMContentLoaded', function () {
     });
   }
 
+  // Libellés des étapes d'un scraping lancé en arrière-plan
+  const SCRAPE_STAGE_LABELS = {
+    queued: 'En attente',
+    fetch: 'Récupération des pages',
+    parse: 'Analyse des pages',
+    dedupe: 'Recherche des nouvelles offres',
+    save: 'Enregistrement',
+    format: 'Mise en forme',
+    notify: 'Envoi de l\'email',
+    done: 'Terminé'
+  };
+  const SCRAPE_POLL_INTERVAL = 1500;
+
+  /**
+   * Interroge l'état d'une tâche de scraping jusqu'à ce qu'elle soit terminée
+   * @param {string} statusUrl - L'URL d'état renvoyée par /run-scraper
+   * @param {Function} onStage - Appelée avec l'étape en cours à chaque interrogation
+   * @returns {Promise<Object>} L'état final de la tâche
+   */
+  function pollScrapeJob(statusUrl, onStage) {
+    return new Promise((resolve, reject) => {
+      const poll = () => {
+        fetch(statusUrl)
+          .then(response => {
+            if (!response.ok) {
+              throw new Error(`HTTP error! Status: ${response.status}`);
+            }
+            return response.json();
+          })
+          .then(job => {
+            onStage(job.stage);
+            if (job.status === 'succeeded' || job.status === 'failed') {
+              resolve(job);
+            } else {
+              setTimeout(poll, SCRAPE_POLL_INTERVAL);
+            }
+          })
+          .catch(reject);
+      };
+      poll();
+    });
+  }
+
   /**
    * Gère l'appel API avec indicateur de chargement
    * @param {HTMLElement} button - Le bouton qui a déclenché l'action
@@ -341,6 +458,19 @@ document.addEventListener('DOMContentLoaded', function () {
         }
         return response.json();
       })
+      .then(data => {
+        if (!data.status_url) {
+          return data;
+        }
+        // Tâche en arrière-plan : suivre son avancement jusqu'à la fin
+        return pollScrapeJob(data.status_url, stage => {
+          const label = SCRAPE_STAGE_LABELS[stage] || stage;
+          const toastMessage = loadingToast && loadingToast.querySelector('.toast-message');
+          if (toastMessage) {
+            toastMessage.textContent = `${loadingText} ${label}...`;
+          }
+        });
+      })
       .then(data => {
         // Fermer la notification de chargement
         if (loadingToast) {
@@ -415,7 +545,7 @@ document.addEventListener('DOMContentLoaded', function () {
 
   // Ajouter les écouteurs d'événements pour la recherche, le filtrage et le tri
   if (searchInput) {
-    searchInput.addEventListener('input', filterJobs);
+    searchInput.addEventListener('input', debounce(filterJobs, 250));
   }
   
   if (locationFilter) {
@@ -426,8 +556,15 @@ document.addEventListener('DOMContentLoaded', function () {
     sortFilter.addEventListener('change', filterJobs);
   }
   
-  // Appliquer le tri initial
-  if (sortFilter && jobsContainer) {
-    sortJobs();
+  // Chargement de la première page puis des suivantes au défilement
+  if (jobsContainer) {
+    if (jobsSentinel && 'IntersectionObserver' in window) {
+      new IntersectionObserver(entries => {
+        if (entries.some(entry => entry.isIntersecting)) {
+          loadMoreJobs();
+        }
+      }, { rootMargin: '400px' }).observe(jobsSentinel);
+    }
+    loadMoreJobs();
   }
 }); 
\ No newline at end of file
@@ -0,0 +1,326 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+
+from src.core.ai_formatter import AIFormatter, JsonEndScanner
+from src.core.fragment_cache import FragmentCache
+from src.core.rate_limit import RateLimiter
+from benchmarks.fake_groq import FakeGroqServer
+
+
+def job(title, link, location='Cholet'):
+    return {'title': title, 'link': link, 'company': 'Kelio', 'location': location, 'date': '2025-03-08 20:28'}
+
+
+def ai_answer(system_message, user_prompt):
+    """Fake Groq answer: one card per job ID found in the prompt."""
+    fragments = {}
+    for block in user_prompt.split('\n\n')[1:]:
+        fields = dict(line.split(': ', 1) for line in block.splitlines())
+        fragments[fields['ID']] = f'<div class="ai"><a href="{fields["Link"]}">{fields["Title"]}</a></div>'
+    return json.dumps({'fragments': fragments})
+
+
+class TestAIFormatterFragments(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache_path = os.path.join(self.tmp_dir.name, 'ai_fragments.json')
+        self.formatter = AIFormatter(self.cache_path)
+        self.formatter.rate_limiter = RateLimiter(0)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_only_unseen_jobs_are_sent(self):
+        with patch.object(AIFormatter, '_call_groq', side_effect=ai_answer) as mock_call:
+            self.formatter.format_jobs(pd.DataFrame([job('Dev 1', 'l1'), job('Dev 2', 'l2')]))
+            html = self.formatter.format_jobs(pd.DataFrame([job('Dev 2', 'l2'), job('Dev 3', 'l3')]))
+
+        self.assertEqual(mock_call.call_count, 2)
+        second_prompt = mock_call.call_args_list[1].args[1]
+        self.assertIn('Dev 3', second_prompt)
+        self.assertNotIn('Dev 2', second_prompt)
+        self.assertIn('<div class="ai"><a href="l2">Dev 2</a></div>', html)
+        self.assertEqual(self.formatter.last_stats['cached'], 1)
+        self.assertEqual(self.formatter.last_stats['generated'], 1)
+
+    def test_fully_cached_digest_skips_groq(self):
+        jobs = pd.DataFrame([job('Dev 1', 'l1')])
+        with patch.object(AIFormatter, '_call_groq', side_effect=ai_answer):
+            first = self.formatter.format_jobs(jobs)
+
+        # Nouveau processus : le cache est relu depuis le disque
+        formatter = AIFormatter(self.cache_path)
+        with patch.object(AIFormatter, '_call_groq') as mock_call:
+            self.assertEqual(formatter.format_jobs(jobs), first)
+            mock_call.assert_not_called()
+        self.assertEqual(formatter.fragment_cache.stats()['hit_rate'], 1.0)
+
+    def test_shell_is_deterministic(self):
+        jobs = [job('Dev 1', 'l1', 'Cholet'), job('Dev 2', 'l2', 'Angers'), job('Dev 3', 'l3', 'Cholet')]
+        with patch.object(AIFormatter, '_call_groq', side_effect=ai_answer):
+            html = self.formatter.format_jobs(pd.DataFrame(jobs))
+
+        basic = self.formatter._basic_format(jobs)
+        self.assertTrue(html.startswith(basic.split('📍 Cholet')[0]))
+        self.assertLess(html.index('l3'), html.index('Angers'))
+
+    def test_groq_failure_uses_basic_cards_and_caches_nothing(self):
+        jobs = pd.DataFrame([job('Dev 1', 'l1')])
+        with patch.object(AIFormatter, '_call_groq', side_effect=Exception('timeout')):
+            html = self.formatter.format_jobs(jobs)
+
+        self.assertEqual(html, self.formatter._basic_format(jobs.to_dict('records')))
+        self.assertEqual(len(self.formatter.fragment_cache), 0)
+
+    def test_card_without_the_job_link_is_rejected(self):
+        answer = json.dumps({'fragments': {'0': '<div>Made up link</div>'}})
+        with patch.object(AIFormatter, '_call_groq', return_value=answer):
+            html = self.formatter.format_jobs(pd.DataFrame([job('Dev 1', 'l1')]))
+
+        self.assertIn('🔗 Apply Here', html)
+        self.assertEqual(self.formatter.last_stats['basic'], 1)
+
+
+class TestParseFragments(unittest.TestCase):
+
+    def test_link_with_escaped_ampersand_is_accepted(self):
+        formatter = AIFormatter(os.path.join(tempfile.gettempdir(), 'unused_ai_fragments.json'))
+        link = 'https://www.bodet.com/offre?id=1&lang=fr'
+        content = json.dumps({'fragments': {
+            '0': '<div><a href="https://www.bodet.com/offre?id=1&amp;lang=fr">Dev</a></div>',
+            '1': '<div><a href="https://autre">Dev</a></div>',
+        }})
+        cards = formatter._parse_fragments(content, [job('Dev', link), job('Dev', link)])
+        self.assertIsNotNone(cards[0])
+        self.assertIsNone(cards[1])
+
+
+class TestAIFormatterDeadline(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.formatter = AIFormatter(os.path.join(self.tmp_dir.name, 'ai_fragments.json'))
+        self.formatter.format_deadline = 0.05
+        self.release = threading.Event()
+
+    def tearDown(self):
+        self.release.set()
+        self.formatter._chunk_executor.shutdown(wait=True)
+        self.tmp_dir.cleanup()
+
+    def test_slow_groq_loses_to_basic_format(self):
+        def slow_answer(*args, **kwargs):
+            self.release.wait(5)
+            return ai_answer(*args, **kwargs)
+
+        jobs = pd.DataFrame([job('Dev 1', 'l1')])
+        with patch.object(AIFormatter, '_call_groq', side_effect=slow_answer):
+            html = self.formatter.format_jobs(jobs)
+            self.assertEqual(html, self.formatter._basic_format(jobs.to_dict('records')))
+            self.assertEqual(self.formatter.last_stats['winner'], 'basic')
+
+            # La réponse tardive est mise en cache pour le run suivant
+            self.release.set()
+            self.formatter._chunk_executor.shutdown(wait=True)
+        self.assertEqual(len(self.formatter.fragment_cache), 1)
+
+    def test_fast_groq_wins(self):
+        with patch.object(AIFormatter, '_call_groq', side_effect=ai_answer):
+            self.formatter.format_deadline = 5
+            self.formatter.format_jobs(pd.DataFrame([job('Dev 1', 'l1')]))
+        self.assertEqual(self.formatter.last_stats['winner'], 'ai')
+
+
+def sse(content):
+    return 'data: ' + json.dumps({'choices': [{'delta': {'content': content}}]})
+
+
+class TestGroqStreaming(unittest.TestCase):
+
+    def test_stream_stops_once_json_is_complete(self):
+        lines = [sse('{"fragments": {"0": "<div>'), sse('a } b</div>"}'), sse('}'), sse(' trailing'), 'data: [DONE]']
+        consumed = []
+
+        def iter_lines(decode_unicode=True):
+            for line in lines:
+                consumed.append(line)
+                yield line
+
+        response = MagicMock(status_code=200)
+        response.iter_lines.side_effect = iter_lines
+        formatter = AIFormatter(os.path.join(tempfile.gettempdir(), 'unused_ai_fragments.json'))
+        with patch.object(formatter.http, 'post', return_value=response) as mock_post:
+            content = formatter._call_groq('system', 'user')
+
+        self.assertEqual(json.loads(content), {'fragments': {'0': '<div>a } b</div>'}})
+        self.assertEqual(len(consumed), 3)
+        self.assertTrue(mock_post.call_args.kwargs['stream'])
+        response.close.assert_called_once()
+
+    def test_json_end_scanner_ignores_braces_in_strings(self):
+        scanner = JsonEndScanner()
+        self.assertFalse(scanner.feed('```json\n{"a": "}\\"{"'))
+        self.assertTrue(scanner.feed('}'))
+
+
+class TestAIFormatterChunks(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.jobs = [
+            job(f'Développeur {i}', f'https://www.bodet.com/offre/{i}', location)
+            for location in ('Cholet', 'Angers', 'Trémentines')
+            for i in range(len(location) * 3)
+        ]
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def make_formatter(self, url, concurrency=2):
+        env = {'GROQ_API_URL': url, 'AI_MAX_CONCURRENCY': str(concurrency), 'AI_RATE_LIMIT': '0',
+               'AI_CHUNK_TOKENS': '2000'}
+        with patch.dict(os.environ, env):
+            return AIFormatter(os.path.join(self.tmp_dir.name, 'ai_fragments.json'))
+
+    def test_chunks_respect_budget_and_keep_locations_together(self):
+        formatter = self.make_formatter('http://127.0.0.1:9')
+        chunks = formatter._chunk_jobs(self.jobs)
+
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(sorted(i for chunk in chunks for i in chunk), list(range(len(self.jobs))))
+        for chunk in chunks:
+            tokens = sum(formatter._estimate_tokens(self.jobs[i]) for i in chunk)
+            self.assertLessEqual(tokens, formatter.chunk_tokens)
+        # Les 18 offres de Cholet tiennent dans un seul lot
+        self.assertEqual({self.jobs[i]['location'] for i in chunks[0]}, {'Cholet'})
+
+    def test_large_batch_against_fake_groq(self):
+        with FakeGroqServer(delay=0.2) as server:
+            formatter = self.make_formatter(server.url, concurrency=2)
+            html = formatter.format_jobs(pd.DataFrame(self.jobs))
+
+        chunks = formatter._chunk_jobs(self.jobs)
+        self.assertEqual(server.requests, len(chunks))
+        self.assertEqual(server.max_in_flight, 2)
+        self.assertEqual(formatter.last_stats['winner'], 'ai')
+        self.assertEqual(formatter.last_stats['generated'], len(self.jobs))
+        self.assertEqual(html.count('🔗 Postuler'), len(self.jobs))
+        # Un seul email, sections dans l'ordre de _basic_format
+        self.assertEqual(html.count('<html>'), 1)
+        self.assertLess(html.index('📍 Cholet</h2>'), html.index('📍 Angers</h2>'))
+        self.assertLess(html.index('📍 Angers</h2>'), html.index('📍 Trémentines</h2>'))
+
+    def test_deadline_keeps_finished_chunks(self):
+        formatter = self.make_formatter('http://127.0.0.1:9', concurrency=1)
+        formatter.format_deadline = 1
+        release = threading.Event()
+        calls = []
+
+        def gated(system_message, user_prompt):
+            # Le premier lot répond tout de suite, les autres seulement après l'échéance
+            calls.append(user_prompt)
+            if len(calls) > 1:
+                release.wait(5)
+            return ai_answer(system_message, user_prompt)
+
+        try:
+            with patch.object(AIFormatter, '_call_groq', side_effect=gated):
+                html = formatter.format_jobs(pd.DataFrame(self.jobs))
+
+                stats = formatter.last_stats
+                self.assertEqual(stats['winner'], 'partial')
+                self.assertGreater(stats['generated'], 0)
+                self.assertGreater(stats['basic'], 0)
+                self.assertEqual(html.count('class="ai"'), stats['generated'])
+
+                # Les lots en retard sont mis en cache pour le run suivant
+                release.set()
+                formatter._chunk_executor.shutdown(wait=True)
+        finally:
+            release.set()
+        self.assertEqual(len(formatter.fragment_cache), len(self.jobs))
+
+    def test_failed_chunk_falls_back_to_basic_cards(self):
+        formatter = self.make_formatter('http://127.0.0.1:9')
+        calls = []
+
+        def flaky(system_message, user_prompt):
+            calls.append(user_prompt)
+            if len(calls) == 1:
+                raise Exception('429 Too Many Requests')
+            return ai_answer(system_message, user_prompt)
+
+        with patch.object(AIFormatter, '_call_groq', side_effect=flaky):
+            formatter._chunk_executor = ThreadPoolExecutor(max_workers=1)
+            formatter.format_jobs(pd.DataFrame(self.jobs))
+
+        self.assertEqual(formatter.last_stats['winner'], 'ai')
+        self.assertGreater(formatter.last_stats['basic'], 0)
+        self.assertGreater(formatter.last_stats['generated'], 0)
+
+
+class TestRateLimiter(unittest.TestCase):
+
+    def test_calls_are_spaced(self):
+        now = [0.0]
+        waits = []
+        limiter = RateLimiter(30, clock=lambda: now[0], sleep=waits.append)
+        for _ in range(3):
+            limiter.acquire()
+        self.assertEqual(waits, [2.0, 4.0])
+
+    def test_disabled(self):
+        self.assertEqual(RateLimiter(0).acquire(), 0.0)
+
+
+class TestFragmentCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, 'cache.json')
+        self.now = 1000.0
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_lru_eviction(self):
+        cache = FragmentCache(self.path, max_entries=2, clock=lambda: self.now)
+        cache.put('a', '<div>a</div>')
+        cache.put('b', '<div>b</div>')
+        cache.get('a')
+        cache.put('c', '<div>c</div>')
+
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), '<div>a</div>')
+        self.assertEqual(cache.get('c'), '<div>c</div>')
+
+    def test_ttl_expiry(self):
+        cache = FragmentCache(self.path, ttl=60, clock=lambda: self.now)
+        cache.put('a', '<div>a</div>')
+        self.now += 61
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.stats()['misses'], 1)
+
+    def test_save_and_reload_keeps_lru_order(self):
+        cache = FragmentCache(self.path, max_entries=2, clock=lambda: self.now)
+        cache.put('a', '<div>a</div>')
+        cache.put('b', '<div>b</div>')
+        cache.get('a')
+        cache.save()
+
+        reloaded = FragmentCache(self.path, max_entries=2, clock=lambda: self.now)
+        reloaded.put('c', '<div>c</div>')
+        self.assertIsNone(reloaded.get('b'))
+        self.assertEqual(reloaded.get('a'), '<div>a</div>')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import patch
+
+from benchmarks.bench_suite import run_suite
+from benchmarks.kelio_pages import make_page, write_history
+from src.core.data_handler import DataHandler
+from src.core.scraper import JobScraper
+
+
+class TestBenchmarkData(unittest.TestCase):
+
+    def test_generated_page_matches_parse_jobs(self):
+        jobs = JobScraper(sources=[]).parse_jobs(make_page(40))
+        self.assertGreater(len(jobs), 0)
+        self.assertTrue(all(job.link.startswith('https://www.bodet.com/fr/nos-offres-d-emploi/') for job in jobs))
+
+    def test_generated_history_loads(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'jobs.csv')
+            write_history(path, 25)
+            records = DataHandler(path, backend='csv').load_records()
+            self.assertEqual(len(records), 25)
+            self.assertGreaterEqual(records[0]['date'], records[-1]['date'])
+
+
+class TestBenchmarkSuite(unittest.TestCase):
+
+    @patch.dict(os.environ, {})
+    def test_suite_times_every_path(self):
+        from src import app as app_module
+        handler = app_module.data_handler
+        with tempfile.TemporaryDirectory() as tmp_dir, redirect_stdout(io.StringIO()):
+            results = run_suite([20], 1, tmp_dir)
+
+        names = [r['name'] for r in results]
+        self.assertEqual(names, ['parse_jobs', 'save_data', 'load_data', 'search', 'basic_format', 'index_cold', 'index_warm'])
+        self.assertTrue(all(r['size'] == 20 and r['best'] > 0 for r in results))
+        self.assertIs(app_module.data_handler, handler)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+
+from src.core.browser_pool import BrowserPool
+from src.core.metrics import LatencyCounter
+
+
+def wait_until(predicate, timeout=1.0):
+    """Poll `predicate` until true: idle browsers are quit by the reaper thread."""
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+class TestBrowserPool(unittest.TestCase):
+
+    def setUp(self):
+        self.created = []
+
+        def factory():
+            driver = MagicMock()
+            self.created.append(driver)
+            return driver
+
+        self.pool = BrowserPool(max_size=2, idle_timeout=60, driver_factory=factory)
+
+    def test_driver_is_reused(self):
+        with self.pool.driver() as first:
+            pass
+        with self.pool.driver() as second:
+            pass
+        self.assertIs(first, second)
+        self.assertEqual(len(self.created), 1)
+
+    def test_size_limit(self):
+        self.pool.acquire()
+        self.pool.acquire()
+        with self.assertRaises(TimeoutError):
+            self.pool.acquire(timeout=0.05)
+
+    def test_unhealthy_driver_is_replaced(self):
+        with self.pool.driver() as first:
+            pass
+        first.execute_script.side_effect = Exception('session deleted')
+        with self.pool.driver() as second:
+            pass
+        self.assertIsNot(first, second)
+        first.quit.assert_called_once()
+        self.assertEqual(self.pool.size, 1)
+
+    def test_idle_driver_is_closed(self):
+        self.pool.idle_timeout = 0
+        with self.pool.driver() as first:
+            pass
+        with self.pool.driver() as second:
+            pass
+        self.assertIsNot(first, second)
+        self.assertTrue(wait_until(lambda: first.quit.called))
+        first.quit.assert_called_once()
+
+    def test_idle_driver_is_reaped_without_acquire(self):
+        self.pool.idle_timeout = 0.05
+        with self.pool.driver() as first:
+            pass
+        self.assertTrue(wait_until(lambda: first.quit.called))
+        first.quit.assert_called_once()
+        self.assertEqual(self.pool.size, 0)
+
+    def test_slow_quit_does_not_block_acquire(self):
+        started, finish = threading.Event(), threading.Event()
+        with self.pool.driver() as first:
+            pass
+        first.execute_script.side_effect = Exception('session deleted')
+        first.quit.side_effect = lambda: (started.set(), finish.wait(5))
+        thread = threading.Thread(target=self.pool.acquire)
+        thread.start()
+        self.assertTrue(started.wait(1))
+        # Le premier navigateur s'arrête encore : le second emplacement reste disponible
+        second = self.pool.acquire(timeout=1)
+        finish.set()
+        thread.join()
+        self.assertIsNot(first, second)
+
+    def test_failed_start_frees_slot(self):
+        self.pool.driver_factory = MagicMock(side_effect=Exception('chrome missing'))
+        for _ in range(3):
+            with self.assertRaises(Exception):
+                self.pool.acquire()
+        self.assertEqual(self.pool.size, 0)
+
+
+class TestLatencyCounter(unittest.TestCase):
+
+    def test_percentiles(self):
+        counter = LatencyCounter('test')
+        for value in [5.0, 1.0, 2.0, 3.0, 4.0]:
+            counter.observe(value)
+        self.assertEqual(counter.percentile(50), 3.0)
+        self.assertEqual(counter.percentile(95), 5.0)
+        self.assertEqual(counter.snapshot()['count'], 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import os
+import threading
+import unittest
+from time import sleep
+from unittest.mock import patch
+
+from src.core.fetcher import FetchEngine, get_sources
+
+
+class TestFetchEngine(unittest.TestCase):
+
+    def test_results_keep_input_order(self):
+        urls = [f"http://host{i}.test/page" for i in range(5)]
+        results = FetchEngine(lambda url: f"<html>{url}</html>").fetch_all(urls)
+        self.assertEqual([r['url'] for r in results], urls)
+        self.assertEqual(results[3]['html'], f"<html>{urls[3]}</html>")
+
+    def test_errors_are_captured_per_source(self):
+        def fetch(url):
+            if 'bad' in url:
+                raise Exception('boom')
+            return 'ok'
+
+        results = FetchEngine(fetch).fetch_all(['http://good.test', 'http://bad.test'])
+        self.assertEqual(results[0]['html'], 'ok')
+        self.assertIsNone(results[1]['html'])
+        self.assertEqual(str(results[1]['error']), 'boom')
+
+    def test_per_host_and_global_limits(self):
+        lock = threading.Lock()
+        active = {'total': 0, 'max_total': 0, 'same.test': 0, 'max_same': 0}
+
+        def fetch(url):
+            same = 'same.test' in url
+            with lock:
+                active['total'] += 1
+                active['max_total'] = max(active['max_total'], active['total'])
+                if same:
+                    active['same.test'] += 1
+                    active['max_same'] = max(active['max_same'], active['same.test'])
+            sleep(0.05)
+            with lock:
+                active['total'] -= 1
+                if same:
+                    active['same.test'] -= 1
+            return 'ok'
+
+        urls = [f"http://same.test/{i}" for i in range(6)] + [f"http://other{i}.test/" for i in range(6)]
+        FetchEngine(fetch, max_concurrency=4, per_host_limit=2).fetch_all(urls)
+        self.assertLessEqual(active['max_same'], 2)
+        self.assertLessEqual(active['max_total'], 4)
+
+    @patch.dict(os.environ, {'SCRAPER_URL': 'http://single.test', 'SCRAPER_URLS': ''})
+    def test_get_sources_defaults_to_single_url(self):
+        self.assertEqual(get_sources(), ['http://single.test'])
+
+    @patch.dict(os.environ, {'SCRAPER_URLS': 'http://a.test, http://b.test\nhttp://c.test'})
+    def test_get_sources_from_list(self):
+        self.assertEqual(get_sources(), ['http://a.test', 'http://b.test', 'http://c.test'])
+
+
+if __name__ == '__main__':
+    unittest.main()
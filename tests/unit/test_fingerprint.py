@@ -0,0 +1,187 @@
+import fcntl
+import os
+import sqlite3
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+
+from src.core.data_handler import DataHandler
+from src.core.fingerprint import FingerprintIndex, job_fingerprint, normalize_url
+from src.core.sqlite_store import SQLiteStore
+
+
+def job(title, link, location='Cholet'):
+    return {'title': title, 'link': link, 'company': 'Kelio', 'location': location, 'date': '2025-03-08 20:28'}
+
+
+class TestJobFingerprint(unittest.TestCase):
+
+    def test_normalize_url(self):
+        self.assertEqual(
+            normalize_url('HTTPS://www.Bodet.com:443/offre/12/?utm_source=x&b=2&a=1#top'),
+            'https://www.bodet.com/offre/12?a=1&b=2'
+        )
+
+    def test_equivalent_jobs_share_fingerprint(self):
+        self.assertEqual(
+            job_fingerprint(job('Développeur  Python', 'https://www.bodet.com/offre/12/')),
+            job_fingerprint(job('developpeur python', 'https://www.bodet.com/offre/12', 'CHOLET'))
+        )
+
+    def test_same_title_other_location_is_distinct(self):
+        self.assertNotEqual(
+            job_fingerprint(job('Développeur', 'https://www.bodet.com/offre/12', 'Cholet')),
+            job_fingerprint(job('Développeur', 'https://www.bodet.com/offre/12', 'Angers'))
+        )
+
+    def test_fingerprint_is_compact(self):
+        self.assertEqual(len(job_fingerprint(job('Dev', 'l1'))), 16)
+
+
+class TestFingerprintIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, 'jobs.fingerprints')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_add_appends_only_new_keys(self):
+        index = FingerprintIndex(self.path)
+        self.assertEqual(index.add(['a' * 16, 'b' * 16]), ['a' * 16, 'b' * 16])
+        self.assertEqual(index.add(['b' * 16, 'c' * 16]), ['c' * 16])
+
+        with open(self.path) as f:
+            self.assertEqual(f.read().split(), ['a' * 16, 'b' * 16, 'c' * 16])
+        self.assertIn('c' * 16, FingerprintIndex(self.path))
+
+    def test_rebuild_when_file_is_missing(self):
+        index = FingerprintIndex(self.path, rebuild=lambda: ['a' * 16])
+        self.assertEqual(len(index), 1)
+        self.assertTrue(os.path.exists(self.path))
+
+    def test_refresh_reads_keys_added_by_another_process(self):
+        index = FingerprintIndex(self.path)
+        self.assertNotIn('a' * 16, index)
+        FingerprintIndex(self.path).add(['a' * 16])
+        index.refresh()
+        self.assertIn('a' * 16, index)
+
+    def test_add_keeps_keys_appended_by_another_process_meanwhile(self):
+        index = FingerprintIndex(self.path)
+        index.add(['a' * 16])
+        sync = index._sync
+
+        def sync_then_other_process_appends():
+            keys = sync()
+            # Un autre processus ajoute une clé entre la relecture et notre ajout
+            FingerprintIndex(self.path).add(['b' * 16])
+            return keys
+
+        with patch.object(index, '_sync', side_effect=sync_then_other_process_appends):
+            index.add(['c' * 16])
+        index.refresh()
+        self.assertIn('b' * 16, index)
+        self.assertEqual(len(index), 3)
+
+    def test_refresh_forgets_keys_cleared_by_another_process(self):
+        stored = ['a' * 16]
+        index = FingerprintIndex(self.path, rebuild=lambda: list(stored))
+        self.assertIn('a' * 16, index)
+
+        # /clear-jobs dans le processus web : données et index supprimés
+        stored.clear()
+        FingerprintIndex(self.path).clear()
+        index.refresh()
+        self.assertNotIn('a' * 16, index)
+
+
+class TestDataHandlerFingerprints(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.csv_path = os.path.join(self.tmp_dir.name, 'jobs.csv')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_unseen_jobs(self):
+        handler = DataHandler(self.csv_path)
+        handler.save_data(pd.DataFrame([job('Dev', 'l1', 'Cholet')]))
+
+        unseen = handler.unseen_jobs(pd.DataFrame([
+            job('Dev', 'l1', 'Cholet'), job('Dev', 'l1', 'Angers'), job('Dev', 'l1', 'Angers')
+        ]))
+        self.assertEqual([j.location for j in unseen], ['Angers'])
+
+    def test_save_appends_only_new_rows(self):
+        handler = DataHandler(self.csv_path)
+        handler.save_data(pd.DataFrame([job('Dev 1', 'l1')]))
+        handler.save_data(pd.DataFrame([job('Dev 1', 'l1'), job('Dev 2', 'l2')]))
+
+        self.assertEqual(handler.load_data()['title'].tolist(), ['Dev 1', 'Dev 2'])
+        self.assertEqual(len(handler.fingerprints), 2)
+
+    def test_incomplete_last_row_is_ignored(self):
+        handler = DataHandler(self.csv_path)
+        handler.save_data(pd.DataFrame([job('Dev 1', 'l1')]))
+        # Ajout interrompu au milieu d'une ligne
+        with open(self.csv_path, 'a') as f:
+            f.write('Dev 2,l2,Kel')
+
+        self.assertEqual([j.title for j in handler.load_jobs()], ['Dev 1'])
+
+    def test_reader_waits_for_the_append_lock(self):
+        handler = DataHandler(self.csv_path)
+        handler.save_data(pd.DataFrame([job('Dev 1', 'l1')]))
+        titles = []
+
+        with open(self.csv_path, 'a') as f:
+            # Ajout en cours dans un autre processus
+            fcntl.flock(f, fcntl.LOCK_EX)
+            f.write('Dev 2,l2,Kel')
+            f.flush()
+            reader = threading.Thread(target=lambda: titles.extend(j.title for j in handler.load_jobs()))
+            reader.start()
+            reader.join(0.2)
+            self.assertTrue(reader.is_alive())
+            f.write('io,Cholet,2025-03-08 20:28\n')
+        reader.join(5)
+
+        self.assertEqual(titles, ['Dev 1', 'Dev 2'])
+
+    def test_index_is_rebuilt_from_existing_csv(self):
+        pd.DataFrame([job('Dev 1', 'l1')]).to_csv(self.csv_path, index=False)
+        handler = DataHandler(self.csv_path)
+        self.assertEqual(handler.unseen_jobs(pd.DataFrame([job('Dev 1', 'l1')])), [])
+
+    def test_clear_resets_index(self):
+        handler = DataHandler(self.csv_path)
+        handler.save_data(pd.DataFrame([job('Dev 1', 'l1')]))
+        handler.clear_data()
+        self.assertEqual(len(handler.unseen_jobs(pd.DataFrame([job('Dev 1', 'l1')]))), 1)
+
+    def test_sqlite_rows_are_migrated_to_new_fingerprints(self):
+        db_path = os.path.join(self.tmp_dir.name, 'jobs.db')
+        conn = sqlite3.connect(db_path)
+        conn.executescript("""
+            CREATE TABLE jobs (id INTEGER PRIMARY KEY, fingerprint TEXT NOT NULL, title TEXT,
+                               link TEXT, company TEXT, location TEXT, date TEXT);
+            CREATE UNIQUE INDEX idx_jobs_fingerprint ON jobs (fingerprint);
+            INSERT INTO jobs VALUES (1, 'old1', 'Dev', 'https://x/1', 'Kelio', 'Cholet', '2025-03-08');
+            INSERT INTO jobs VALUES (2, 'old2', 'Dev', 'https://x/1/', 'Kelio', 'Cholet', '2025-03-08');
+        """)
+        conn.close()
+
+        store = SQLiteStore(db_path)
+        self.assertEqual(store.count(), 1)
+        self.assertEqual(list(store.fingerprints()), [job_fingerprint(job('Dev', 'https://x/1'))])
+        self.assertEqual(store.insert_jobs([job('Dev', 'https://x/1')]), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
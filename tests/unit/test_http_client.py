@@ -0,0 +1,111 @@
+import os
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch, MagicMock
+
+from src.core.http_client import HttpClient
+from src.core.notifier import Notifier
+
+
+class TestHttpClient(unittest.TestCase):
+
+    def setUp(self):
+        self.client = HttpClient()
+
+    def tearDown(self):
+        self.client.close()
+
+    def test_session_is_reused_per_service(self):
+        self.assertIs(self.client.session('groq'), self.client.session('groq'))
+        self.assertIsNot(self.client.session('groq'), self.client.session('resend'))
+
+    def test_default_timeout_is_applied(self):
+        with patch.object(self.client.session('resend'), 'request') as mock_request:
+            self.client.post('resend', 'http://resend.test/emails', json={})
+        mock_request.assert_called_once_with('POST', 'http://resend.test/emails', json={}, timeout=(5, 10))
+
+    @patch.dict(os.environ, {'HTTP_TIMEOUT_GROQ': '3', 'HTTP_RETRIES_GROQ': '0'})
+    def test_policy_env_overrides(self):
+        policy = self.client.policy('groq')
+        self.assertEqual(policy['timeout'], (5, 3.0))
+        self.assertEqual(policy['retries'], 0)
+
+    def test_connections_are_kept_alive(self):
+        peers = []
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                peers.append(self.client_address)
+                self.send_response(200)
+                self.send_header('Content-Length', '2')
+                self.end_headers()
+                self.wfile.write(b'ok')
+
+            def log_message(self, *args):
+                pass
+
+        httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=httpd.serve_forever, daemon=True).start()
+        try:
+            url = f"http://127.0.0.1:{httpd.server_address[1]}/"
+            for _ in range(3):
+                self.assertEqual(self.client.get('scraper', url).text, 'ok')
+        finally:
+            httpd.shutdown()
+            httpd.server_close()
+        self.assertEqual(len(set(peers)), 1)
+
+    def test_resend_post_is_not_replayed(self):
+        calls = []
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_POST(self):
+                calls.append(self.path)
+                self.rfile.read(int(self.headers['Content-Length']))
+                self.send_response(502)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=httpd.serve_forever, daemon=True).start()
+        try:
+            url = f"http://127.0.0.1:{httpd.server_address[1]}/emails"
+            # 502 après réception possible : un seul envoi, la boîte d'envoi réessaiera
+            self.assertEqual(self.client.post('resend', url, json={}).status_code, 502)
+        finally:
+            httpd.shutdown()
+            httpd.server_close()
+        self.assertEqual(len(calls), 1)
+
+
+class TestNotifierHttp(unittest.TestCase):
+
+    @patch.dict(os.environ, {'SEND_EMAIL': 'true', 'RESEND_API_KEY': 'key', 'EMAIL_RECEIVER': 'to@example.com'})
+    def test_send_email_posts_through_shared_client(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            notifier = Notifier(os.path.join(tmp_dir, 'outbox.db'))
+            notifier.http = MagicMock()
+            notifier.http.post.return_value = MagicMock(status_code=200, text='{"id": "1"}')
+
+            notifier.send_email("Subject", "<p>Body</p>")
+            # L'envoi passe par la boîte d'envoi : le vider pour déclencher l'appel
+            notifier.outbox_sender.stop()
+            notifier.flush()
+
+        args, kwargs = notifier.http.post.call_args
+        self.assertEqual(args, ('resend', 'https://api.resend.com/emails'))
+        self.assertEqual(kwargs['json']['to'], 'to@example.com')
+        self.assertEqual(kwargs['headers']['Authorization'], 'Bearer key')
+
+
+if __name__ == '__main__':
+    unittest.main()
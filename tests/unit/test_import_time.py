@@ -0,0 +1,69 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Modules du scraping qui ne doivent pas être chargés au démarrage du processus web
+HEAVY_MODULES = {'pandas', 'numpy', 'selenium', 'bs4', 'tenacity', 'requests', 'src.core.scraper', 'src.core.ai_formatter'}
+
+# Budgets larges (machines de CI lentes), surchargeables par variables d'environnement
+IMPORT_TIME_BUDGET_MS = float(os.getenv('IMPORT_TIME_BUDGET_MS', 500))
+IMPORT_RSS_BUDGET_MB = float(os.getenv('IMPORT_RSS_BUDGET_MB', 80))
+
+
+def import_app(tmp_dir):
+    """Import the web app in a fresh interpreter with `-X importtime`.
+
+    Returns ({module: cumulative microseconds}, peak RSS in MB).
+    """
+    env = dict(os.environ, JOBS_CSV_PATH=os.path.join(tmp_dir, 'jobs.csv'), PYTHONDONTWRITEBYTECODE='1')
+    env.pop('STORAGE_BACKEND', None)
+    # VmHWM (pic de mémoire du processus) est remis à zéro par exec, contrairement à ru_maxrss
+    code = (
+        "import src.app\n"
+        "try:\n"
+        "    print(next(l.split()[1] for l in open('/proc/self/status') if l.startswith('VmHWM')))\n"
+        "except OSError:\n"
+        "    print(-1)\n"
+    )
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        modules[name.strip()] = int(cumulative)
+    rss_kb = int(result.stdout.split()[-1])
+    return modules, rss_kb / 1024 if rss_kb >= 0 else None
+
+
+class TestWebImportBudget(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cls.modules, cls.rss_mb = import_app(tmp_dir)
+
+    def test_scraping_stack_is_not_imported(self):
+        self.assertIn('src.app', self.modules)
+        self.assertEqual(sorted(HEAVY_MODULES & set(self.modules)), [])
+
+    # Mesure de temps sensible à la charge de la machine : hors de la suite par défaut
+    @unittest.skipUnless(os.getenv('RUN_BENCHMARKS'), 'RUN_BENCHMARKS not set')
+    def test_import_time_budget(self):
+        self.assertLess(self.modules['src.app'] / 1000, IMPORT_TIME_BUDGET_MS)
+
+    def test_memory_budget(self):
+        if self.rss_mb is None:
+            self.skipTest('/proc not available')
+        self.assertLess(self.rss_mb, IMPORT_RSS_BUDGET_MB)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime
+
+import pandas as pd
+
+from src.core.data_handler import DataHandler
+from src.core.fingerprint import job_fingerprint
+from src.core.job import Job, jobs_from_rows, jobs_to_dataframe, to_jobs
+
+
+def job(title, link, location='Cholet', date='2025-03-08 20:28'):
+    return {'title': title, 'link': link, 'company': 'Kelio', 'location': location, 'date': date}
+
+
+class TestJob(unittest.TestCase):
+
+    def test_typed_date_and_stored_values(self):
+        record = Job.from_record(job('Dev', 'l1'))
+        self.assertEqual(record.date, datetime(2025, 3, 8, 20, 28))
+        self.assertEqual(record['date'], '2025-03-08 20:28')
+        self.assertEqual(record.to_dict(), job('Dev', 'l1'))
+        self.assertEqual(record.fingerprint, job_fingerprint(job('Dev', 'l1')))
+        with self.assertRaises(AttributeError):
+            record.extra = 1
+
+    def test_empty_cells_become_none(self):
+        jobs = to_jobs(pd.DataFrame([{'title': 'Dev', 'link': 'l1'}, job('Dev 2', 'l2', date='pas une date')]))
+        self.assertIsNone(jobs[0].company)
+        self.assertIsNone(jobs[0].date)
+        self.assertIsNone(jobs[1].date)
+
+    def test_rows_of_one_run_share_objects(self):
+        jobs = jobs_from_rows([
+            ('Dev 1', 'l1', 'Kelio', 'Cholet', '2025-03-08 20:28'),
+            ('Dev 2', 'l2', 'Kelio', 'Cholet', '2025-03-08 20:28'),
+        ])
+        self.assertIs(jobs[0].date, jobs[1].date)
+        self.assertIs(jobs[0].location, jobs[1].location)
+
+    def test_dataframe_export(self):
+        df = jobs_to_dataframe(to_jobs([job('Dev 1', 'l1'), job('Dev 2', 'l2', date=None)]))
+        self.assertEqual(list(df.columns), ['title', 'link', 'company', 'location', 'date'])
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(df['date']))
+        self.assertTrue(pd.isna(df['date'][1]))
+
+
+class TestDataHandlerJobs(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.csv_path = os.path.join(self.tmp_dir.name, 'jobs.csv')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_round_trip(self):
+        for backend in ('csv', 'sqlite'):
+            with self.subTest(backend=backend):
+                handler = DataHandler(os.path.join(self.tmp_dir.name, backend, 'jobs.csv'), backend=backend)
+                jobs = to_jobs([job('Dev 1', 'l1'), job('Dév, "2"', 'l2', 'Angers', '2025-03-09 08:00')])
+                handler.save_data(jobs)
+                self.assertEqual(handler.load_jobs(), jobs)
+                self.assertEqual([j.title for j in handler.load_records()], ['Dév, "2"', 'Dev 1'])
+
+    def test_old_column_layout_is_rewritten(self):
+        pd.DataFrame([{'link': 'l1', 'title': 'Dev 1'}]).to_csv(self.csv_path, index=False)
+        handler = DataHandler(self.csv_path)
+        handler.save_data([job('Dev 2', 'l2')])
+
+        with open(self.csv_path, encoding='utf-8') as f:
+            self.assertEqual(f.readline().strip(), 'title,link,company,location,date')
+        self.assertEqual([j.title for j in handler.load_jobs()], ['Dev 1', 'Dev 2'])
+
+
+class TestMemoryBenchmark(unittest.TestCase):
+
+    def test_jobs_are_smaller_than_dict_records(self):
+        from benchmarks.bench_memory import measure_size, write_runs_history
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'jobs.csv')
+            write_runs_history(path, 2000, jobs_per_run=10)
+            sizes = measure_size(path, 2000)
+        self.assertLess(sizes['jobs'], sizes['dict records'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+
+from src.core.data_handler import DataHandler
+from src.core.job_query import JobIndex
+
+
+def make_records(count):
+    return [
+        {'title': f"Développeur {i:03d}", 'link': f"https://example.com/{i}", 'company': 'Kelio',
+         'location': 'Cholet' if i % 2 else 'Angers', 'date': f"2025-01-{i % 28 + 1:02d} 10:00"}
+        for i in range(count)
+    ]
+
+
+class TestJobIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = JobIndex(make_records(50), 'v1')
+
+    def collect(self, index, **kwargs):
+        items, cursor = [], None
+        while True:
+            page, cursor, total = index.query(cursor=cursor, limit=7, **kwargs)
+            items.extend(page)
+            if not cursor:
+                return items, total
+
+    def test_pages_cover_everything_once(self):
+        items, total = self.collect(self.index, sort='title-asc')
+        self.assertEqual(total, 50)
+        self.assertEqual([j['title'] for j in items], sorted(r['title'] for r in make_records(50)))
+
+    def test_filters(self):
+        items, total = self.collect(self.index, search='developpeur 01', location='Cholet', sort='title-asc')
+        self.assertEqual([j['title'] for j in items], [f"Développeur {i:03d}" for i in (11, 13, 15, 17, 19)])
+        self.assertEqual(total, 5)
+        items, _ = self.collect(self.index, date_from='2025-01-27', date_to='2025-01-28')
+        self.assertTrue(all(j['date'][:10] in ('2025-01-27', '2025-01-28') for j in items))
+
+    def test_date_desc_is_default(self):
+        page, _, _ = self.index.query(limit=3)
+        dates = [j['date'] for j in page]
+        self.assertEqual(dates, sorted(dates, reverse=True))
+
+    def test_cursor_survives_data_change(self):
+        page, cursor, _ = self.index.query(sort='title-asc', limit=10)
+        records = make_records(50) + [{'title': 'Aaa nouveau', 'link': 'new', 'company': 'Kelio',
+                                       'location': 'Cholet', 'date': '2025-02-01 10:00'}]
+        new_index = JobIndex(records, 'v2')
+        next_page, _, _ = new_index.query(sort='title-asc', limit=10, cursor=cursor)
+        self.assertEqual(next_page[0]['title'], 'Développeur 010')
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            self.index.query(cursor='not-a-cursor')
+        with self.assertRaises(ValueError):
+            self.index.query(sort='random')
+
+    def test_nan_is_serialized_as_null(self):
+        index = JobIndex([{'title': 'Dev', 'link': 'l', 'company': float('nan'), 'location': 'Cholet', 'date': 'x'}], 'v')
+        self.assertIsNone(index.query()[0][0]['company'])
+
+
+class TestJobsApi(unittest.TestCase):
+
+    def setUp(self):
+        from src import app as app_module
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        handler = DataHandler(os.path.join(self.tmp_dir.name, 'jobs.csv'))
+        handler.save_data(pd.DataFrame(make_records(40)))
+        self.patcher = patch.object(app_module, 'data_handler', handler)
+        self.patcher.start()
+        self.client = app_module.app.test_client()
+
+    def tearDown(self):
+        self.patcher.stop()
+        self.tmp_dir.cleanup()
+
+    def test_pagination_and_etag(self):
+        response = self.client.get('/api/jobs?limit=25&location=Cholet')
+        data = response.get_json()
+        self.assertEqual(data['total'], 20)
+        self.assertEqual(len(data['items']), 20)
+        self.assertIsNone(data['next_cursor'])
+
+        etag = response.headers['ETag']
+        cached = self.client.get('/api/jobs?limit=25&location=Cholet', headers={'If-None-Match': etag})
+        self.assertEqual(cached.status_code, 304)
+
+    def test_bad_request(self):
+        self.assertEqual(self.client.get('/api/jobs?sort=nope').status_code, 400)
+
+    def test_index_renders_shell(self):
+        response = self.client.get('/')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'<option value="Angers">', response.data)
+        self.assertNotIn(b'job-card-header', response.data)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+
+from benchmarks.fake_groq import FakeGroqServer
+from benchmarks.fake_kelio import FakeKelioServer, growing_listing
+from benchmarks.fake_resend import FakeResendServer
+from benchmarks.load_run import fake_environment, load_run, report
+from src.core.ai_formatter import AIFormatter
+
+
+class TestLoadRun(unittest.TestCase):
+
+    def test_full_pipeline_runs_against_fakes(self):
+        script = growing_listing(rows=20, new_per_step=3, every=2)
+        with tempfile.TemporaryDirectory() as work_dir, \
+                FakeKelioServer(script=script) as kelio, \
+                FakeGroqServer(delay=0.01) as groq, \
+                FakeResendServer() as resend, \
+                patch.dict(os.environ, fake_environment(kelio, groq, resend)):
+            os.environ.pop('SCRAPER_URLS', None)
+            records, wall, flushed = load_run(3, 1, work_dir)
+            result = report(records, wall, flushed, (kelio, groq, resend))
+
+        self.assertEqual(result['runs'], 3)
+        self.assertEqual(result['errors'], 0)
+        # Le deuxième run reçoit un 304 : rien à traiter
+        self.assertEqual(result['kelio'], {'requests': 3, 'not_modified': 1})
+        self.assertEqual(result['skipped'], 1)
+        self.assertEqual(result['format_winners'], {'ai': 2})
+        self.assertTrue(result['outbox_flushed'])
+        self.assertEqual(len(resend.emails), 2)
+        self.assertEqual(resend.emails[0]['to'], 'load@example.com')
+
+    def test_groq_errors_fall_back_to_basic_format(self):
+        with FakeGroqServer(delay=0, error_rate=1.0) as groq:
+            with tempfile.TemporaryDirectory() as tmp_dir, \
+                    patch.dict(os.environ, {'GROQ_API_URL': groq.url, 'GROQ_API_KEY': 'fake', 'AI_RATE_LIMIT': '0'}):
+                formatter = AIFormatter(os.path.join(tmp_dir, 'cache.json'))
+                formatter.format_jobs(pd.DataFrame([{'title': 'Dev', 'link': 'https://x/1', 'company': 'Kelio', 'location': 'Cholet'}]))
+        self.assertEqual(formatter.last_stats['winner'], 'basic')
+        self.assertGreaterEqual(groq.errors, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import os
+import tempfile
+import unittest
+
+from src.core.config import load_config
+from src.core.matcher import AhoCorasick, normalize
+
+
+class TestAhoCorasick(unittest.TestCase):
+
+    def test_overlapping_patterns(self):
+        automaton = AhoCorasick(['he', 'she', 'his', 'hers'])
+        found = sorted(automaton.patterns[i] for i in automaton.search('ushers'))
+        self.assertEqual(found, ['he', 'hers', 'she'])
+
+    def test_contains_any(self):
+        automaton = AhoCorasick(['vue.js', 'php'])
+        self.assertTrue(automaton.contains_any('developpeur vue.js senior'))
+        self.assertFalse(automaton.contains_any('comptable'))
+
+
+class TestNormalize(unittest.TestCase):
+
+    def test_normalize(self):
+        self.assertEqual(normalize('Développeur Trémentines'), 'developpeur trementines')
+
+
+class TestConfig(unittest.TestCase):
+
+    def test_default_config_has_filters(self):
+        filters = load_config()['filters']
+        self.assertIn('développeur', filters['keywords'])
+        self.assertIn('cholet', filters['locations'])
+
+    def test_reload_on_change(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'config.yaml')
+            with open(path, 'w') as f:
+                f.write("filters:\n  keywords: [php]\n")
+            self.assertEqual(load_config(path)['filters']['keywords'], ['php'])
+            with open(path, 'w') as f:
+                f.write("filters:\n  keywords: [php, js]\n")
+            os.utime(path, ns=(0, 10 ** 18))
+            self.assertEqual(load_config(path)['filters']['keywords'], ['php', 'js'])
+
+    def test_missing_file(self):
+        self.assertEqual(load_config('/nonexistent/config.yaml'), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,131 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+
+from src.core.data_handler import DataHandler
+from src.core.metrics import LatencyCounter, RunMetrics, load_last_run, render_prometheus
+from src.core.scraper import JobScraper
+from src.core.source_state import SourceStateStore
+
+
+class TestRunMetrics(unittest.TestCase):
+
+    def test_stages_accumulate(self):
+        metrics = RunMetrics(clock=lambda: 100.0)
+        metrics.begin('fetch')
+        metrics.record('parse', 0.5, nbytes=1000, rows=3)
+        metrics.record('parse', 0.25, nbytes=500, rows=2)
+        metrics.begin('dedupe')
+        metrics.add('dedupe', rows=4)
+        metrics.finish()
+
+        data = metrics.to_dict()
+        self.assertEqual(data['stages']['parse'], {'seconds': 0.75, 'bytes': 1500, 'rows': 5, 'calls': 2})
+        self.assertEqual(data['stages']['dedupe']['rows'], 4)
+        self.assertEqual(data['stages']['fetch']['calls'], 1)
+        self.assertEqual(data['duration'], 0.0)
+
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'last_run.json')
+            metrics = RunMetrics()
+            metrics.record('fetch', 1.0)
+            metrics.finish('boom')
+            metrics.save(path)
+            self.assertEqual(load_last_run(path)['error'], 'boom')
+            self.assertIsNone(load_last_run(os.path.join(tmp_dir, 'missing.json')))
+
+    def test_render_prometheus(self):
+        counter = LatencyCounter('request_index')
+        counter.observe(0.2)
+        text = render_prometheus(
+            {'request_index': counter},
+            {'finished_at': 1700000000.0, 'duration': 2.5, 'error': None,
+             'stages': {'fetch': {'seconds': 1.5, 'bytes': 2048, 'rows': 1}}}
+        )
+        self.assertIn('kelio_latency_seconds{name="request_index",quantile="0.5"} 0.200000', text)
+        self.assertIn('kelio_latency_seconds_count{name="request_index"} 1', text)
+        self.assertIn('kelio_last_run_stage_seconds{stage="fetch"} 1.5', text)
+        self.assertIn('kelio_last_run_stage_bytes{stage="fetch"} 2048', text)
+        self.assertIn('kelio_last_run_success 1', text)
+
+
+class TestScraperRunMetrics(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.scraper = JobScraper(sources=['https://example.com/jobs'])
+        self.scraper.data_handler = DataHandler(os.path.join(self.tmp_dir.name, 'jobs.csv'))
+        self.scraper.source_state = SourceStateStore(os.path.join(self.tmp_dir.name, 'sources_state.json'))
+        self.scraper.last_run_path = os.path.join(self.tmp_dir.name, 'last_run.json')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    @patch('src.core.scraper.AIFormatter.format_jobs', return_value='<html></html>')
+    def test_run_records_each_stage(self, mock_format_jobs):
+        self.scraper.fetch_html = MagicMock(return_value='<table class="contentpane"></table>')
+        self.scraper.parse_jobs = MagicMock(return_value=pd.DataFrame([
+            {'title': 'Dev', 'link': 'l1', 'company': 'Kelio', 'location': 'Cholet', 'date': '2025-03-08 20:28'}
+        ]))
+
+        self.scraper.run()
+
+        last_run = load_last_run(self.scraper.last_run_path)
+        stages = last_run['stages']
+        self.assertEqual(set(stages) >= {'fetch', 'parse', 'dedupe', 'save', 'format'}, True)
+        self.assertEqual(stages['parse']['rows'], 1)
+        self.assertEqual(stages['parse']['bytes'], len('<table class="contentpane"></table>'))
+        self.assertEqual(stages['save']['rows'], 1)
+        self.assertEqual(stages['format']['bytes'], len('<html></html>'))
+        # Une seule mesure par étape : le parsing n'est pas compté dans le fetch
+        self.assertEqual(stages['parse']['calls'], 1)
+        self.assertEqual(stages['fetch']['calls'], 1)
+        self.assertIsNone(last_run['error'])
+
+
+class TestMetricsApi(unittest.TestCase):
+
+    def setUp(self):
+        from src import app as app_module
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        path = os.path.join(self.tmp_dir.name, 'last_run.json')
+        with open(path, 'w') as f:
+            json.dump({'started_at': 1700000000.0, 'finished_at': 1700000003.0, 'duration': 3.0, 'error': None,
+                       'stages': {'fetch': {'seconds': 2.0, 'bytes': 10, 'rows': 1, 'calls': 1}}}, f)
+        handler = DataHandler(os.path.join(self.tmp_dir.name, 'jobs.csv'))
+        self.patchers = [
+            patch.object(app_module, 'last_run_path', path),
+            patch.object(app_module, 'data_handler', handler),
+        ]
+        for patcher in self.patchers:
+            patcher.start()
+        self.client = app_module.app.test_client()
+
+    def tearDown(self):
+        for patcher in self.patchers:
+            patcher.stop()
+        self.tmp_dir.cleanup()
+
+    def test_metrics_route(self):
+        self.client.get('/')
+        response = self.client.get('/metrics')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.content_type.startswith('text/plain'))
+        text = response.get_data(as_text=True)
+        self.assertIn('kelio_latency_seconds_count{name="request_index"}', text)
+        self.assertIn('kelio_last_run_stage_seconds{stage="fetch"} 2.0', text)
+
+    def test_health_reports_last_run(self):
+        last_run = self.client.get('/health').get_json()['last_run']
+        self.assertEqual(last_run['duration'], 3.0)
+        self.assertEqual(last_run['stages'], {'fetch': 2.0})
+        self.assertIsNotNone(last_run['finished_at'])
+
+
+if __name__ == '__main__':
+    unittest.main()
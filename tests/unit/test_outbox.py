@@ -0,0 +1,157 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from src.core.notifier import Notifier
+from src.core.outbox import SCHEMA, Outbox, OutboxSender, coalesce
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestOutbox(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, 'outbox.db')
+        self.clock = FakeClock()
+        self.outbox = Outbox(self.path, backoff_base=10, backoff_max=60, max_attempts=3, clock=self.clock)
+        self.sent = []
+        self.sender = OutboxSender(self.outbox, self.deliver, window=30)
+        self.down = False
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def deliver(self, subject, body, recipient=None):
+        if self.down:
+            raise Exception('Resend call failed with status code 503')
+        self.sent.append((subject, body) if recipient is None else (subject, body, recipient))
+
+    def test_messages_within_window_are_coalesced(self):
+        self.outbox.enqueue('alert', '[Kelio Scraper] Notification', 'Erreur critique: timeout')
+        self.clock.now += 5
+        self.outbox.enqueue('digest', '[Kelio] 2 nouvelle(s) offre(s)', '<html><body><p>Dev</p></body></html>')
+
+        self.assertEqual(self.sender.send_due(), 0)
+        self.clock.now += 30
+        self.assertEqual(self.sender.send_due(), 2)
+
+        (subject, body), = self.sent
+        self.assertEqual(subject, '[Kelio] 2 nouvelle(s) offre(s) (+1 notification(s))')
+        self.assertIn('Erreur critique: timeout', body)
+        self.assertIn('<p>Dev</p>', body)
+        self.assertEqual(body.count('<body'), 1)
+        self.assertEqual(self.outbox.stats()['sent'], 2)
+
+    def test_failed_delivery_is_retried_with_backoff(self):
+        self.outbox.enqueue('alert', 'Subject', 'Body')
+        self.down = True
+        self.assertEqual(self.sender.send_due(force=True), 0)
+
+        stats = self.outbox.stats()
+        self.assertEqual(stats['pending'], 1)
+        self.assertIn('503', stats['last_error'])
+        self.assertEqual(self.outbox.next_due_in(), 10)
+
+        self.clock.now += 10
+        self.assertEqual(self.sender.send_due(force=True), 0)
+        self.assertEqual(self.outbox.next_due_in(), 20)
+
+        # Resend est de retour : rien n'a été perdu
+        self.down = False
+        self.clock.now += 20
+        self.assertEqual(self.sender.send_due(force=True), 1)
+        self.assertEqual(self.sent, [('Subject', 'Body')])
+        self.assertEqual(self.outbox.stats()['pending'], 0)
+
+    def test_gives_up_after_max_attempts(self):
+        self.outbox.enqueue('alert', 'Subject', 'Body')
+        self.down = True
+        for _ in range(3):
+            self.sender.send_due(force=True)
+            self.clock.now += 60
+        stats = self.outbox.stats()
+        self.assertEqual((stats['pending'], stats['failed']), (0, 1))
+
+    def test_message_is_claimed_by_one_sender_only(self):
+        self.outbox.enqueue('alert', 'Subject', 'Body')
+        other = Outbox(self.path, clock=self.clock)
+        self.assertEqual(len(self.outbox.claim(force=True)), 1)
+        self.assertEqual(other.claim(force=True), [])
+
+    def test_one_email_per_recipient(self):
+        self.outbox.enqueue('digest', 'Tous', '<p>1</p>')
+        self.outbox.enqueue('digest', 'PHP', '<p>2</p>', 'php@example.com')
+        self.outbox.enqueue('alert', 'Erreur', 'timeout')
+
+        self.assertEqual(self.sender.send_due(force=True), 3)
+        self.assertEqual(sorted(len(email) for email in self.sent), [2, 3])
+        self.assertIn(('PHP', '<p>2</p>', 'php@example.com'), self.sent)
+
+    def test_recipient_column_is_added_to_old_outbox(self):
+        import sqlite3
+        path = os.path.join(self.tmp_dir.name, 'old.db')
+        with sqlite3.connect(path) as conn:
+            # Schéma d'avant les abonnements, sans la colonne `recipient`
+            conn.executescript(SCHEMA.replace(',\n    recipient TEXT', ''))
+        outbox = Outbox(path, clock=self.clock)
+        outbox.enqueue('digest', 'S', 'B', 'a@example.com')
+        self.assertEqual(outbox.claim(force=True)[0]['recipient'], 'a@example.com')
+
+    def test_single_message_is_sent_unchanged(self):
+        message = {'kind': 'digest', 'subject': 'S', 'body': '<html></html>'}
+        self.assertEqual(coalesce([message]), ('S', '<html></html>'))
+
+
+class TestNotifierOutbox(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, 'outbox.db')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    @patch.dict(os.environ, {'SEND_EMAIL': 'true', 'NOTIFY_COALESCE_WINDOW': '0'})
+    def test_send_email_does_not_wait_for_resend(self):
+        delivered = threading.Event()
+        notifier = Notifier(self.path)
+
+        def slow_post(*args, **kwargs):
+            time.sleep(0.3)
+            delivered.set()
+            return MagicMock(status_code=200, text='{"id": "1"}')
+
+        notifier.http = MagicMock()
+        notifier.http.post.side_effect = slow_post
+
+        started = time.perf_counter()
+        notifier.send_email('Subject', '<p>Body</p>')
+        self.assertLess(time.perf_counter() - started, 0.2)
+
+        self.assertTrue(delivered.wait(5))
+        notifier.outbox_sender.stop()
+        for _ in range(100):
+            if notifier.delivery_state()['sent'] == 1:
+                break
+            time.sleep(0.02)
+        self.assertEqual(notifier.delivery_state()['sent'], 1)
+
+    @patch.dict(os.environ, {'SEND_EMAIL': 'false'})
+    def test_disabled(self):
+        notifier = Notifier(self.path)
+        self.assertIsNone(notifier.send_email('Subject', 'Body'))
+        self.assertIsNone(notifier.delivery_state())
+
+
+if __name__ == '__main__':
+    unittest.main()
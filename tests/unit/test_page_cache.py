@@ -0,0 +1,120 @@
+import gzip
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+
+from src.core.data_handler import DataHandler
+from src.core.page_cache import PageCache, RenderedPage, build_signature
+
+
+def make_records(count, start=0):
+    return [
+        {'title': f"Développeur {i:03d}", 'link': f"https://example.com/{i}", 'company': 'Kelio',
+         'location': 'Cholet' if i % 2 else 'Angers', 'date': f"2025-01-{i % 28 + 1:02d} 10:00"}
+        for i in range(start, start + count)
+    ]
+
+
+class TestPageCache(unittest.TestCase):
+
+    def test_renders_once_per_key(self):
+        cache = PageCache()
+        calls = []
+
+        def render():
+            calls.append(1)
+            return f"<p>{len(calls)}</p>", None
+
+        first = cache.get('index', 'v1', render)
+        self.assertIs(cache.get('index', 'v1', render), first)
+        second = cache.get('index', 'v2', render)
+        self.assertEqual(second.body, b'<p>2</p>')
+        self.assertEqual(cache.stats(), {'hits': 1, 'misses': 2, 'hit_rate': 0.3333})
+
+    def test_encoded_bodies_are_memoized(self):
+        page = RenderedPage(('<li>offre</li>' * 200).encode('utf-8'), 'v1')
+        body, encoding = page.encoded('gzip')
+        self.assertEqual(encoding, 'gzip')
+        self.assertEqual(gzip.decompress(body), page.body)
+        self.assertIs(page.encoded('gzip')[0], body)
+
+    def test_small_pages_are_not_compressed(self):
+        page = RenderedPage(b'<p>vide</p>', 'v1')
+        self.assertEqual(page.encoded('gzip'), (b'<p>vide</p>', None))
+
+
+class TestIndexRoute(unittest.TestCase):
+
+    def setUp(self):
+        from src import app as app_module
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.handler = DataHandler(os.path.join(self.tmp_dir.name, 'jobs.csv'))
+        self.handler.save_data(pd.DataFrame(make_records(40)))
+        self.patchers = [
+            patch.object(app_module, 'data_handler', self.handler),
+            patch.object(app_module, 'page_cache', PageCache()),
+        ]
+        for patcher in self.patchers:
+            patcher.start()
+        self.page_cache = app_module.page_cache
+        self.client = app_module.app.test_client()
+
+    def tearDown(self):
+        for patcher in self.patchers:
+            patcher.stop()
+        self.tmp_dir.cleanup()
+
+    def test_gzip_and_conditional_requests(self):
+        response = self.client.get('/', headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertEqual(response.headers['Vary'], 'Accept-Encoding')
+        self.assertIn(b'<option value="Angers">', gzip.decompress(response.data))
+
+        etag = response.headers['ETag']
+        cached = self.client.get('/', headers={'If-None-Match': etag})
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(cached.data, b'')
+
+        since = self.client.get('/', headers={'If-Modified-Since': response.headers['Last-Modified']})
+        self.assertEqual(since.status_code, 304)
+        self.assertEqual(self.page_cache.stats()['misses'], 1)
+
+    def test_new_data_invalidates_page(self):
+        etag = self.client.get('/').headers['ETag']
+        time.sleep(0.01)
+        self.handler.save_data(pd.DataFrame(make_records(5, start=40)))
+
+        response = self.client.get('/', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers['ETag'], etag)
+        self.assertIn(b'>45</div>', response.data)
+
+    def test_new_deploy_invalidates_page(self):
+        from src import app as app_module
+        etag = self.client.get('/').headers['ETag']
+        with patch.object(app_module, 'build_id', 'nouveau-build'):
+            response = self.client.get('/', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers['ETag'], etag)
+
+
+class TestBuildSignature(unittest.TestCase):
+
+    def test_changes_with_content(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'main.js')
+            with open(path, 'w') as f:
+                f.write('console.log(1)')
+            first = build_signature(tmp_dir)
+            with open(path, 'w') as f:
+                f.write('console.log(2)')
+            self.assertNotEqual(build_signature(tmp_dir)[0], first[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+from unittest.mock import patch
+
+from benchmarks.kelio_pages import make_page
+from src.core import parsers
+from src.core.parsers import extract_rows
+
+TRICKY_PAGE = """
+<html><body><table class="contentpane">
+<tr class="sectiontableentry1 highlighted">
+  <td><a href="/fr/offre-1.html"> Développeur <b>Vue.js</b> &amp; Node </a><!-- note --></td>
+  <td> Kelio <br> SA </td><td>CDI</td><td><span>Cholet</span><script>var x = 1;</script></td>
+</tr>
+<tr class="sectiontableentry2"><td><a>Sans lien</a></td><td>Kelio</td><td>CDI</td><td>Angers</td></tr>
+<tr class="sectiontableentry1"><td>Pas de lien</td><td>Kelio</td><td>CDI</td><td>Angers</td></tr>
+<tr class="sectiontableentry2"><td><a href="/court.html">Trop court</a></td><td>Kelio</td></tr>
+<tr class="sectiontableentry2">
+  <td><table><tr><td><a href="https://example.com/nested">Nested&nbsp;PHP</a></td></tr></table></td>
+  <td>Kelio</td><td>CDD</td><td>Trémentines</td><td>extra</td>
+</tr>
+</table></body></html>
+"""
+
+FALLBACK_PAGE = """
+<table class="contentpane">
+<tr><td><a href="/fallback.html">Développeur fallback</a></td><td>Kelio</td><td>CDI</td><td>Cholet</td></tr>
+</table>
+"""
+
+
+class TestParserBackends(unittest.TestCase):
+
+    def assert_backends_agree(self, html):
+        expected = extract_rows(html, 'html.parser')
+        self.assertEqual(extract_rows(html, 'lxml'), expected)
+        self.assertEqual(extract_rows(html, 'fast'), expected)
+        with patch.object(parsers, 'SelectolaxParser', None):
+            self.assertEqual(extract_rows(html, 'fast'), expected)
+        return expected
+
+    def test_synthetic_page(self):
+        rows = self.assert_backends_agree(make_page(200, seed=3))
+        self.assertEqual(len(rows), 200)
+
+    def test_tricky_rows(self):
+        rows = self.assert_backends_agree(TRICKY_PAGE)
+        self.assertEqual(rows[0], {
+            'title': 'DéveloppeurVue.js& Node',
+            'link': '/fr/offre-1.html',
+            'company': 'KelioSA',
+            'location': 'Cholet',
+        })
+        # Nested cells count like with find_all('td'): cells[1] is the inner cell
+        self.assertEqual(rows[1]['title'], 'Nested\xa0PHP')
+        self.assertEqual(rows[1]['company'], 'Nested\xa0PHP')
+        self.assertEqual(len(rows), 2)
+
+    def test_fallback_selector(self):
+        rows = self.assert_backends_agree(FALLBACK_PAGE)
+        self.assertEqual(rows[0]['link'], '/fallback.html')
+
+    def test_no_rows(self):
+        self.assertEqual(self.assert_backends_agree("<div>Aucune offre</div>"), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+from benchmarks.kelio_pages import make_page
+from src.core.data_handler import DataHandler
+from src.core.profiling import RunProfiler, profile_run, run_scraper
+from src.core.scrape_jobs import ScrapeJobRunner
+from src.core.scraper import JobScraper
+from src.core.source_state import SourceStateStore
+
+
+class TestProfiling(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.report_dir = os.path.join(self.tmp_dir.name, 'profiles')
+        self.env = patch.dict(os.environ, {'PROFILE_DIR': self.report_dir, 'SEND_EMAIL': ''})
+        self.env.start()
+
+    def tearDown(self):
+        self.env.stop()
+        self.tmp_dir.cleanup()
+
+    def make_scraper(self):
+        scraper = JobScraper(sources=['https://example.com/jobs'])
+        scraper.data_handler = DataHandler(os.path.join(self.tmp_dir.name, 'jobs.csv'), backend='csv')
+        scraper.source_state = SourceStateStore(os.path.join(self.tmp_dir.name, 'sources_state.json'))
+        scraper.last_run_path = os.path.join(self.tmp_dir.name, 'last_run.json')
+        scraper.fetch_html = MagicMock(return_value=make_page(50))
+        return scraper
+
+    @patch('src.core.scraper.AIFormatter.format_jobs', return_value='<html></html>')
+    def test_profiled_run_writes_report(self, mock_format_jobs):
+        scraper = self.make_scraper()
+        path = profile_run(scraper)
+
+        self.assertIsNone(scraper.profiler)
+        self.assertEqual(sorted(os.listdir(path)), ['profile.pstats', 'report.json', 'report.txt'])
+        with open(os.path.join(path, 'report.json')) as f:
+            report = json.load(f)
+        self.assertTrue({'fetch', 'dedupe', 'save', 'format'} <= set(report['stages']))
+        self.assertGreater(report['stages']['fetch']['peak_mb'], 0)
+        tree, = [name for name in report['sections'] if name.startswith('parse_tree')]
+        self.assertGreater(report['sections'][tree]['peak_mb'], 0)
+        self.assertGreater(report['records']['parsed']['rows'], 0)
+        self.assertEqual(report['records']['new']['rows'], report['summary']['new_jobs'])
+        with open(os.path.join(path, 'report.txt'), encoding='utf-8') as f:
+            self.assertIn('parse_jobs', f.read())
+
+    def test_old_reports_are_pruned(self):
+        for _ in range(3):
+            profiler = RunProfiler(self.report_dir, retention=2)
+            profiler.start()
+            profiler.stop()
+            profiler.write_report()
+        self.assertEqual(len(os.listdir(self.report_dir)), 2)
+
+    def test_run_scraper_follows_env(self):
+        scraper = MagicMock()
+        with patch.dict(os.environ, {'SCRAPER_PROFILE': 'false'}):
+            self.assertIsNone(run_scraper(scraper))
+        scraper.run.assert_called_once()
+
+    @patch('src.core.scraper.AIFormatter.format_jobs', return_value='<html></html>')
+    def test_runner_profiles_on_request(self, mock_format_jobs):
+        runner = ScrapeJobRunner(self.make_scraper)
+        job, _ = runner.submit(profile=True)
+        for _ in range(500):
+            job = runner.get(job['id'])
+            if job['status'] in ('succeeded', 'failed'):
+                break
+            threading.Event().wait(0.01)
+        self.assertEqual(job['status'], 'succeeded')
+        self.assertTrue(os.path.exists(os.path.join(job['profile_report'], 'report.json')))
+
+
+if __name__ == '__main__':
+    unittest.main()
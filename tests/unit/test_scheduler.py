@@ -0,0 +1,173 @@
+import random
+import unittest
+
+from src.core.scheduler import AdaptiveScheduler, build_schedules
+
+SOURCE_A = 'https://example.com/a'
+SOURCE_B = 'https://example.com/b'
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeScraper:
+    """Scraper stand-in reporting new jobs for the configured sources."""
+
+    def __init__(self):
+        self.sources = []
+        self.summary = {}
+        self.calls = []
+        self.new_by_source = {}
+        self.error = None
+        self.fail = False
+        self.failing_sources = set()
+
+    def reload_config(self):
+        pass
+
+    def run(self):
+        self.calls.append(list(self.sources))
+        if self.fail:
+            # JobScraper.run ne propage pas l'exception : elle est notée dans `error`
+            self.summary = {'new_by_source': {}}
+            self.error = 'timeout'
+            return
+        self.error = None
+        ok = [url for url in self.sources if url not in self.failing_sources]
+        self.summary = {
+            'new_by_source': {url: self.new_by_source.get(url, 0) for url in ok},
+            'failed_sources': [url for url in self.sources if url in self.failing_sources],
+        }
+
+
+CONFIG = {
+    'schedule': {
+        'interval': 100, 'min_interval': 50, 'max_interval': 400, 'jitter': 0, 'backoff': 2,
+        'sources': [{'url': SOURCE_B, 'interval': 300, 'max_interval': 300}],
+    }
+}
+
+
+class TestBuildSchedules(unittest.TestCase):
+
+    def test_per_source_overrides(self):
+        a, b = build_schedules([SOURCE_A, SOURCE_B], CONFIG)
+        self.assertEqual((a.interval, a.max_interval), (100, 400))
+        self.assertEqual((b.interval, b.max_interval, b.min_interval), (300, 300, 50))
+
+    def test_defaults_without_config(self):
+        (schedule,) = build_schedules([SOURCE_A], {})
+        self.assertEqual(schedule.interval, 1800)
+
+
+class TestAdaptiveScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.scraper = FakeScraper()
+        self.scheduler = AdaptiveScheduler(
+            scraper_factory=lambda: self.scraper, sources=[SOURCE_A, SOURCE_B],
+            config=CONFIG, clock=self.clock, rng=random.Random(0)
+        )
+
+    def test_first_run_covers_all_sources(self):
+        self.assertEqual(self.scheduler.run_once(), [SOURCE_A, SOURCE_B])
+        self.assertEqual(self.scraper.calls, [[SOURCE_A, SOURCE_B]])
+        self.assertEqual(self.scheduler.run_once(), [])
+
+    def test_quiet_source_backs_off(self):
+        self.scheduler.run_once()
+        a = self.scheduler.schedules[0]
+        self.assertEqual(a.interval, 200)
+        self.clock.now += 200
+        self.scheduler.run_once()
+        self.assertEqual(a.interval, 400)
+        self.clock.now += 400
+        self.scheduler.run_once()
+        self.assertEqual(a.interval, 400)
+
+    def test_new_postings_poll_more_often(self):
+        self.scraper.new_by_source = {SOURCE_A: 3}
+        self.scheduler.run_once()
+        a, b = self.scheduler.schedules
+        self.assertEqual(a.interval, 50)
+        self.assertEqual(a.last_new_at, self.clock.now)
+        self.assertEqual(b.interval, 300)
+
+        self.clock.now += 50
+        self.assertEqual(self.scheduler.run_once(), [SOURCE_A])
+
+    def test_jitter_spreads_next_run(self):
+        config = {'schedule': dict(CONFIG['schedule'], jitter=0.5)}
+        scheduler = AdaptiveScheduler(
+            scraper_factory=lambda: self.scraper, sources=[SOURCE_A],
+            config=config, clock=self.clock, rng=random.Random(1)
+        )
+        scheduler.run_once()
+        delay = scheduler.schedules[0].next_run - self.clock.now
+        self.assertTrue(100 <= delay <= 300)
+        self.assertNotEqual(delay, 200)
+
+    def test_failed_run_retries_without_backoff(self):
+        self.scraper.fail = True
+        self.assertEqual(self.scheduler.run_once(), [SOURCE_A, SOURCE_B])
+        a, b = self.scheduler.schedules
+        self.assertEqual((a.interval, b.interval), (100, 300))
+        self.assertEqual(a.next_run, self.clock.now + 50)
+
+        self.clock.now += 50
+        self.scraper.fail = False
+        self.assertEqual(self.scheduler.run_once(), [SOURCE_A, SOURCE_B])
+        self.assertEqual(a.interval, 200)
+
+    def test_failed_source_retries_while_healthy_one_backs_off(self):
+        self.scraper.failing_sources = {SOURCE_A}
+        self.scheduler.run_once()
+        a, b = self.scheduler.schedules
+        self.assertEqual((a.interval, a.next_run), (100, self.clock.now + 50))
+        self.assertEqual(b.interval, 300)
+        self.assertEqual(b.next_run, self.clock.now + 300)
+
+        # Seule la source en échec est relancée
+        self.clock.now += 50
+        self.assertEqual(self.scheduler.run_once(), [SOURCE_A])
+
+    def test_schedule_settings_are_reloaded(self):
+        configs = [CONFIG]
+        scheduler = AdaptiveScheduler(
+            scraper_factory=lambda: self.scraper, sources=[SOURCE_A],
+            config=CONFIG, clock=self.clock, rng=random.Random(0)
+        )
+        scheduler._load_config = lambda: configs[-1]
+        scheduler.run_once()
+        (a,) = scheduler.schedules
+        self.assertEqual(a.interval, 200)
+
+        configs.append({'schedule': dict(CONFIG['schedule'], max_interval=150, backoff=3)})
+        self.clock.now += 200
+        scheduler.run_once()
+        self.assertEqual((a.max_interval, a.backoff, a.interval), (150, 3, 150))
+
+    def test_scraper_is_reused(self):
+        created = []
+
+        def factory():
+            created.append(FakeScraper())
+            return created[-1]
+
+        scheduler = AdaptiveScheduler(scraper_factory=factory, sources=[SOURCE_A],
+                                      config=CONFIG, clock=self.clock)
+        scheduler.run_once()
+        self.clock.now += 1000
+        scheduler.run_once()
+        self.assertEqual(len(created), 1)
+        self.assertEqual(scheduler.runs, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+import threading
+import unittest
+from unittest.mock import patch
+
+from src.core.scrape_jobs import ScrapeJobRunner, progress
+
+
+class FakeScraper:
+    """Scraper stand-in whose run blocks until released."""
+
+    def __init__(self, release, error=None):
+        self.release = release
+        self.summary = {}
+        self.error = None
+        self.on_stage = None
+        self._error = error
+
+    def run(self):
+        self.on_stage('fetch')
+        self.release.wait(5)
+        self.on_stage('done')
+        self.summary = {'new_jobs': 2}
+        self.error = self._error
+
+
+def wait_finished(runner, job_id):
+    for _ in range(500):
+        job = runner.get(job_id)
+        if job['status'] in ('succeeded', 'failed'):
+            return job
+        threading.Event().wait(0.01)
+    raise AssertionError('job did not finish')
+
+
+class TestScrapeJobRunner(unittest.TestCase):
+
+    def setUp(self):
+        self.release = threading.Event()
+        self.created = []
+
+        def factory():
+            scraper = FakeScraper(self.release)
+            self.created.append(scraper)
+            return scraper
+
+        self.runner = ScrapeJobRunner(factory)
+
+    def tearDown(self):
+        self.release.set()
+
+    def test_concurrent_submissions_share_one_run(self):
+        first, created = self.runner.submit()
+        second, joined = self.runner.submit()
+
+        self.assertTrue(created)
+        self.assertFalse(joined)
+        self.assertEqual(first['id'], second['id'])
+
+        self.release.set()
+        job = wait_finished(self.runner, first['id'])
+        self.assertEqual(job['status'], 'succeeded')
+        self.assertEqual(job['stage'], 'done')
+        self.assertEqual(job['progress'], 1.0)
+        self.assertEqual(job['summary'], {'new_jobs': 2})
+        self.assertEqual(len(self.created), 1)
+
+    def test_new_run_after_completion(self):
+        first, _ = self.runner.submit()
+        self.release.set()
+        wait_finished(self.runner, first['id'])
+
+        second, created = self.runner.submit()
+        self.assertTrue(created)
+        self.assertNotEqual(first['id'], second['id'])
+
+    def test_stage_is_reported_while_running(self):
+        job, _ = self.runner.submit()
+        for _ in range(500):
+            if self.runner.get(job['id'])['stage'] == 'fetch':
+                break
+            threading.Event().wait(0.01)
+        self.assertEqual(self.runner.get(job['id'])['status'], 'running')
+        self.assertEqual(self.runner.get(job['id'])['progress'], progress('fetch'))
+        self.assertTrue(0 < progress('fetch') < progress('notify') < 1)
+
+    def test_scraper_error_marks_job_failed(self):
+        runner = ScrapeJobRunner(lambda: FakeScraper(self.release, error='boom'))
+        self.release.set()
+        job, _ = runner.submit()
+        job = wait_finished(runner, job['id'])
+        self.assertEqual(job['status'], 'failed')
+        self.assertEqual(job['error'], 'boom')
+
+    def test_unknown_job(self):
+        self.assertIsNone(self.runner.get('missing'))
+
+
+class TestRunScraperApi(unittest.TestCase):
+
+    def setUp(self):
+        from src import app as app_module
+        self.release = threading.Event()
+        self.runner = ScrapeJobRunner(lambda: FakeScraper(self.release))
+        self.patcher = patch.object(app_module, 'scrape_runner', self.runner)
+        self.patcher.start()
+        self.client = app_module.app.test_client()
+
+    def tearDown(self):
+        self.release.set()
+        self.patcher.stop()
+
+    def test_post_returns_job_and_status_reports_result(self):
+        response = self.client.post('/run-scraper')
+        self.assertEqual(response.status_code, 202)
+        data = response.get_json()
+        self.assertFalse(data['already_running'])
+
+        again = self.client.post('/run-scraper').get_json()
+        self.assertTrue(again['already_running'])
+        self.assertEqual(again['id'], data['id'])
+
+        self.release.set()
+        wait_finished(self.runner, data['id'])
+        status = self.client.get(data['status_url']).get_json()
+        self.assertEqual(status['status'], 'succeeded')
+        self.assertTrue(status['success'])
+        self.assertIn('2 nouvelle(s) offre(s)', status['message'])
+
+    def test_unknown_job_is_404(self):
+        self.assertEqual(self.client.get('/run-scraper/missing').status_code, 404)
+
+
+if __name__ == '__main__':
+    unittest.main()
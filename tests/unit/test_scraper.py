@@ -1,3 +1,5 @@
+import os
+import tempfile
 import unittest
 from unittest.mock import patch, MagicMock
 import pandas as pd
@@ -6,12 +8,17 @@ from bs4 import BeautifulSoup
 from src.core.scraper import JobScraper
 from src.core.data_handler import DataHandler
 from src.core.notifier import Notifier
+from src.core.source_state import SourceStateStore
 
 class TestJobScraper(unittest.TestCase):
 
     def setUp(self):
         """Setup method to create a JobScraper instance before each test."""
         self.scraper = JobScraper()
+        # Keep the per-source state out of the real data directory
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.scraper.source_state = SourceStateStore(os.path.join(self.tmp_dir.name, 'sources_state.json'))
+        self.scraper.last_run_path = os.path.join(self.tmp_dir.name, 'last_run.json')
         # Mock the config, as we don't want to load the real one in unit tests
         self.scraper.config = {
             'scraping': {
@@ -21,6 +28,9 @@ class TestJobScraper(unittest.TestCase):
             'email': {'enabled': False}  # Disable email sending for tests
         }
 
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
     @patch('src.core.scraper.requests.get')
     def test_fetch_html_success(self, mock_get):
         """Test successful HTML fetching."""
@@ -74,22 +84,25 @@ class TestJobScraper(unittest.TestCase):
             {'title': 'Job with Test_Keyword', 'link': 'https://example.com/job3', 'company': 'Kelio', 'date': pd.Timestamp.now().strftime('%Y-%m-%d %H:%M')},
         ])
 
-        actual_jobs = self.scraper.parse_jobs(html)
+        actual_jobs = pd.DataFrame([job.to_dict() for job in self.scraper.parse_jobs(html)])
         pd.testing.assert_frame_equal(actual_jobs.reset_index(drop=True), expected_jobs.reset_index(drop=True), check_dtype=False) #reset index, sometime the test fail because of index
 
     def test_parse_jobs_empty(self):
         """Test parsing when there are no job offers."""
         html = "<div class='other-div'>No job offers</div>"
         actual_jobs = self.scraper.parse_jobs(html)
-        self.assertTrue(actual_jobs.empty)
+        self.assertEqual(actual_jobs, [])
 
+    @patch.dict(os.environ, {'SEND_EMAIL': 'true'})
     @patch('src.core.scraper.Notifier.send_email')
     @patch('src.core.scraper.DataHandler.save_data')
     def test_run(self, mock_save_data, mock_send_email):
         """Test the main run method."""
         # Mock fetch_html and parse_jobs
         self.scraper.fetch_html = MagicMock(return_value="mock_html")
-        self.scraper.parse_jobs = MagicMock(return_value=pd.DataFrame([{'title': 'Test Job', 'link': 'test_link'}]))
+        self.scraper.parse_jobs = MagicMock(return_value=pd.DataFrame([
+            {'title': 'Développeur PHP', 'link': 'test_link', 'location': 'Cholet'}
+        ]))
 
         self.scraper.run()
 
@@ -98,6 +111,31 @@ class TestJobScraper(unittest.TestCase):
         mock_save_data.assert_called_once()
         mock_send_email.assert_called_once()
 
+    @patch.dict(os.environ, {'SEND_EMAIL': 'true'})
+    @patch('src.core.scraper.AIFormatter.format_jobs', return_value='<html>toutes</html>')
+    @patch('src.core.scraper.Notifier.send_email')
+    @patch('src.core.scraper.DataHandler.save_data')
+    def test_run_sends_one_digest_per_profile(self, mock_save_data, mock_send_email, mock_format_jobs):
+        from src.core.subscriptions import get_subscription_index
+        self.scraper.subscriptions = get_subscription_index({
+            'filters': {'keywords': ['développeur'], 'locations': ['cholet']},
+            'subscriptions': [{'name': 'php', 'email': 'php@example.com', 'keywords': ['php'], 'locations': ['angers']}],
+        })
+        self.scraper.data_handler.unseen_jobs = lambda jobs: jobs
+        self.scraper.fetch_html = MagicMock(return_value="mock_html")
+        self.scraper.parse_jobs = MagicMock(return_value=pd.DataFrame([
+            {'title': 'Développeur Java', 'link': 'l1', 'location': 'Cholet'},
+            {'title': 'Développeur PHP', 'link': 'l2', 'location': 'Angers'},
+        ]))
+
+        self.scraper.run()
+
+        # Une seule mise en forme IA pour tout le run, puis un email par abonné
+        mock_format_jobs.assert_called_once()
+        self.assertEqual(self.scraper.summary['digests'], {'default': 1, 'php': 1})
+        recipients = [call.kwargs['to'] for call in mock_send_email.call_args_list]
+        self.assertEqual(recipients, [None, 'php@example.com'])
+
     @patch('src.core.scraper.Notifier.send_email')
     @patch('src.core.scraper.DataHandler.save_data')
     def test_run_no_new_jobs(self, mock_save_data, mock_send_email):
@@ -112,6 +150,63 @@ class TestJobScraper(unittest.TestCase):
         mock_save_data.assert_not_called()  # Should not save
         mock_send_email.assert_not_called() # Should not send email
 
+    @patch('src.core.scraper.AIFormatter.format_jobs')
+    @patch('src.core.scraper.DataHandler.save_data')
+    def test_run_skips_unchanged_page(self, mock_save_data, mock_format_jobs):
+        """A page identical to the last processed one is not parsed again."""
+        self.scraper.fetch_html = MagicMock(return_value="mock_html")
+        self.scraper.parse_jobs = MagicMock(return_value=pd.DataFrame())
+
+        self.scraper.run()
+        self.assertFalse(self.scraper.summary['skipped'])
+        self.scraper.run()
+
+        self.scraper.parse_jobs.assert_called_once_with("mock_html")
+        self.assertTrue(self.scraper.summary['skipped'])
+        self.assertEqual(self.scraper.summary['unchanged'], 1)
+        mock_save_data.assert_not_called()
+        mock_format_jobs.assert_not_called()
+
+    @patch('src.core.scraper.DataHandler.save_data')
+    def test_run_skips_not_modified_page(self, mock_save_data):
+        """A 304 answer (fetch_html returning None) skips parsing."""
+        self.scraper.fetch_html = MagicMock(return_value=None)
+        self.scraper.parse_jobs = MagicMock()
+
+        self.scraper.run()
+
+        self.scraper.parse_jobs.assert_not_called()
+        mock_save_data.assert_not_called()
+        self.assertTrue(self.scraper.summary['skipped'])
+        self.assertEqual(self.scraper.summary['not_modified'], 1)
+
+    @patch('src.core.scraper.DataHandler.save_data')
+    def test_partial_failure_reports_failed_sources(self, mock_save_data):
+        def fetch(url=None):
+            if url.endswith('/down'):
+                raise Exception('timeout')
+            return None
+
+        self.scraper.sources = ['https://example.com/ok', 'https://example.com/down']
+        self.scraper.fetch_html = MagicMock(side_effect=fetch)
+        self.scraper.run()
+
+        self.assertIsNone(self.scraper.error)
+        self.assertEqual(self.scraper.summary['failed_sources'], ['https://example.com/down'])
+
+    @patch('src.core.scraper.DataHandler.save_data')
+    def test_failed_run_does_not_commit_staged_state(self, mock_save_data):
+        """A later successful run must not mark the pages of a failed run as processed."""
+        self.scraper.fetch_html = MagicMock(return_value="mock_html")
+        self.scraper.parse_jobs = MagicMock(side_effect=Exception('parse error'))
+        self.scraper.run()
+        self.assertEqual(self.scraper.error, 'parse error')
+
+        self.scraper.fetch_html = MagicMock(return_value=None)
+        self.scraper.run()
+        self.assertIsNone(self.scraper.error)
+        self.assertEqual(self.scraper.source_state.get(self.scraper.sources[0]), {})
+
 class TestDataHandler(unittest.TestCase):
     def setUp(self):
         self.data_handler = DataHandler(filename='test_jobs.csv')
@@ -119,8 +214,10 @@ class TestDataHandler(unittest.TestCase):
     def tearDown(self):
         # Clean up the test file after each test
         import os
-        if os.path.exists('test_jobs.csv'):
-            os.remove('test_jobs.csv')
+        for path in ('test_jobs.csv', 'test_jobs.fingerprints', 'test_jobs.search.db',
+                     'test_jobs.search.db-wal', 'test_jobs.search.db-shm'):
+            if os.path.exists(path):
+                os.remove(path)
 
     def test_save_and_load_data(self):
         new_jobs = pd.DataFrame([
@@ -130,7 +227,7 @@ class TestDataHandler(unittest.TestCase):
 
         self.data_handler.save_data(new_jobs)
         loaded_jobs = self.data_handler.load_data()
-        pd.testing.assert_frame_equal(loaded_jobs, new_jobs)
+        pd.testing.assert_frame_equal(loaded_jobs[['title', 'link']], new_jobs)
 
     def test_save_data_append(self):
         # First save
@@ -147,7 +244,7 @@ class TestDataHandler(unittest.TestCase):
             {'title': 'Job 1', 'link': 'link1'},
             {'title': 'Job 2', 'link': 'link2'}
         ])
-        pd.testing.assert_frame_equal(loaded_jobs.reset_index(drop=True), expected_jobs.reset_index(drop=True))
+        pd.testing.assert_frame_equal(loaded_jobs[['title', 'link']].reset_index(drop=True), expected_jobs.reset_index(drop=True))
 
     def test_save_data_duplicates(self):
         # First save
@@ -161,7 +258,39 @@ class TestDataHandler(unittest.TestCase):
         loaded_jobs = self.data_handler.load_data()
         expected_jobs = pd.DataFrame([{'title': 'Job 1', 'link': 'link1'}])
 
-        pd.testing.assert_frame_equal(loaded_jobs.reset_index(drop=True), expected_jobs.reset_index(drop=True))
+        pd.testing.assert_frame_equal(loaded_jobs[['title', 'link']].reset_index(drop=True), expected_jobs.reset_index(drop=True))
+
+class TestDataHandlerCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.data_handler = DataHandler(filename=os.path.join(self.tmp_dir.name, 'jobs.csv'))
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_records_are_cached_until_file_changes(self):
+        self.data_handler.save_data(pd.DataFrame([
+            {'title': 'Job 1', 'link': 'link1', 'date': '2025-01-01 10:00'},
+            {'title': 'Job 2', 'link': 'link2', 'date': '2025-02-01 10:00'}
+        ]))
+
+        first = self.data_handler.load_records()
+        self.assertEqual([job['title'] for job in first], ['Job 2', 'Job 1'])
+        with patch.object(DataHandler, '_read_csv_jobs') as mock_read_csv:
+            self.assertIs(self.data_handler.load_records(), first)
+            mock_read_csv.assert_not_called()
+        self.assertEqual(self.data_handler.cache_stats()['hits'], 1)
+
+        # Another process (the scraper) rewrites the file
+        other = DataHandler(filename=self.data_handler.filename)
+        other.save_data(pd.DataFrame([{'title': 'Job 3', 'link': 'link3', 'date': '2025-03-01 10:00'}]))
+
+        records = self.data_handler.load_records()
+        self.assertEqual(records[0]['title'], 'Job 3')
+        self.assertEqual(self.data_handler.cache_stats()['misses'], 2)
+
+    def test_missing_file(self):
+        self.assertEqual(self.data_handler.load_records(), [])
 
 class TestNotifier(unittest.TestCase):
     def setUp(self):
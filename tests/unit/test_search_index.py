@@ -0,0 +1,125 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+
+from src.core.data_handler import DataHandler
+from src.core.search_index import SearchIndex, build_match
+
+JOBS = [
+    {'title': 'Développeur Full Stack H/F', 'link': 'https://x/1', 'company': 'Kelio', 'location': 'Cholet', 'date': '2025-03-01 10:00'},
+    {'title': 'Comptable H/F', 'link': 'https://x/2', 'company': 'Bodet', 'location': 'Trémentines', 'date': '2025-03-02 10:00'},
+    {'title': 'Lead Dev JAVA', 'link': 'https://x/3', 'company': 'Kelio', 'location': 'Nantes', 'date': '2025-03-03 10:00'},
+    {'title': 'Technicien SAV', 'link': 'https://x/4', 'company': 'Bodet Software', 'location': 'Cholet', 'date': '2025-03-04 10:00'},
+]
+
+
+class TestSearchIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.index = SearchIndex(os.path.join(self.tmp_dir.name, 'jobs.search.db'))
+        self.index.add(JOBS)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def titles(self, text, **kwargs):
+        return [item['title'] for item in self.index.search(text, **kwargs)[0]]
+
+    def test_accents_and_case_are_folded(self):
+        for text in ('développeur', 'developpeur', 'DEVELOPPEUR'):
+            self.assertEqual(self.titles(text), ['Développeur Full Stack H/F'])
+        self.assertEqual(self.titles('trementines'), ['Comptable H/F'])
+
+    def test_prefix_queries_and_every_word_must_match(self):
+        self.assertEqual(sorted(self.titles('dev')), ['Développeur Full Stack H/F', 'Lead Dev JAVA'])
+        self.assertEqual(self.titles('dev nant'), ['Lead Dev JAVA'])
+        self.assertEqual(sorted(self.titles('chol')), ['Développeur Full Stack H/F', 'Technicien SAV'])
+
+    def test_title_matches_rank_first(self):
+        self.index.add([{'title': 'Assistant Kelio', 'link': 'https://x/5', 'company': 'Bodet',
+                         'location': 'Angers', 'date': '2025-01-01 10:00'}])
+        items, total = self.index.search('kelio')
+        self.assertEqual(total, 3)
+        self.assertEqual(items[0]['title'], 'Assistant Kelio')
+
+    def test_adding_twice_is_a_no_op(self):
+        self.assertEqual(self.index.add(JOBS), 0)
+        self.assertEqual(self.index.count(), 4)
+
+    def test_operators_are_searched_as_text(self):
+        self.assertEqual(build_match('dev OR "java'), '"dev"* "OR"* "java"*')
+        self.assertEqual(self.index.search('NEAR( AND *'), ([], 0))
+        self.assertEqual(self.index.search('  '), ([], 0))
+
+    def test_older_matches_follow_the_ranked_window(self):
+        index = SearchIndex(os.path.join(self.tmp_dir.name, 'window.db'), rank_window=2)
+        index.add([dict(JOBS[0], link=f'https://x/dev-{i}', title=f'Développeur {i}') for i in range(5)])
+        items, total = index.search('developpeur', limit=10)
+        self.assertEqual(total, 5)
+        self.assertEqual(sorted(item['title'] for item in items[:2]), ['Développeur 3', 'Développeur 4'])
+        self.assertEqual([item['title'] for item in items[2:]], ['Développeur 2', 'Développeur 1', 'Développeur 0'])
+        self.assertEqual([item['title'] for item in index.search('developpeur', limit=2, offset=3)[0]],
+                         ['Développeur 1', 'Développeur 0'])
+
+
+class TestDataHandlerSearch(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, 'jobs.csv')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_save_data_keeps_index_in_sync(self):
+        handler = DataHandler(self.path, backend='csv')
+        handler.save_data(pd.DataFrame(JOBS[:2]))
+        self.assertEqual(handler.search('comptable')[1], 1)
+        handler.save_data(pd.DataFrame(JOBS))
+        self.assertEqual(handler.search('kelio')[1], 2)
+        handler.clear_data()
+        self.assertEqual(handler.search('kelio'), ([], 0))
+
+    def test_missing_index_is_rebuilt(self):
+        DataHandler(self.path, backend='csv').save_data(pd.DataFrame(JOBS))
+        os.remove(os.path.join(self.tmp_dir.name, 'jobs.search.db'))
+        handler = DataHandler(self.path, backend='csv')
+        self.assertEqual(handler.search('bodet')[1], 2)
+
+    def test_sqlite_backend(self):
+        handler = DataHandler(self.path, backend='sqlite')
+        handler.save_data(pd.DataFrame(JOBS))
+        self.assertEqual(handler.search('java')[0][0]['link'], 'https://x/3')
+
+
+class TestSearchApi(unittest.TestCase):
+
+    def setUp(self):
+        from src import app as app_module
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        handler = DataHandler(os.path.join(self.tmp_dir.name, 'jobs.csv'), backend='csv')
+        handler.save_data(pd.DataFrame(JOBS))
+        self.patcher = patch.object(app_module, 'data_handler', handler)
+        self.patcher.start()
+        self.client = app_module.app.test_client()
+
+    def tearDown(self):
+        self.patcher.stop()
+        self.tmp_dir.cleanup()
+
+    def test_search_endpoint(self):
+        data = self.client.get('/api/search?q=developpeur chol').get_json()
+        self.assertEqual(data['total'], 1)
+        self.assertEqual(data['items'][0]['link'], 'https://x/1')
+        self.assertIn('took_ms', data)
+
+    def test_invalid_limit(self):
+        self.assertEqual(self.client.get('/api/search?q=dev&limit=abc').status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
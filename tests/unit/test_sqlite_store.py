@@ -0,0 +1,78 @@
+import os
+import tempfile
+import unittest
+
+import pandas as pd
+
+from src.core.data_handler import DataHandler
+from src.core.sqlite_store import SQLiteStore
+
+
+def job(title, link, location='Cholet'):
+    return {'title': title, 'link': link, 'company': 'Kelio', 'location': location, 'date': '2025-03-08 20:28'}
+
+
+class TestSQLiteStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.store = SQLiteStore(os.path.join(self.tmp_dir.name, 'jobs.db'))
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_insert_or_ignore(self):
+        self.assertEqual(self.store.insert_jobs([job('Dev 1', 'l1'), job('Dev 2', 'l2')]), 2)
+        self.assertEqual(self.store.insert_jobs([job('Dev 2', 'l2'), job('Dev 3', 'l3')]), 1)
+        self.assertEqual([j['title'] for j in self.store.load_jobs()], ['Dev 1', 'Dev 2', 'Dev 3'])
+
+    def test_same_title_different_link(self):
+        self.store.insert_jobs([job('Dev', 'angers'), job('Dev', 'cholet')])
+        self.assertEqual(self.store.count(), 2)
+
+    def test_wal_mode(self):
+        mode = self.store.connection().execute("PRAGMA journal_mode").fetchone()[0]
+        self.assertEqual(mode, 'wal')
+
+    def test_migrate_from_csv_once(self):
+        csv_path = os.path.join(self.tmp_dir.name, 'jobs.csv')
+        pd.DataFrame([job('Dev 1', 'l1'), job('Dev 2', 'l2')]).to_csv(csv_path, index=False)
+
+        self.assertEqual(self.store.migrate_from_csv(csv_path), 2)
+        self.store.clear()
+        self.assertEqual(self.store.migrate_from_csv(csv_path), 0)
+        self.assertEqual(self.store.count(), 0)
+
+
+class TestDataHandlerSQLite(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.csv_path = os.path.join(self.tmp_dir.name, 'jobs.csv')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_save_and_load(self):
+        handler = DataHandler(self.csv_path, backend='sqlite')
+        handler.save_data(pd.DataFrame([job('Dev 1', 'l1')]))
+        handler.save_data(pd.DataFrame([job('Dev 1', 'l1'), job('Dev 2', 'l2')]))
+
+        loaded = handler.load_data()
+        self.assertEqual(loaded['title'].tolist(), ['Dev 1', 'Dev 2'])
+        self.assertTrue(os.path.exists(os.path.join(self.tmp_dir.name, 'jobs.db')))
+
+    def test_existing_csv_is_migrated(self):
+        pd.DataFrame([job('Dev 1', 'l1')]).to_csv(self.csv_path, index=False)
+        handler = DataHandler(self.csv_path, backend='sqlite')
+        self.assertEqual(handler.load_data()['title'].tolist(), ['Dev 1'])
+
+    def test_clear(self):
+        handler = DataHandler(self.csv_path, backend='sqlite')
+        handler.save_data(pd.DataFrame([job('Dev 1', 'l1')]))
+        handler.clear_data()
+        self.assertTrue(handler.load_data().empty)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+
+from loguru import logger
+
+from src.core.job import to_jobs
+from src.core.subscriptions import DEFAULT_PROFILE, SubscriptionIndex, get_subscription_index, load_profiles
+
+CONFIG = {
+    'filters': {'keywords': ['développeur', 'php'], 'locations': ['cholet', 'trémentines']},
+    'subscriptions': [
+        {'name': 'php-angers', 'email': 'php@example.com', 'keywords': ['php', 'symfony'], 'locations': ['angers']},
+        {'email': 'front@example.com', 'keywords': ['vue.js', 'angular'], 'locations': ['cholet', 'angers']},
+    ],
+}
+
+
+def job(title, location, link=None):
+    return {'title': title, 'link': link or title, 'company': 'Kelio', 'location': location, 'date': None}
+
+
+class TestSubscriptionIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = SubscriptionIndex(load_profiles(CONFIG))
+
+    def test_profiles(self):
+        names = [p['name'] for p in self.index.profiles]
+        self.assertEqual(names, [DEFAULT_PROFILE, 'php-angers', 'front@example.com'])
+        self.assertIsNone(self.index.profiles[0]['email'])
+
+    def test_profile_mask(self):
+        self.assertEqual(self.index.profile_mask('Développeur PHP', 'Cholet'), 0b001)
+        self.assertEqual(self.index.profile_mask('Développeur PHP / Symfony', 'Angers'), 0b010)
+        self.assertEqual(self.index.profile_mask('Développeur Vue.js', 'CHOLET'), 0b101)
+        self.assertEqual(self.index.profile_mask('Technicien SAV', 'Cholet'), 0)
+        self.assertEqual(self.index.profile_mask('Développeur PHP', 'Nantes'), 0)
+
+    def test_route(self):
+        jobs = to_jobs([
+            job('Développeur PHP', 'Cholet'),
+            job('Développeur Angular', 'Cholet'),
+            job('Lead PHP', 'Angers'),
+        ])
+        routed = {profile['name']: [j.title for j in selected] for profile, selected in self.index.route(jobs)}
+        self.assertEqual(routed, {
+            DEFAULT_PROFILE: ['Développeur PHP', 'Développeur Angular'],
+            'php-angers': ['Lead PHP'],
+            'front@example.com': ['Développeur Angular'],
+        })
+        # Masques déjà calculés au parsing : pas de nouvelle évaluation
+        self.assertEqual(self.index.route(jobs, [0b010, 0, 0]), [(self.index.profiles[1], [jobs[0]])])
+
+    def test_index_is_compiled_once(self):
+        self.assertIs(get_subscription_index(CONFIG), get_subscription_index(dict(CONFIG)))
+
+
+class TestSingleProfile(unittest.TestCase):
+
+    def setUp(self):
+        self.index = SubscriptionIndex(load_profiles({
+            'filters': {'keywords': ['développeur', 'php', 'full stack'], 'locations': ['cholet', 'trémentines']}
+        }))
+
+    def test_accent_and_case_insensitive(self):
+        self.assertTrue(self.index.matches('DEVELOPPEUR Java H/F', 'Cholet'))
+        self.assertTrue(self.index.matches('Ingénieur Full Stack', 'Trementines'))
+
+    def test_location_must_match_exactly(self):
+        self.assertFalse(self.index.matches('Développeur PHP', 'Angers'))
+        self.assertFalse(self.index.matches('Développeur PHP', 'Cholet Sud'))
+
+    def test_no_keyword(self):
+        self.assertFalse(self.index.matches('Technicien SAV', 'Cholet'))
+
+
+class TestLoadProfiles(unittest.TestCase):
+
+    def test_missing_filters_are_reported(self):
+        messages = []
+        handler_id = logger.add(messages.append, level='WARNING')
+        try:
+            self.assertEqual(load_profiles({}), [])
+            load_profiles({'subscriptions': [{'name': 'vide', 'keywords': ['php']}]})
+        finally:
+            logger.remove(handler_id)
+        self.assertIn('every job will be dropped', messages[0])
+        self.assertIn("Profile 'vide'", messages[1])
+
+
+if __name__ == '__main__':
+    unittest.main()